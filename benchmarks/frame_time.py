@@ -0,0 +1,306 @@
+"""
+End-to-end frame time benchmark. Every map of data/maps is loaded through Game.load_map and played with an input script, one tick and one drawn frame at a time, drawing to the offscreen display (SDL dummy drivers). The time of each frame is recorded, as a whole and per profiler section: tilemap update, barrels, portals, enemies, player, enemy and player projectiles, HUD, background, tilemap render, entity render, scale to screen and present (sending the frame to the display). The garbage collections are timed as the gc section and counted per generation.
+
+With --stress, stress maps are played instead: map 0 repeated side by side a number of times (see tools/stress_map.py), to show how the frame time scales with the size of a level. With --no-activity, all the actors are updated every tick, whatever their distance from the camera (see ActivityRegions).
+
+With --display, the game is drawn in another display mode (see open_display): the integer and scaled modes let pygame.SCALED scale the screen up when it is presented.
+
+With --repeat, every map is played several times and the best value of each statistic is kept, which filters out the noise of the machine.
+
+The results can be written as JSON and compared against a baseline: a section regresses when its statistic is slower than in the baseline by more than a relative threshold and by more than an absolute margin. The exit status is 1 if anything regressed.
+
+Usage:
+    python benchmarks/frame_time.py [--frames N] [--repeat N] [--script FILE] [--output results.json]
+    python benchmarks/frame_time.py --save-baseline baseline.json
+    python benchmarks/frame_time.py --baseline baseline.json [--threshold 0.1] [--section-threshold hud=0.25]
+    python benchmarks/frame_time.py --stress 1 4 16 64 [--no-activity]
+    python benchmarks/frame_time.py --display integer
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game import Game
+from scripts.presentation import DISPLAY_MODES
+from scripts.input_script import load_script
+from tools.stress_map import load_map_data, stress_map, save_map_data
+
+STATISTICS = ("mean", "median", "p95", "p99", "max")
+
+
+def percentile(values, fraction):
+    """
+    Get a percentile of sorted values, without interpolation.
+    """
+
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(samples):
+    """
+    Compute the statistics of the samples of a section.
+
+    Parameters:
+        samples (list[float]): The time of the section in each frame, in seconds.
+
+    Returns:
+        dict[str, float]: The statistics of the section, in milliseconds.
+    """
+
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        "mean": statistics.fmean(values),
+        "median": statistics.median(values),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": values[-1],
+    }
+
+
+def play(game, map_id, frames, script, seed):
+    """
+    Load a map and play it, timing every frame.
+
+    Parameters:
+        game (Game): The game, with its profiler enabled.
+        map_id (int): The id of the map.
+        frames (int): The number of frames to play.
+        script (dict[int, list[pygame.event.Event]]): The input script, see load_script.
+        seed (int): The seed of the level, see Simulation.load_map.
+
+    Returns:
+        dict[str, list[float]]: The time of the whole frame and of each section in each frame, in seconds.
+    """
+
+    game.level = map_id
+    game.load_map(map_id, seed)
+    game.game_state = 1
+    game.profiler.end_frame()
+
+    samples = {"frame": []}
+    for frame in range(frames):
+        start = time.perf_counter()
+        game.game_play(script.get(frame, []))
+        game.render_play()
+        with game.profiler.section("present"):
+            pygame.display.flip()
+        samples["frame"].append(time.perf_counter() - start)
+
+        for name, elapsed in game.profiler.end_frame().items():
+            # A section missing from the first frames took no time in them.
+            samples.setdefault(name, [0] * frame).append(elapsed)
+        for section in samples.values():
+            if len(section) == frame:
+                section.append(0)
+
+        if game.game_state != 1:
+            break
+
+    return samples
+
+
+def compare(results, baseline, statistic, threshold, section_thresholds, margin):
+    """
+    Compare results with a baseline.
+
+    Parameters:
+        results (dict): The results of the benchmark.
+        baseline (dict): The results of the baseline.
+        statistic (str): The statistic to compare, one of STATISTICS.
+        threshold (float): The relative slowdown allowed, for example 0.1 for 10%.
+        section_thresholds (dict[str, float]): The relative slowdown allowed for some sections, instead of threshold.
+        margin (float): The absolute slowdown always allowed, in milliseconds, so tiny sections do not regress on noise.
+
+    Returns:
+        list[str]: The descriptions of the regressions.
+    """
+
+    regressions = []
+    for map_id, result in results["maps"].items():
+        base = baseline["maps"].get(map_id)
+        if base is None:
+            continue
+
+        for name, stats in result["sections"].items():
+            if name not in base["sections"]:
+                continue
+
+            current = stats[statistic]
+            previous = base["sections"][name][statistic]
+            allowed = section_thresholds.get(name, threshold)
+            if current > previous * (1 + allowed) and current - previous > margin:
+                regressions.append(
+                    f"map {map_id} {name}: {statistic} {current:.3f} ms "
+                    f"vs {previous:.3f} ms (+{(current / previous - 1) * 100:.0f}%, "
+                    f"allowed +{allowed * 100:.0f}%)"
+                )
+
+    return regressions
+
+
+def parse_section_threshold(text):
+    name, _, value = text.rpartition("=")
+    if not name:
+        raise argparse.ArgumentTypeError("expected SECTION=THRESHOLD")
+    return name, float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--maps", type=int, nargs="+", help="the ids of the maps, default is all"
+    )
+    parser.add_argument(
+        "--stress",
+        type=int,
+        nargs="+",
+        metavar="COPIES",
+        help="play stress maps of these numbers of copies of map 0 instead",
+    )
+    parser.add_argument(
+        "--no-activity",
+        action="store_true",
+        help="update all the actors every tick, without activity regions",
+    )
+    parser.add_argument(
+        "--display",
+        choices=DISPLAY_MODES,
+        default="window",
+        help="the display mode, default is window",
+    )
+    parser.add_argument("--frames", type=int, default=900)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--script", help="the input script, default is a built-in one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--save-baseline", help="write the results as a baseline")
+    parser.add_argument("--baseline", help="compare the results with this baseline")
+    parser.add_argument("--statistic", choices=STATISTICS, default="median")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="the relative slowdown allowed, default is 0.1 (10%%)",
+    )
+    parser.add_argument(
+        "--section-threshold",
+        type=parse_section_threshold,
+        action="append",
+        default=[],
+        metavar="SECTION=THRESHOLD",
+        help="the relative slowdown allowed for a section",
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=0.05,
+        help="the absolute slowdown always allowed, in ms, default is 0.05",
+    )
+    args = parser.parse_args()
+
+    game = Game(display_mode=args.display)
+    # The benchmark measures the game, not the audio.
+    game.play_music = lambda *args, **kwargs: None
+    game.simulation.sound = False
+    game.profiler.enabled = True
+    if args.no_activity:
+        game.simulation.activity = None
+
+    script = load_script(args.script)
+    map_ids = args.maps if args.maps else range(game.map_count())
+
+    if args.stress:
+        # The stress maps are saved as the maps of a temporary directory, with
+        # their number of copies as id.
+        stress_dir = tempfile.TemporaryDirectory()
+        source = load_map_data(game.map_file(0))
+        for copies in args.stress:
+            save_map_data(
+                os.path.join(stress_dir.name, f"{copies}.json"),
+                stress_map(source, copies),
+            )
+        game.config.map_path = stress_dir.name + os.sep
+        map_ids = args.stress
+
+    results = {
+        "frames": args.frames,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "stress": bool(args.stress),
+        "activity": not args.no_activity,
+        "display": args.display,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "maps": {},
+    }
+    for map_id in map_ids:
+        sections = {}
+        collections = list(game.profiler.gc_collections)
+        for _ in range(args.repeat):
+            samples = play(game, map_id, args.frames, script, args.seed)
+            for name, values in samples.items():
+                stats = summarize(values)
+                best = sections.setdefault(name, stats)
+                for statistic in STATISTICS:
+                    best[statistic] = min(best[statistic], stats[statistic])
+        collections = [
+            after - before
+            for before, after in zip(collections, game.profiler.gc_collections)
+        ]
+        results["maps"][str(map_id)] = {
+            "frames": len(samples["frame"]),
+            "sections": sections,
+            "gc_collections": collections,
+        }
+
+        name = f"stress map of {map_id} copies" if args.stress else f"map {map_id}"
+        print(f"{name}: {len(samples['frame'])} frames")
+        print(f"    {'section':<20}" + "".join(f"{s:>9}" for s in STATISTICS))
+        for name, stats in sorted(sections.items(), key=lambda item: -item[1]["mean"]):
+            print(f"    {name:<20}" + "".join(f"{stats[s]:9.3f}" for s in STATISTICS))
+        print(
+            "    gc collections per generation: "
+            + "/".join(str(count) for count in collections)
+        )
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+        regressions = compare(
+            results,
+            baseline,
+            args.statistic,
+            args.threshold,
+            dict(args.section_threshold),
+            args.margin,
+        )
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            sys.exit(1)
+        print(f"no regression against {args.baseline}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
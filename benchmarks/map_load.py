@@ -0,0 +1,98 @@
+"""
+Benchmark for the map loading. It compares loading every map in data/maps from the JSON map format, from the binary map format and streamed from the binary map format, in load time and in peak Python memory.
+
+Usage:
+    python benchmarks/map_load.py [--repeat N]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import pygame
+from config import Config
+from scripts.tilemap import Tilemap
+from scripts.map_format import save_binary_map, BINARY_MAP_EXTENSION
+
+
+def bench(label, tilemap, path, repeat, streaming=False):
+    """
+    Time the loading of a map and measure its peak memory.
+
+    Returns:
+        tuple[float, int]: The best load time, in milliseconds, and the peak memory, in bytes.
+    """
+
+    best = min(
+        timeit.repeat(
+            lambda: tilemap.load(path, streaming=streaming), number=1, repeat=repeat
+        )
+    )
+
+    tracemalloc.start()
+    tilemap.load(path, streaming=streaming)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"    {label:<8} {best * 1000:8.2f} ms {peak / 1024:10.1f} KiB peak")
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    config = Config()
+    tilemap = Tilemap(config)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in sorted(os.listdir(config.map_path)):
+            if not name.endswith(".json"):
+                continue
+
+            json_path = config.map_path + name
+            binary_path = os.path.join(
+                directory, os.path.splitext(name)[0] + BINARY_MAP_EXTENSION
+            )
+            with open(json_path, "r") as file:
+                save_binary_map(binary_path, json.load(file))
+
+            print(
+                f"{name}: {os.path.getsize(json_path)} bytes JSON, "
+                f"{os.path.getsize(binary_path)} bytes binary"
+            )
+            json_time, json_peak = bench("json", tilemap, json_path, args.repeat)
+            binary_time, binary_peak = bench(
+                "binary", tilemap, binary_path, args.repeat
+            )
+            stream_time, stream_peak = bench(
+                "stream", tilemap, binary_path, args.repeat, streaming=True
+            )
+            print(
+                f"    binary: {json_time / binary_time:.2f}x faster, "
+                f"{json_peak / binary_peak:.2f}x less peak memory"
+            )
+            print(
+                f"    stream: {json_time / stream_time:.2f}x faster, "
+                f"{json_peak / stream_peak:.2f}x less peak memory, "
+                f"{len(tilemap.grid.chunks)} chunks loaded"
+            )
+            # Close the streamed map file before the directory is removed.
+            tilemap.load(json_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Microbenchmark for the entity physics. It compares the previous collision resolver of PhysicsEntity.update (3x3 neighbourhood of the top-left corner, one pygame.Rect per tile) with the swept resolver, on every map in data/maps. Entities are dropped at random positions and run with a random movement, dash speed included.
+
+Usage:
+    python benchmarks/physics_update.py [--repeat N]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from config import Config
+from scripts.tilemap import Tilemap
+from scripts.entities.base_entity import PhysicsEntity
+
+
+class RectPhysicsEntity(PhysicsEntity):
+    """
+    The previous collision resolver of PhysicsEntity.
+    """
+
+    def update(self, tilemap, movement=(0, 0)):
+        self.collisions = {"top": False, "bottom": False, "left": False, "right": False}
+
+        frame_movement = [
+            movement[0] + self.velocity[0],
+            movement[1] + self.velocity[1],
+        ]
+
+        self.pos[0] += frame_movement[0]
+        entity_rect = self.rect
+        for rect in tilemap.physics_rects_around(self.pos):
+            if entity_rect.colliderect(rect):
+                if frame_movement[0] > 0:
+                    entity_rect.right = rect.left
+                    self.collisions["right"] = True
+                elif frame_movement[0] < 0:
+                    entity_rect.left = rect.right
+                    self.collisions["left"] = True
+                self.pos[0] = entity_rect.x
+
+        self.pos[1] += frame_movement[1]
+        entity_rect = self.rect
+        for rect in tilemap.physics_rects_around(self.pos):
+            if entity_rect.colliderect(rect):
+                if frame_movement[1] > 0:
+                    entity_rect.bottom = rect.top + 1
+                    self.collisions["bottom"] = True
+                elif frame_movement[1] < 0:
+                    entity_rect.top = rect.bottom
+                    self.collisions["top"] = True
+                self.pos[1] = entity_rect.y
+
+        self.velocity[1] = min(5, self.velocity[1] + 0.15)
+        if self.collisions["bottom"] or self.collisions["top"]:
+            self.velocity[1] = 0
+
+
+def bench(label, cls, config, tilemap, spawns, movements, frames, repeat):
+    """
+    Time the physics update of entities.
+
+    Returns:
+        float: The best time per entity update, in seconds.
+    """
+
+    def setup():
+        entities = []
+        for pos in spawns:
+            entities.append(cls(config.player_assets, "player", pos, (12, 18)))
+        return entities
+
+    def run(entities):
+        for frame in range(frames):
+            for entity, movement in zip(entities, movements[frame]):
+                cls.update(entity, tilemap, movement)
+
+    best = min(timeit.repeat(lambda: run(setup()), number=1, repeat=repeat)) / (
+        frames * len(spawns)
+    )
+
+    print(f"    {label:<8} {best * 1e6:8.2f} us/update")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--entities", type=int, default=50)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    config = Config()
+    tilemap = Tilemap(config)
+    rng = random.Random(0)
+
+    for name in sorted(os.listdir(config.map_path)):
+        if not name.endswith(".json"):
+            continue
+
+        tilemap.load(config.map_path + name)
+        tiles = [tile for tile in tilemap.grid if tile.type == "grass"]
+        spawns = []
+        for tile in rng.sample(tiles, args.entities):
+            spawns.append(
+                (tile.pos[0] * tilemap.tile_size, (tile.pos[1] - 3) * tilemap.tile_size)
+            )
+        movements = [
+            [(rng.choice((-8, -1, 0, 1, 8)), 0) for _ in spawns]
+            for _ in range(args.frames)
+        ]
+
+        print(f"{name}: {args.entities} entities, {args.frames} frames")
+        before = bench(
+            "rects",
+            RectPhysicsEntity,
+            config,
+            tilemap,
+            spawns,
+            movements,
+            args.frames,
+            args.repeat,
+        )
+        after = bench(
+            "swept",
+            PhysicsEntity,
+            config,
+            tilemap,
+            spawns,
+            movements,
+            args.frames,
+            args.repeat,
+        )
+        print(f"    {before / after:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Microbenchmark for the rendering of the entities facing left. It compares the previous PhysicsEntity.render, which flipped the image of the animation every frame, with the flipped images built once by Animation. A crowd of enemies is drawn on the screen, half of them facing left, and the time of a frame and the surfaces allocated per frame are measured.
+
+The allocations are the surfaces returned by the pygame.transform functions during a frame, with the size of their pixels.
+
+Usage:
+    python benchmarks/sprite_flip.py [--enemies N] [--frames N] [--repeat N]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from config import Config
+from scripts.entities import Enemy
+
+# The functions of pygame.transform that return a new surface.
+TRANSFORMS = ("flip", "scale", "scale_by", "smoothscale", "rotate", "rotozoom")
+
+
+class FlipEachFrameEnemy(Enemy):
+    """
+    The previous rendering of PhysicsEntity.
+    """
+
+    def render(self, surf, offset=(0, 0), alpha=1):
+        pos = self.render_pos(alpha)
+        surf.blit(
+            pygame.transform.flip(self.animation.image, self.flip, False),
+            (
+                pos[0] - offset[0] + self.animation_offsets[0],
+                pos[1] - offset[1] + self.animation_offsets[1],
+            ),
+        )
+
+
+class AllocationCounter:
+    """
+    Count the surfaces returned by the pygame.transform functions, while it is entered.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.originals = {}
+
+    def wrap(self, function):
+        def wrapper(*args, **kwargs):
+            surface = function(*args, **kwargs)
+            self.count += 1
+            self.bytes += (
+                surface.get_width() * surface.get_height() * surface.get_bytesize()
+            )
+            return surface
+
+        return wrapper
+
+    def __enter__(self):
+        for name in TRANSFORMS:
+            self.originals[name] = getattr(pygame.transform, name)
+            setattr(pygame.transform, name, self.wrap(self.originals[name]))
+        return self
+
+    def __exit__(self, *exc):
+        for name, function in self.originals.items():
+            setattr(pygame.transform, name, function)
+
+
+def crowd(cls, config, count, size):
+    """
+    Place enemies on the screen, half of them facing left, in every action.
+
+    Parameters:
+        cls (type): The class of the enemies.
+        config (Config): The config object of the game.
+        count (int): The number of enemies.
+        size (tuple[int, int]): The size of the screen.
+
+    Returns:
+        list[Enemy]: The enemies.
+    """
+
+    rng = random.Random(0)
+    enemies = []
+    for i in range(count):
+        enemy = cls(
+            config.enemy_assets,
+            (rng.uniform(0, size[0] - 12), rng.uniform(0, size[1] - 18)),
+            (12, 18),
+        )
+        enemy.flip = i % 2 == 0
+        enemy.set_action(("idle", "run", "shoot")[i % 3])
+        enemies.append(enemy)
+    return enemies
+
+
+def frame(enemies, surf):
+    """
+    Advance the animations of the enemies and draw them.
+    """
+
+    surf.fill((82, 168, 255))
+    for enemy in enemies:
+        enemy.animation.update()
+        enemy.render(surf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--enemies", type=int, default=60)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    config = Config()
+    surf = pygame.Surface((320, 180))
+
+    print(f"{args.enemies} enemies on a {surf.get_width()}x{surf.get_height()} screen")
+    print(f"    {'render':<20}{'ms/frame':>10}{'surfaces/frame':>16}{'KiB/frame':>11}")
+    for name, cls in (
+        ("flip every frame", FlipEachFrameEnemy),
+        ("pre-flipped", Enemy),
+    ):
+        enemies = crowd(cls, config, args.enemies, surf.get_size())
+        best = min(
+            timeit.repeat(
+                lambda: frame(enemies, surf), number=args.frames, repeat=args.repeat
+            )
+        )
+        with AllocationCounter() as counter:
+            for _ in range(args.frames):
+                frame(enemies, surf)
+        print(
+            f"    {name:<20}{best / args.frames * 1000:10.3f}"
+            f"{counter.count / args.frames:16.1f}"
+            f"{counter.bytes / args.frames / 1024:11.1f}"
+        )
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Memory benchmark for the tilemap. It loads every map in data/maps and reports the memory used per tile and the resident set size of the process before and after loading the maps. The slotted Tile is compared with a plain class keeping its attributes in a per-instance __dict__, as Tile did before.
+
+Usage:
+    python benchmarks/tile_memory.py
+"""
+
+import os
+import sys
+import gc
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from config import Config
+from scripts.tilemap import Tilemap
+from scripts.tiles import Tile
+
+
+class DictTile:
+    """
+    The previous layout of a tile: the same attributes, stored in a per-instance __dict__.
+    """
+
+    def __init__(self, image, pos, type, variant, size, offgrid=False):
+        self.image = image
+        self.pos = list(pos)
+        self.type = type
+        self.variant = variant
+        self.size = size
+        self.offgrid = offgrid
+
+
+def rss():
+    """
+    Get the resident set size of the process.
+
+    Returns:
+        int: The resident set size, in bytes, or 0 if it cannot be read on this platform.
+    """
+
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def traced(func):
+    """
+    Measure the memory allocated by a function and kept after it returns.
+
+    Returns:
+        tuple[object, int]: The result of the function and the allocated memory, in bytes.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    config = Config()
+
+    rss_before = rss()
+    tilemaps = []
+
+    for name in sorted(os.listdir(config.map_path)):
+        if not name.endswith(".json"):
+            continue
+
+        tilemap = Tilemap(config)
+        tilemap.load(config.map_path + name)
+        tilemaps.append(tilemap)
+
+        tiles = list(tilemap.grid) + list(tilemap.offgrid_tiles)
+        fields = [
+            (tile.image, tile.pos, tile.type, tile.variant, tile.size, tile.offgrid)
+            for tile in tiles
+        ]
+        _, slotted = traced(lambda: [Tile(*field) for field in fields])
+        _, plain = traced(lambda: [DictTile(*field) for field in fields])
+
+        print(f"{name}: {len(tiles)} tiles")
+        print(f"    Tile with __slots__  {slotted / len(tiles):8.1f} bytes/tile")
+        print(f"    Tile with __dict__   {plain / len(tiles):8.1f} bytes/tile")
+        print(f"    {plain / slotted:.2f}x less memory")
+
+    rss_after = rss()
+    if rss_before:
+        print(
+            f"resident set size: {rss_before / 2**20:.1f} MiB before loading, "
+            f"{rss_after / 2**20:.1f} MiB with {len(tilemaps)} maps loaded"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Microbenchmark for the tilemap grid lookups. It compares the old string keyed dict ("x;y" keys) with the chunked integer grid used by Tilemap, on every map in data/maps.
+
+Usage:
+    python benchmarks/tilemap_lookup.py [--repeat N]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from config import Config
+from scripts.tilemap import Tilemap, NEIGHBORS_OFFSETS
+
+
+class StringKeyLookup:
+    """
+    The previous storage of the on-grid tiles: a dict keyed by "x;y" strings.
+    """
+
+    def __init__(self, tilemap):
+        self.tile_size = tilemap.tile_size
+        self.physics_tiles = tilemap.config.physics_tiles
+        self.tilemap = {
+            str(tile.pos[0]) + ";" + str(tile.pos[1]): tile for tile in tilemap.grid
+        }
+
+    def tiles_around(self, pos):
+        tile_loc = (
+            int(pos[0] // self.tile_size),
+            int(pos[1] // self.tile_size),
+        )
+        for offset in NEIGHBORS_OFFSETS:
+            check_loc = (
+                str(tile_loc[0] + offset[0]) + ";" + str(tile_loc[1] + offset[1])
+            )
+            if check_loc in self.tilemap:
+                yield self.tilemap[check_loc], offset
+
+    def solid_check(self, pos):
+        tile_loc = (
+            str(int(pos[0] // self.tile_size))
+            + ";"
+            + str(int(pos[1] // self.tile_size))
+        )
+        if tile_loc in self.tilemap:
+            if self.tilemap[tile_loc].type in self.physics_tiles:
+                return self.tilemap[tile_loc]
+
+
+def bench(label, func, points, repeat):
+    """
+    Time a lookup function over a list of points and print the cost per lookup.
+
+    Returns:
+        float: The best time per lookup, in nanoseconds.
+    """
+
+    def run():
+        for point in points:
+            func(point)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat)) / len(points) * 1e9
+    print(f"    {label:<30} {best:8.1f} ns/lookup")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--points", type=int, default=20000)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    config = Config()
+    tilemap = Tilemap(config)
+    rng = random.Random(0)
+
+    for name in sorted(os.listdir(config.map_path)):
+        if not name.endswith(".json"):
+            continue
+
+        tilemap.load(config.map_path + name)
+        old = StringKeyLookup(tilemap)
+
+        xs = [tile.pos[0] for tile in tilemap.grid]
+        ys = [tile.pos[1] for tile in tilemap.grid]
+        points = [
+            (
+                rng.uniform(min(xs), max(xs)) * tilemap.tile_size,
+                rng.uniform(min(ys), max(ys)) * tilemap.tile_size,
+            )
+            for _ in range(args.points)
+        ]
+
+        print(f"{name}: {len(tilemap.grid)} tiles")
+        results = [
+            (
+                "solid_check",
+                bench("solid_check, string keys", old.solid_check, points, args.repeat),
+                bench(
+                    "solid_check, chunked grid",
+                    tilemap.solid_check,
+                    points,
+                    args.repeat,
+                ),
+            ),
+            (
+                "tiles_around",
+                bench(
+                    "tiles_around, string keys",
+                    lambda pos: list(old.tiles_around(pos)),
+                    points,
+                    args.repeat,
+                ),
+                bench(
+                    "tiles_around, chunked grid",
+                    lambda pos: list(tilemap.tiles_around(pos)),
+                    points,
+                    args.repeat,
+                ),
+            ),
+        ]
+        for query, before, after in results:
+            print(f"    {query}: {before / after:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -137,13 +137,39 @@ class Config:
 
         self.autotile_tiles = {"grass"}
 
+        # Tiles the game looks up on the whole map, their chunks are never
+        # unloaded when the map is streamed.
+        self.interactive_tiles = {"barrel", "trap"}
+
         self.font_18 = pygame.font.Font("assets/fonts/PressStart2P.ttf", 18)
         self.font_16 = pygame.font.Font("assets/fonts/PressStart2P.ttf", 16)
         self.font_32 = pygame.font.Font("assets/fonts/PressStart2P.ttf", 32)
+        self.font_8 = pygame.font.Font("assets/fonts/PressStart2P.ttf", 8)
 
         self.map_path = "data/maps/"
+        self.map_streaming = True
+        self.chunk_budget = 64
         self.level_file = "data/level.txt"
 
+        # The actors farther than activity_margin pixels from the view are
+        # only updated every coarse_interval ticks, and the ones farther than
+        # activity_far_margin pixels not at all, see ActivityRegions.
+        self.activity_regions = True
+        self.activity_margin = 128
+        self.activity_far_margin = 384
+        self.coarse_interval = 4
+
+        self.tick_rate = 60
+        self.max_ticks_per_frame = 5
+        # The frames drawn per second are capped, so the game does not spin a
+        # CPU core drawing frames nobody can see. 0 is no cap.
+        self.max_fps = 240
+
+        # The profiler can also be enabled at start with the JOJO_PROFILE
+        # environment variable, and its frames written to the CSV file given
+        # by JOJO_PROFILE_CSV.
+        self.profiler_key = pygame.K_F3
+
         self.theme_music = "assets/sounds/theme.ogg"
         self.end_music = "assets/sounds/end.ogg"
         self.ambience_music = "assets/sounds/ambience.wav"
@@ -1,13 +1,27 @@
+import gc
 import pygame
 import random
 import os
-from scripts.tilemap import Tilemap
-from scripts.entities import Player, Enemy
-from scripts.tiles import Portal
+from scripts.map_format import map_file
+from scripts.map_preloader import MapPreloader
+from scripts.simulation import Simulation, HELD_KEYS
+from scripts.timestep import FixedTimestep
+from scripts.profiler import Profiler, ProfilerGraph
+from scripts.replay import Replay
 from config import Config
 from scripts.clouds import Clouds
 from scripts.screen_transition import ScreenTransition
 from scripts.menu import Menu
+from scripts.hud import HUD
+from scripts.presentation import DISPLAY_MODES, open_display, Presenter
+from scripts.scene import SceneStack
+from scripts.scenes import (
+    PlayScene,
+    StartScene,
+    GameOverScene,
+    PauseScene,
+    CompletedScene,
+)
 
 
 class Game:
@@ -15,40 +29,105 @@ class Game:
     Game class is used to create the main game loop and manage the game states.
     """
 
-    def __init__(self):
+    def __init__(self, record=None, replay=None, display_mode="window", vsync=False):
         """
         Create a new Game object.
+
+        Parameters:
+            record (str): The path of a replay file to record the session to. It is written when the game exits. Default is None, no recording.
+            replay (str): The path of a replay file to play instead of the keyboard. The game exits at the end of the replay. Default is None, no replay.
+            display_mode (str): The display mode, one of DISPLAY_MODES, see open_display. Default is window.
+            vsync (bool): If the frames should be synchronized with the refresh of the display, in the integer and scaled display modes. Default is False.
         """
 
         pygame.init()
-        self.screen = pygame.display.set_mode((640, 360))
+        self.screen = open_display((640, 360), display_mode, vsync)
         pygame.display.set_caption("Jojo")
 
         self.config = Config()
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(
+            self.config.tick_rate, self.config.max_ticks_per_frame
+        )
+        self.pending_events = []
 
         self.display = pygame.Surface((320, 180))
-        self.overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-
-        self.game_state = 0
+        self.presenter = Presenter(self.display, self.screen)
+        self.hud = HUD(self.config, self.screen.get_width())
+
+        self.profiler = Profiler(enabled=bool(os.environ.get("JOJO_PROFILE")))
+        if os.environ.get("JOJO_PROFILE_CSV"):
+            self.profiler.enabled = True
+            self.profiler.record(os.environ["JOJO_PROFILE_CSV"])
+        self.profiler_graph = ProfilerGraph(self.profiler, self.config.font_8)
+        self.simulation = Simulation(
+            self.config, self.display.get_size(), profiler=self.profiler
+        )
+        self.preloader = MapPreloader(self.config)
 
-        self.movement = [False, False]
+        # The clouds and the screenshake use their own random generator, so
+        # drawing the game does not change the random numbers of the simulation.
+        self.random = random.Random()
 
-        self.tilemap = Tilemap(self.config)
+        self.record_path = record
+        self.recorder = Replay() if record else None
+        self.replay = Replay.load(replay) if replay else None
+        self.replay_segment = 0
+        self.replay_tick = 0
+        self.replay_matches = []
 
         self.level = 0
         self.is_new = True
 
-        self.load_level()
-        self.load_map(self.level)
+        self.menu_select = [0]
+        # The menus live as long as the game, and share the selection.
+        font = self.config.font_18
+        self.start_menu = Menu(["CONTINUE", "NEW GAME", "EXIT"], font, self.menu_select)
+        self.new_game_menu = Menu(["NEW GAME", "EXIT"], font, self.menu_select)
+        self.game_over_menu = Menu(["RESTART", "BACK", "EXIT"], font, self.menu_select)
+        self.pause_menu = Menu(["RESUME", "BACK", "EXIT"], font, self.menu_select)
+        self.completed_menu = Menu(
+            ["RESTART", "START NEW", "BACK", "EXIT"], font, self.menu_select
+        )
+
+        self.screen_transition = ScreenTransition(*self.screen.get_size(), 15)
 
-        self.shoot = False
+        # The screens of the game, by game state. The scene on top of the
+        # stack is the one updated and drawn.
+        self.scenes = SceneStack()
+        self.scene_states = {
+            scene.state: scene
+            for scene in (
+                StartScene(self),
+                PlayScene(self),
+                GameOverScene(self),
+                PauseScene(self),
+                CompletedScene(self),
+            )
+        }
+        self.game_state = 0
+        # The scene drawn on the screen by the last frame, and if the screen
+        # transition was drawn over it.
+        self.presented = None
+        self.transition_presented = False
+
+        self.load_level()
+        if self.replay is not None:
+            self.start_replay_segment()
+        else:
+            self.load_map(self.level)
 
-        self.screenshake = 0
+    @property
+    def game_state(self):
+        """
+        The state of the game: 0 for the start screen, 1 for the level, 2 for the game over screen, 3 for the pause screen and 4 for the mission completed screen. It is the state of the scene on top of the scene stack, and setting it shows the scene of the state.
+        """
 
-        self.menu_select = [0]
+        return self.scenes.top.state
 
-        self.screen_transition = ScreenTransition(*self.screen.get_size(), 15)
+    @game_state.setter
+    def game_state(self, state):
+        self.scenes.switch(self.scene_states[state])
 
     def load_level(self):
         """
@@ -71,80 +150,76 @@ class Game:
         with open(self.config.level_file, "w") as file:
             file.write(str(self.level))
 
-    def load_map(self, map_id: int):
+    def map_file(self, map_id: int):
         """
-        Load the map from the file.
+        Get the path of a map file. The binary map is used if it exists and is not older than the JSON map.
 
         Parameters:
-            map_id (int): The id of the map to load.
-        """
+            map_id (int): The id of the map.
 
-        self.tilemap.load(self.config.map_path + str(map_id) + ".json")
-        # self.tilemap.load("map.json")
+        Returns:
+            str: The path of the map file.
+        """
 
-        self.scroll = [0, 0]
+        return map_file(self.config.map_path, map_id)
 
-        self.clouds = Clouds(self.config.cloud_assets, count=8)
+    def map_count(self):
+        """
+        Get the number of maps of the game. A map saved in both formats is counted once.
 
-        self.enemies = []
+        Returns:
+            int: The number of maps.
+        """
 
-        self.player = Player(
-            self.config.player_assets,
-            (20, 50),
-            (12, 18),
-            self.config.projectile_assets["player"],
-            self.config.particles_assets["particle"],
+        return len(
+            {os.path.splitext(name)[0] for name in os.listdir(self.config.map_path)}
         )
 
-        self.scores = 0
-
-        for spawner in self.tilemap.extract(
-            [("spawner", 0), ("spawner", 1)], keep=False
-        ):
-            if spawner.variant == 0:
-                self.player = Player(
-                    self.config.player_assets,
-                    spawner.pos,
-                    (12, 18),
-                    self.config.projectile_assets["player"],
-                    self.config.particles_assets["particle"],
-                )
-            else:
-                self.enemies.append(
-                    Enemy(
-                        self.config.enemy_assets,
-                        spawner.pos,
-                        (12, 18),
-                        self.config.projectile_assets["enemy"],
-                    )
-                )
-
-        self.portals = []
-        for portal in self.tilemap.extract([("portal", 0), ("portal", 1)], keep=False):
-            self.portals.append(
-                Portal(
-                    self.config.tiles_assets["portal"],
-                    portal.pos,
-                    portal.variant,
-                    self.config.tile_size,
-                    self.config.particles_assets["smoke"],
-                )
-            )
+    def preload_map(self, map_id: int):
+        """
+        Start loading a map in the background, so that load_map does not have to parse it.
+
+        Parameters:
+            map_id (int): The id of the map to preload.
+        """
+
+        self.preloader.start(self.map_file(map_id), streaming=self.config.map_streaming)
+
+    def load_map(self, map_id: int, seed=None):
+        """
+        Load the map from the file. If the map was preloaded, the preloaded tilemap is used.
+
+        Parameters:
+            map_id (int): The id of the map to load.
+            seed (int): The seed of the level. Default is None, a new random seed.
+        """
+
+        if self.recorder is not None and self.recorder.segments:
+            self.recorder.end_segment(self.simulation.digest())
 
-        self.enemy_projectiles = []
-        self.player_projectiles = []
+        path = self.map_file(map_id)
+        self.simulation.load_map(path, self.preloader.take(path), seed)
 
-        self.dead_delay = 60
-        self.dead = False
+        # The tiles and the actors of the level live until the next map is
+        # loaded: they are frozen out of the garbage collector, so the
+        # collections during play only scan the objects made since.
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+        # self.simulation.load_map("map.json")
+        self.random.seed(self.simulation.seed + 1)
 
-        self.next_level_delay = 60
-        self.next_level = False
+        if self.recorder is not None:
+            self.recorder.begin_segment(map_id, self.simulation.seed)
 
-        self.lives = 1
+        self.clouds = Clouds(self.config.cloud_assets, count=8, rng=self.random)
+
+        # Do not catch up the time spent loading the map.
+        self.timestep.reset()
 
     def run(self):
         """
-        Run the game loop.
+        Run the game loop. The game logic runs at a fixed rate of config.tick_rate ticks per second, whatever the frame rate. Every frame runs the ticks due since the last frame, then draws the game, with the entities and the camera interpolated between the last two ticks. The frames are capped at config.max_fps, and on the screens that only change on a tick, such as the menus, the loop sleeps until the next tick.
         """
 
         running = True
@@ -154,101 +229,83 @@ class Game:
             running = False
 
         while running:
+            self.profiler.begin_frame()
+
             events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
                     running = False
-
-            if self.game_state == 0:
-                self.game_start(events, exit)
-            elif self.game_state == 1:
-                self.game_play(events)
-            elif self.game_state == 2:
-                self.game_over(events, exit)
-            elif self.game_state == 3:
-                self.game_pause(events, exit)
-            elif self.game_state == 4:
-                self.mission_completed(events, exit)
-
-            self.screen_transition.update()
-            self.screen_transition.render(self.screen)
-
-            pygame.display.flip()
-            self.clock.tick(60)
+                if event.type == pygame.KEYDOWN:
+                    if event.key == self.config.profiler_key:
+                        self.profiler.toggle()
+
+            # The events of a frame without a tick are kept for the next tick.
+            self.pending_events.extend(events)
+
+            ticks = self.timestep.advance()
+            for _ in range(ticks):
+                if not running:
+                    break
+                events = self.pending_events
+                self.pending_events = []
+                self.update(events, exit)
+
+            self.present()
+
+            # A scene that only changes on a tick has nothing new to draw
+            # before the next one.
+            if not self.scenes.top.interpolated:
+                pygame.time.wait(int(self.timestep.time_to_next_tick() * 1000))
+
+            if self.profiler.enabled:
+                self.profiler_graph.add(self.profiler.end_frame())
+
+            self.clock.tick(self.config.max_fps)
+        self.profiler.close()
+
+        if self.recorder is not None:
+            self.recorder.end_segment(self.simulation.digest())
+            self.recorder.save(self.record_path)
+        if self.replay is not None:
+            print(
+                f"replay: {self.replay_matches.count(True)} of "
+                f"{len(self.replay_matches)} segments match the recording"
+            )
         pygame.quit()
 
-    def game_start(self, events, exit):
+    def update(self, events, exit):
         """
-        Show the game start screen.
+        Run one tick of the current game state.
 
         Parameters:
             events (list): The list of events.
             exit (function): The function to exit the game.
         """
 
-        if not pygame.mixer.music.get_busy():
-            self.play_music(self.config.theme_music)
+        self.scenes.top.update(events, exit)
+        self.screen_transition.update()
 
-        if self.screen_transition.is_done():
-            self.game_state = 1
-            pygame.mixer.music.stop()
-            return
-
-        menu = Menu(
-            (
-                ["CONTINUE", "NEW GAME", "EXIT"]
-                if not self.is_new
-                else ["NEW GAME", "EXIT"]
-            ),
-            self.config.font_18,
-            self.menu_select,
-        )
-
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                    if self.is_new:
-                        if menu.selected[0] == 0:
-                            self.screen_transition.start()
-                            with open(self.config.level_file, "w") as file:
-                                file.write("0")
-                        elif menu.selected[0] == 1:
-                            exit()
-                    else:
-                        if menu.selected[0] == 0:
-                            self.screen_transition.start()
-                        elif menu.selected[0] == 1:
-                            self.level = 0
-                            self.save_level()
-                            self.load_map(self.level)
-                            self.screen_transition.start()
-                        elif menu.selected[0] == 2:
-                            exit()
-
-        self.display.blit(
-            self.config.background_image,
-            (0, 0),
-        )
-
-        self.display.blit(
-            self.config.title_image,
-            (
-                self.display.get_width() / 2 - self.config.title_image.get_width() / 2,
-                16,
-            ),
-        )
+    def present(self):
+        """
+        Draw the current scene on the screen and send it to the display. The whole screen is drawn when the scene changed or during the screen transition. Otherwise the scene only draws what changed, and only those areas of the screen are sent to the display: a menu screen whose selection did not change is not sent at all.
+        """
 
-        self.screen.blit(
-            pygame.transform.scale(self.display, self.screen.get_size()),
-            (0, 0),
-        )
+        scene = self.scenes.top
+        transition = self.screen_transition.transitioning
+        full = scene is not self.presented or transition or self.transition_presented
+        self.presented = scene
+        self.transition_presented = transition
 
-        menu.render(self.screen)
-        menu.update(events)
+        rects = scene.render(self.screen, full)
+        self.screen_transition.render(self.screen)
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
 
     def game_play(self, events):
         """
-        Play the game.
+        Play the game for one tick. The game is drawn by render_play.
 
         Parameters:
             events (list): The list of events.
@@ -258,15 +315,17 @@ class Game:
         if not pygame.mixer.music.get_busy():
             self.play_music(self.config.ambience_music, 0.1)
 
+        simulation = self.simulation
+
         if self.screen_transition.is_done():
-            if self.next_level:
-                if self.level < len(os.listdir(self.config.map_path)) - 1:
+            if simulation.next_level:
+                if self.level < self.map_count() - 1:
                     self.level += 1
                     self.save_level()
                     self.load_map(self.level)
                 else:
                     self.game_state = 4
-            elif self.dead:
+            elif simulation.dead:
                 self.menu_select[0] = 0
                 self.game_state = 2
 
@@ -274,499 +333,136 @@ class Game:
 
             return
 
-        self.display.fill((82, 168, 255))
+        pressed = pygame.key.get_pressed()
+        held = tuple(key for key in HELD_KEYS if pressed[key])
+        if self.recorder is not None:
+            self.recorder.record(events, held)
 
-        self.overlay.fill((0, 0, 0, 0))
+        next_level = simulation.next_level
+        simulation.update(events, held)
 
-        scores_surf = self.config.font_16.render(
-            "SCORES " + str(self.scores).rjust(5, "0"), True, (255, 255, 255)
-        )
-        self.overlay.blit(
-            scores_surf,
-            (self.overlay.get_width() - scores_surf.get_width() - 16, 16),
-        )
-
-        level_surf = self.config.font_16.render(
-            "LEVEL " + str(self.level + 1).rjust(2, "0"), True, (255, 255, 255)
-        )
-        self.overlay.blit(
-            level_surf,
-            (
-                self.overlay.get_width()
-                - scores_surf.get_width()
-                - 16
-                - level_surf.get_width()
-                - 32,
-                16,
-            ),
-        )
-
-        self.overlay.blit(
-            pygame.transform.scale_by(self.config.player_icon, 2.5), (16, 16)
-        )
-
-        for i in range(3):
-            surf = pygame.transform.scale_by(
-                self.config.live_images[1 if i < self.lives else 0], 3
-            )
-            self.overlay.blit(
-                surf,
-                (
-                    16
-                    + self.config.player_icon.get_width() * 2.5
-                    + 8
-                    + (surf.get_width() + 4) * i,
-                    16,
-                ),
-            )
-
-        self.clouds.update()
-        self.clouds.render(self.display, self.scroll)
-
-        self.screenshake = max(0, self.screenshake - 1)
-
-        self.scroll[0] += (
-            self.player.rect.centerx - self.display.get_width() * 1 / 3 - self.scroll[0]
-        ) / 30
-        self.scroll[1] += (
-            self.player.rect.centery - self.display.get_height() / 2 - self.scroll[1]
-        ) / 30
-        render_scroll = (
-            int(self.scroll[0]),
-            int(self.scroll[1]),
-        )
+        if simulation.next_level and not next_level:
+            if self.level < self.map_count() - 1:
+                self.preload_map(self.level + 1)
 
-        if self.dead:
-            if self.dead_delay > 0:
-                self.dead_delay -= 1
-
-        if self.dead_delay <= 0:
-            self.lives -= 1
-            if self.lives > 0:
-                self.player = Player(
-                    self.config.player_assets,
-                    (self.player.pos[0], self.player.pos[1] - 14),
-                    (12, 18),
-                    self.config.projectile_assets["player"],
-                    self.config.particles_assets["particle"],
-                )
-                self.config.sfx["select"].play()
-                self.dead = False
-                self.dead_delay = 60
-            else:
-                self.screen_transition.start()
-
-        if self.next_level:
-            if self.next_level_delay > 0:
-                self.next_level_delay -= 1
-
-        if self.next_level_delay <= 0:
+        if simulation.finished:
             self.screen_transition.start()
 
-        self.tilemap.render(self.display, offset=render_scroll)
-        self.tilemap.update()
-
-        for barrel in self.tilemap.extract([("barrel", 0), ("barrel", 1)]):
-            self.tilemap.tile_at(barrel.pos).update(
-                self.tilemap, self.player, self.enemies
-            )
-
-        for portal in self.portals:
-            portal.render(self.display, render_scroll)
-            if portal.update(self.player):
-                self.enemies.append(
-                    Enemy(
-                        self.config.enemy_assets,
-                        portal.pos,
-                        (12, 18),
-                        self.config.projectile_assets["enemy"],
-                    )
-                )
-
-        for projectile in self.enemy_projectiles.copy():
-            if self.tilemap.solid_check(
-                (
-                    projectile.rect.centerx
-                    + 2 * (1 if projectile.direction > 0 else -1),
-                    projectile.rect.centery,
-                )
-            ):
-                projectile.remove()
-
-            elif self.player.rect.colliderect(projectile.rect):
-                projectile.remove()
-                self.player.kill(projectile.direction, self.config.sfx["hurt"])
-                self.dead = True
-                self.screenshake = max(16, self.screenshake)
-
-            kill = projectile.update()
-            projectile.render(self.display, offset=render_scroll)
-            if kill:
-                self.enemy_projectiles.remove(projectile)
-
-        for enemy in self.enemies.copy():
-            kill = enemy.update(
-                self.tilemap,
-                self.enemy_projectiles.append,
-                self.player,
-                movement=(0, 0),
-            )
-            enemy.render(self.display, render_scroll)
-            if kill:
-                self.scores += 10
-                self.enemies.remove(enemy)
-
-        self.player.update(
-            self.tilemap,
-            movement=(self.movement[1] - self.movement[0], 0),
-        )
-        self.player.render(self.display, offset=render_scroll)
-
-        if self.player.dead:
-            self.dead = True
-
-        if self.dead == True:
-            self.movement = [False, False]
-
-        if self.shoot:
-            if self.player.shoot(self.player_projectiles.append):
-                self.config.sfx["shoot"].play()
-                self.screenshake = max(4, self.screenshake)
-
-        for ammo in self.tilemap.extract([("ammo", 0)]).copy():
-            if self.player.rect.colliderect(ammo.rect):
-                self.config.sfx["select"].play()
-                self.lives = min(3, 1 + self.lives)
-                self.tilemap.remove_tile(
-                    ammo.pos,
-                    (ammo.pos[0] - self.scroll[0], ammo.pos[1] - self.scroll[1]),
-                    self.scroll,
-                )
-
-        for checkpoint in self.tilemap.extract([("checkpoint", 0)]).copy():
-            if self.player.rect.colliderect(checkpoint.rect):
-                self.next_level = True
-                self.screenshake = max(30, self.screenshake)
-
-        for projectile in self.player_projectiles.copy():
-            collision = self.tilemap.solid_check(
-                (
-                    projectile.rect.centerx
-                    + 3 * (1 if projectile.direction > 0 else -1),
-                    projectile.rect.centery,
-                )
-            )
-
-            if collision:
-                projectile.remove(self.config.sfx["hit"])
-
-                if collision.type == "barrel":
-                    collision.explode(self.config.sfx["bomb"])
-
-                    self.screenshake = max(25, self.screenshake)
-                else:
-                    self.screenshake = max(8, self.screenshake)
-
-            else:
-                for enemy in self.enemies.copy():
-                    if projectile.rect.colliderect(enemy.rect):
-                        projectile.remove(self.config.sfx["explosion"])
-                        enemy.dead = True
-                        self.screenshake = max(16, self.screenshake)
-                        break
-                else:
-                    for portal in self.portals:
-                        if not portal.destroyed and projectile.rect.colliderect(
-                            portal.rect
-                        ):
-                            destroyed = portal.destroy()
-
-                            if destroyed:
-                                self.screenshake = max(25, self.screenshake)
-                                self.config.sfx["bomb"].play()
-                                self.scores += 50
-                            else:
-                                projectile.remove()
-                                self.screenshake = max(8, self.screenshake)
-                            break
-
-            kill = projectile.update()
-            projectile.render(self.display, offset=render_scroll)
-            if kill:
-                self.player_projectiles.remove(projectile)
-
-        if not self.dead:
-            for trap in self.tilemap.extract([("trap", 0)]):
-                player_rect = pygame.Rect(
-                    self.player.rect.centerx - self.config.tile_size / 2,
-                    self.player.rect.bottom - self.config.tile_size / 2,
-                    self.config.tile_size,
-                    self.config.tile_size / 2,
-                )
-
-                trap_rect = pygame.Rect(
-                    trap.pos[0],
-                    trap.pos[1],
-                    trap.size,
-                    trap.size,
-                )
-                if player_rect.colliderect(trap_rect):
-                    self.player.kill(0, self.config.sfx["hurt"])
-                    self.dead = True
-                    self.screenshake = max(25, self.screenshake)
-
         for event in events:
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
-                    self.movement[0] = True
-                if event.key == pygame.K_RIGHT:
-                    self.movement[1] = True
-
-                if event.key == pygame.K_UP:
-                    if self.player.jump():
-                        self.config.sfx["jump"].play()
-                if event.key == pygame.K_c:
-                    if self.player.dash():
-                        self.config.sfx["dash"].play()
-
-                if event.key == pygame.K_x:
-                    self.shoot = True
-
                 if event.key == pygame.K_ESCAPE:
                     self.game_state = 3
 
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_LEFT:
-                    self.movement[0] = False
-                if event.key == pygame.K_RIGHT:
-                    self.movement[1] = False
-                if event.key == pygame.K_x:
-                    self.shoot = False
-
-        screenshake_offset = (
-            random.random() * self.screenshake - self.screenshake / 2,
-            random.random() * self.screenshake - self.screenshake / 2,
-        )
+    def start_replay_segment(self):
+        """
+        Load the map of the current segment of the replay, with the seed of the recording.
+        """
 
-        self.screen.blit(
-            pygame.transform.scale(self.display, self.screen.get_size()),
-            screenshake_offset,
-        )
-        self.screen.blit(self.overlay, (0, 0))
+        segment = self.replay.segments[self.replay_segment]
+        self.level = segment.map_id
+        self.replay_tick = 0
+        self.load_map(segment.map_id, segment.seed)
+        self.game_state = 1
 
-    def game_over(self, events, exit):
+    def replay_play(self, exit):
         """
-        Show the game over screen.
+        Play one tick of the replay, with the recorded input instead of the keyboard. The menus are skipped: the next segment is loaded as soon as the current one ends. At the end of the replay, the game exits.
 
         Parameters:
-            events (list): The list of events.
             exit (function): The function to exit the game.
         """
 
         if not pygame.mixer.music.get_busy():
-            self.play_music(self.config.end_music)
-
-        menu = Menu(["RESTART", "BACK", "EXIT"], self.config.font_18, self.menu_select)
-
-        if self.screen_transition.is_done():
-            if menu.selected[0] == 0:
-                self.game_state = 1
-            elif menu.selected[0] == 1:
-                self.game_state = 0
-            self.menu_select[0] = 0
+            self.play_music(self.config.ambience_music, 0.1)
 
-            pygame.mixer.music.stop()
+        segment = self.replay.segments[self.replay_segment]
 
+        if self.replay_tick == len(segment.ticks):
+            self.replay_matches.append(
+                not segment.ticks or self.simulation.digest() == segment.digest
+            )
+            self.replay_segment += 1
+            if self.replay_segment < len(self.replay.segments):
+                self.start_replay_segment()
+            else:
+                exit()
             return
 
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                    if menu.selected[0] == 0:
-                        self.load_map(self.level)
-                        self.screen_transition.start()
-                    elif menu.selected[0] == 1:
-                        self.load_map(self.level)
-                        self.screen_transition.start()
-                    elif menu.selected[0] == 2:
-                        exit()
-
-        title = self.config.font_32.render("MISSION FAILED", True, (255, 255, 255))
-
-        self.screen.blit(
-            pygame.transform.scale(
-                self.config.background_image, self.screen.get_size()
-            ),
-            (0, 0),
-        )
-
-        self.screen.blit(
-            title,
-            (
-                (self.screen.get_width() - title.get_width()) / 2,
-                64,
-            ),
-        )
-
-        player_image = pygame.transform.scale_by(
-            self.config.player_dead_image.copy(), 2
-        )
-
-        self.screen.blit(
-            player_image,
-            (
-                (self.screen.get_width() - title.get_width()) / 2 + 16,
-                64 - player_image.get_height(),
-            ),
-        )
+        events, held = segment.input(self.replay_tick)
+        self.replay_tick += 1
+        self.simulation.update(events, held)
 
-        menu.render(self.screen)
-        menu.update(events)
+        if self.simulation.finished:
+            self.screen_transition.start()
 
-    def game_pause(self, events, exit):
+    def render_play(self, alpha=1):
         """
-        Show the game pause screen.
+        Draw the level and the HUD on the screen.
 
         Parameters:
-            events (list): The list of events.
-            exit (function): The function to exit the game.
+            alpha (float): The fraction of a tick elapsed since the last tick, used to interpolate the entities and the camera. Default is 1, the state after the last tick.
         """
 
-        if not pygame.mixer.music.get_busy():
-            self.play_music(self.config.theme_music, 0.1)
+        simulation = self.simulation
+        profiler = self.profiler
+        render_scroll = simulation.camera(alpha)
 
-        menu = Menu(["RESUME", "BACK", "EXIT"], self.config.font_18, self.menu_select)
+        with profiler.section("hud"):
+            self.render_hud()
 
-        if self.screen_transition.is_done():
-            if menu.selected[0] == 0:
-                self.game_state = 1
-            elif menu.selected[0] == 1:
-                self.game_state = 0
-            self.menu_select[0] = 0
+        with profiler.section("background"):
+            self.display.fill((82, 168, 255))
 
-            pygame.mixer.music.stop()
-            return
+            self.clouds.update()
+            self.clouds.render(self.display, render_scroll)
 
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                    if menu.selected[0] == 0:
-                        self.screen_transition.start()
-                    elif menu.selected[0] == 1:
-                        self.load_map(self.level)
-                        self.screen_transition.start()
-                    elif menu.selected[0] == 2:
-                        exit()
-
-        title = self.config.font_32.render("GAME PAUSE", True, (255, 255, 255))
-
-        self.screen.blit(
-            pygame.transform.scale(
-                self.config.background_image, self.screen.get_size()
-            ),
-            (0, 0),
-        )
+        with profiler.section("tilemap render"):
+            simulation.tilemap.render(self.display, offset=render_scroll)
 
-        self.screen.blit(
-            title,
-            (
-                (self.screen.get_width() - title.get_width()) / 2,
-                64,
-            ),
-        )
+        with profiler.section("entity render"):
+            # The portals and the enemies out of the screen are not drawn, with
+            # a margin for their images and smoke, which overflow their rects.
+            view = pygame.Rect(render_scroll, self.display.get_size()).inflate(
+                self.config.tile_size * 8, self.config.tile_size * 8
+            )
 
-        player_image = pygame.transform.scale_by(
-            self.config.player_dead_image.copy(), 2
-        )
+            for portal in simulation.portals:
+                if view.colliderect(portal.rect):
+                    portal.render(self.display, render_scroll)
 
-        self.screen.blit(
-            player_image,
-            (
-                (self.screen.get_width() - title.get_width()) / 2 + 16,
-                64 - player_image.get_height(),
-            ),
-        )
+            simulation.enemy_projectiles.render(self.display, render_scroll, alpha)
 
-        menu.render(self.screen)
-        menu.update(events)
+            for enemy in simulation.enemies:
+                if view.colliderect(enemy.rect):
+                    enemy.render(self.display, render_scroll, alpha)
 
-    def mission_completed(self, events, exit):
-        """
-        Show the mission completed screen.
+            simulation.player.render(self.display, render_scroll, alpha)
 
-        Parameters:
-            events (list): The list of events.
-            exit (function): The function to exit the game.
-        """
+            simulation.player_projectiles.render(self.display, render_scroll, alpha)
 
-        if not pygame.mixer.music.get_busy():
-            self.play_music(self.config.end_music)
+            simulation.sparks.render(self.display, render_scroll)
 
-        menu = Menu(
-            ["RESTART", "START NEW", "BACK", "EXIT"],
-            self.config.font_18,
-            self.menu_select,
+        screenshake = simulation.screenshake
+        screenshake_offset = (
+            self.random.random() * screenshake - screenshake / 2,
+            self.random.random() * screenshake - screenshake / 2,
         )
 
-        if self.screen_transition.is_done():
-            if menu.selected[0] == 0:
-                self.game_state = 1
-            elif menu.selected[0] == 1:
-                self.game_state = 1
-            elif menu.selected[0] == 2:
-                self.game_state = 0
-            self.menu_select[0] = 0
-            pygame.mixer.music.stop()
-            return
+        with profiler.section("scale"):
+            self.presenter.present(screenshake_offset)
 
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                    if menu.selected[0] == 0:
-                        self.load_map(self.level)
-                        self.screen_transition.start()
-                    elif menu.selected[0] == 1:
-                        self.level = 0
-                        self.save_level()
-                        self.load_map(self.level)
-                        self.screen_transition.start()
-                    elif menu.selected[0] == 2:
-                        self.load_map(self.level)
-                        self.screen_transition.start()
-                    elif menu.selected[0] == 3:
-                        exit()
-
-        title = self.config.font_32.render("MISSION COMPLETED", True, (255, 255, 255))
-
-        self.screen.blit(
-            pygame.transform.scale(
-                self.config.background_image, self.screen.get_size()
-            ),
-            (0, 0),
-        )
+        with profiler.section("hud"):
+            self.hud.render(self.screen)
 
-        self.screen.blit(
-            title,
-            (
-                (self.screen.get_width() - title.get_width()) / 2,
-                64,
-            ),
-        )
+        if profiler.enabled:
+            self.profiler_graph.render(self.screen, (16, 48))
 
-        player_image = pygame.transform.scale_by(
-            self.config.player_dead_image.copy(), 2
-        )
-
-        self.screen.blit(
-            player_image,
-            (
-                (self.screen.get_width() - title.get_width()) / 2 + 16,
-                64 - player_image.get_height(),
-            ),
-        )
+    def render_hud(self):
+        """
+        Update the HUD: the scores, the level and the lives. It is only drawn again when one of them changed.
+        """
 
-        menu.render(self.screen)
-        menu.update(events)
+        self.hud.update(self.simulation.scores, self.level, self.simulation.lives)
 
     def play_music(self, path, volume=0.3):
         """
@@ -783,4 +479,29 @@ class Game:
 
 
 if __name__ == "__main__":
-    Game().run()
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", help="record the session to this replay file")
+    parser.add_argument("--replay", help="play this replay file")
+    parser.add_argument(
+        "--display",
+        choices=DISPLAY_MODES,
+        default="window",
+        help="the display mode, default is window",
+    )
+    parser.add_argument(
+        "--vsync",
+        action="store_true",
+        help="synchronize the frames with the display, with --display integer or scaled",
+    )
+    args = parser.parse_args()
+    if args.vsync and args.display == "window":
+        parser.error("--vsync needs --display integer or scaled")
+
+    Game(
+        record=args.record,
+        replay=args.replay,
+        display_mode=args.display,
+        vsync=args.vsync,
+    ).run()
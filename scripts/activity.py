@@ -0,0 +1,103 @@
+import pygame
+
+# The activity levels of an actor, from its distance to the view.
+ACTIVE = 0
+COARSE = 1
+DORMANT = 2
+
+
+class ActivityRegions:
+    """
+    The regions of a level around the camera that decide how often the actors are updated. An actor is placed in a region by its position. In the view or near it, the actor is active and updated every tick. Farther, it is coarse and only updated every few ticks, and even farther it is dormant and not updated at all: it keeps its state and resumes from it when the camera comes near again.
+
+    The coarse actors are spread over the ticks by an index, so they do not all update on the same tick.
+    """
+
+    def __init__(self, view_size, margin=128, far_margin=384, coarse_interval=4):
+        """
+        Create a new ActivityRegions object.
+
+        Parameters:
+            view_size (tuple[int, int]): The size of the view followed by the camera, in pixels.
+            margin (int): The distance from the view where the actors stop being active, in pixels. Default is 128.
+            far_margin (int): The distance from the view where the actors become dormant, in pixels. Default is 384.
+            coarse_interval (int): The number of ticks between two updates of a coarse actor. Default is 4.
+        """
+
+        self.view_size = view_size
+        self.margin = margin
+        self.far_margin = far_margin
+        self.coarse_interval = coarse_interval
+        self.tick = 0
+        self.active = pygame.Rect(0, 0, 0, 0)
+        self.coarse = pygame.Rect(0, 0, 0, 0)
+        self.update((0, 0), 0)
+
+    def update(self, scroll, tick):
+        """
+        Move the regions with the camera.
+
+        Parameters:
+            scroll (tuple[int, int]): The offset of the camera.
+            tick (int): The number of the tick, which spreads the coarse updates.
+        """
+
+        self.tick = tick
+        self.active = pygame.Rect(scroll, self.view_size).inflate(
+            self.margin * 2, self.margin * 2
+        )
+        self.coarse = pygame.Rect(scroll, self.view_size).inflate(
+            self.far_margin * 2, self.far_margin * 2
+        )
+        # The sides of the regions, tested by level without building rects.
+        self.active_bounds = (
+            self.active.left,
+            self.active.top,
+            self.active.right,
+            self.active.bottom,
+        )
+        self.coarse_bounds = (
+            self.coarse.left,
+            self.coarse.top,
+            self.coarse.right,
+            self.coarse.bottom,
+        )
+
+    def level(self, pos):
+        """
+        Get the activity level of an actor.
+
+        Parameters:
+            pos (tuple[float, float]): The position of the actor.
+
+        Returns:
+            int: ACTIVE, COARSE or DORMANT.
+        """
+
+        x, y = pos
+        left, top, right, bottom = self.active_bounds
+        if left <= x < right and top <= y < bottom:
+            return ACTIVE
+        left, top, right, bottom = self.coarse_bounds
+        if left <= x < right and top <= y < bottom:
+            return COARSE
+        return DORMANT
+
+    def due(self, pos, index=0):
+        """
+        Check if an actor is updated on this tick.
+
+        Parameters:
+            pos (tuple[float, float]): The position of the actor.
+            index (int): The index of the actor, which spreads the coarse actors over the ticks. Default is 0.
+
+        Returns:
+            bool: If the actor is active, or coarse and due on this tick.
+        """
+
+        level = self.level(pos)
+        if level == ACTIVE:
+            return True
+        if level == COARSE:
+            return (self.tick + index) % self.coarse_interval == 0
+        return False
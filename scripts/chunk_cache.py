@@ -0,0 +1,231 @@
+import math
+import pygame
+from .chunk_grid import CHUNK_SHIFT, CHUNK_SIZE
+
+
+LAYER_OFFGRID = 0
+LAYER_GRID = 1
+
+
+class ChunkCache:
+    """
+    A cache of pre-rendered tilemap chunks. The static tiles of every chunk are baked once into a surface, so rendering the tilemap is a few blits per frame instead of one blit per tile. A chunk has two layers, the offgrid decor and the on-grid tiles, which keeps the drawing order of the tilemap. Tiles that are not static are not baked. The on-grid ones (barrels) are drawn live by render, on top of their chunk. The off-grid ones (portals, only left in the tilemap by the editor) must be drawn live by the tilemap.
+    """
+
+    def __init__(self, tilemap):
+        """
+        Create a new ChunkCache object.
+
+        Parameters:
+            tilemap (Tilemap): The tilemap to cache.
+        """
+
+        self.tilemap = tilemap
+        self.surfaces = ({}, {})
+        self.live_tiles = {}
+        self.premultiplied = {}
+
+    @property
+    def chunk_pixels(self):
+        """
+        Get the size of a chunk in pixels.
+        """
+
+        return CHUNK_SIZE * self.tilemap.tile_size
+
+    def clear(self):
+        """
+        Drop all the baked chunks. They will be rebuilt when they become visible.
+        """
+
+        self.surfaces = ({}, {})
+        self.live_tiles = {}
+
+    def evict(self, key):
+        """
+        Drop the baked layers of a chunk, to free their memory.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+        """
+
+        self.surfaces[LAYER_OFFGRID].pop(key, None)
+        self.surfaces[LAYER_GRID].pop(key, None)
+        self.live_tiles.pop(key, None)
+
+    def invalidate_cell(self, pos):
+        """
+        Mark the chunk of a grid cell to be rebuilt.
+
+        Parameters:
+            pos (tuple[int, int]): The grid position of the cell.
+        """
+
+        key = (int(pos[0]) >> CHUNK_SHIFT, int(pos[1]) >> CHUNK_SHIFT)
+        self.surfaces[LAYER_GRID].pop(key, None)
+        self.live_tiles.pop(key, None)
+
+    def invalidate_rect(self, rect):
+        """
+        Mark the offgrid layer of all the chunks overlapping a rect to be rebuilt.
+
+        Parameters:
+            rect (pygame.Rect): The rect that changed, in pixels.
+        """
+
+        chunk_pixels = self.chunk_pixels
+        for cx in range(rect.left // chunk_pixels, rect.right // chunk_pixels + 1):
+            for cy in range(rect.top // chunk_pixels, rect.bottom // chunk_pixels + 1):
+                self.surfaces[LAYER_OFFGRID].pop((cx, cy), None)
+
+    def premultiply(self, image):
+        """
+        Get the premultiplied alpha version of a tile image. Chunks are baked and blitted with premultiplied blending, so stacking semi-transparent tiles in a chunk gives the same colors as blitting them one by one.
+
+        Parameters:
+            image (pygame.Surface): The image of the tile.
+
+        Returns:
+            pygame.Surface: The premultiplied image, with the colorkey turned into transparent pixels.
+        """
+
+        premultiplied = self.premultiplied.get(image)
+        if premultiplied is None:
+            # Blitting onto a fully transparent surface skips the colorkey and
+            # multiplies the colors by the alpha of the image.
+            premultiplied = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            premultiplied.blit(image, (0, 0))
+            self.premultiplied[image] = premultiplied
+        return premultiplied
+
+    def build_grid_layer(self, key):
+        """
+        Bake the static on-grid tiles of a chunk.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            pygame.Surface: The baked layer or None if the chunk has no static tile.
+        """
+
+        surf = None
+        live_tiles = []
+        chunk = self.tilemap.grid.fetch(key)
+
+        if chunk is not None:
+            chunk_pixels = self.chunk_pixels
+            origin = (key[0] * chunk_pixels, key[1] * chunk_pixels)
+            for tile in chunk.tiles:
+                if tile is None:
+                    continue
+                if not tile.static:
+                    live_tiles.append(tile)
+                    continue
+                if surf is None:
+                    surf = pygame.Surface((chunk_pixels, chunk_pixels), pygame.SRCALPHA)
+                surf.blit(
+                    self.premultiply(tile.image),
+                    (
+                        tile.pos[0] * tile.size - origin[0],
+                        tile.pos[1] * tile.size - origin[1],
+                    ),
+                    special_flags=pygame.BLEND_PREMULTIPLIED,
+                )
+
+        self.surfaces[LAYER_GRID][key] = surf
+        self.live_tiles[key] = live_tiles
+        return surf
+
+    def build_offgrid_layer(self, key):
+        """
+        Bake the static offgrid tiles overlapping a chunk.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            pygame.Surface: The baked layer or None if no static offgrid tile overlaps the chunk.
+        """
+
+        surf = None
+        chunk_pixels = self.chunk_pixels
+        chunk_rect = pygame.Rect(
+            key[0] * chunk_pixels, key[1] * chunk_pixels, chunk_pixels, chunk_pixels
+        )
+
+        for tile in self.tilemap.offgrid_tiles.query_rect(chunk_rect):
+            if tile.static:
+                if surf is None:
+                    surf = pygame.Surface((chunk_pixels, chunk_pixels), pygame.SRCALPHA)
+                surf.blit(
+                    self.premultiply(tile.image),
+                    (
+                        math.floor(tile.pos[0]) - chunk_rect.x,
+                        math.floor(tile.pos[1]) - chunk_rect.y,
+                    ),
+                    special_flags=pygame.BLEND_PREMULTIPLIED,
+                )
+
+        self.surfaces[LAYER_OFFGRID][key] = surf
+        return surf
+
+    def visible_chunks(self, surf, offset):
+        """
+        Get the chunks intersecting the camera.
+
+        Parameters:
+            surf (pygame.Surface): The surface the tilemap is rendered on.
+            offset (tuple[int, int]): The offset of the screen.
+
+        Yields:
+            tuple[int, int]: The position of the visible chunks in chunk coordinates.
+        """
+
+        chunk_pixels = self.chunk_pixels
+        for cx in range(
+            int(offset[0] // chunk_pixels),
+            int((offset[0] + surf.get_width()) // chunk_pixels) + 1,
+        ):
+            for cy in range(
+                int(offset[1] // chunk_pixels),
+                int((offset[1] + surf.get_height()) // chunk_pixels) + 1,
+            ):
+                yield cx, cy
+
+    def render(self, surf, layer, offset=(0, 0)):
+        """
+        Render a layer of the visible chunks, building the chunks that are not baked yet. For the on-grid layer, the live tiles of the visible chunks are rendered on top of it.
+
+        Parameters:
+            surf (pygame.Surface): The surface to render the chunks.
+            layer (int): The layer to render, LAYER_OFFGRID or LAYER_GRID.
+            offset (tuple[int, int]): The offset of the screen. Default is (0, 0).
+        """
+
+        chunk_pixels = self.chunk_pixels
+        surfaces = self.surfaces[layer]
+        build = (
+            self.build_grid_layer if layer == LAYER_GRID else self.build_offgrid_layer
+        )
+        visible = list(self.visible_chunks(surf, offset))
+
+        for key in visible:
+            if key in surfaces:
+                chunk_surf = surfaces[key]
+            else:
+                chunk_surf = build(key)
+            if chunk_surf is not None:
+                surf.blit(
+                    chunk_surf,
+                    (
+                        key[0] * chunk_pixels - offset[0],
+                        key[1] * chunk_pixels - offset[1],
+                    ),
+                    special_flags=pygame.BLEND_PREMULTIPLIED,
+                )
+
+        if layer == LAYER_GRID:
+            for key in visible:
+                for tile in self.live_tiles.get(key, ()):
+                    tile.render(surf, offset)
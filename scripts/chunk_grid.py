@@ -0,0 +1,237 @@
+CHUNK_SHIFT = 4
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+
+class Chunk:
+    """
+    A fixed-size square block of grid cells. Cells are stored in flat arrays indexed by (y * CHUNK_SIZE + x), where x and y are the local coordinates of the cell inside the chunk.
+    """
+
+    def __init__(self, pos):
+        """
+        Create a new, empty Chunk object.
+
+        Parameters:
+            pos (tuple[int, int]): The position of the chunk in chunk coordinates.
+        """
+
+        self.pos = pos
+        self.tiles = [None] * (CHUNK_SIZE * CHUNK_SIZE)
+        self.types = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        self.variants = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        self.count = 0
+
+
+class ChunkGrid:
+    """
+    A sparse grid of tiles addressed by integer tile coordinates. The grid is split into chunks of CHUNK_SIZE x CHUNK_SIZE cells, so a lookup is one dict probe for the chunk and one list index for the cell. Beside the tile objects, every chunk keeps the small-int type id and variant of each cell, which is what the compact map formats and the hot queries work on.
+
+    The grid can be backed by a loader, a function called with the position of a chunk that is not in the grid. It should put the chunk in the grid and return it, or return None if there is no chunk there. This lets chunks be loaded lazily, every query still sees the whole map.
+    """
+
+    def __init__(self, type_names):
+        """
+        Create a new, empty ChunkGrid object.
+
+        Parameters:
+            type_names (list[str]): The tile types that can be stored in the grid. The type id of a tile is its index in this list plus one, the id 0 is used for empty cells.
+        """
+
+        self.chunks = {}
+        self.type_names = [None] + list(type_names)
+        self.type_ids = {name: i for i, name in enumerate(self.type_names) if name}
+        self.count = 0
+        self.loader = None
+
+    def fetch(self, key):
+        """
+        Get a chunk, loading it with the loader if it is not in the grid.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            Chunk: The chunk or None if there is no chunk at the position.
+        """
+
+        chunk = self.chunks.get(key)
+        if chunk is None and self.loader is not None:
+            chunk = self.loader(key)
+        return chunk
+
+    def get(self, x, y):
+        """
+        Get the tile at a grid position.
+
+        Parameters:
+            x (int): The x position of the cell, in tiles.
+            y (int): The y position of the cell, in tiles.
+
+        Returns:
+            Tile: The tile at the position or None if the cell is empty.
+        """
+
+        chunk = self.chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+        if chunk is None:
+            if self.loader is None:
+                return None
+            chunk = self.loader((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+            if chunk is None:
+                return None
+        return chunk.tiles[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)]
+
+    def type_at(self, x, y):
+        """
+        Get the type id of the tile at a grid position.
+
+        Parameters:
+            x (int): The x position of the cell, in tiles.
+            y (int): The y position of the cell, in tiles.
+
+        Returns:
+            int: The type id of the tile or 0 if the cell is empty.
+        """
+
+        chunk = self.chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+        if chunk is None:
+            if self.loader is None:
+                return 0
+            chunk = self.loader((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+            if chunk is None:
+                return 0
+        return chunk.types[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)]
+
+    def set(self, x, y, tile):
+        """
+        Put a tile at a grid position, replacing the tile that was there.
+
+        Parameters:
+            x (int): The x position of the cell, in tiles.
+            y (int): The y position of the cell, in tiles.
+            tile (Tile): The tile to put in the cell.
+
+        Returns:
+            Tile: The replaced tile or None if the cell was empty.
+        """
+
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        chunk = self.fetch(key)
+        if chunk is None:
+            chunk = self.chunks[key] = Chunk(key)
+
+        index = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+        replaced = chunk.tiles[index]
+        if replaced is None:
+            chunk.count += 1
+            self.count += 1
+        chunk.tiles[index] = tile
+        chunk.types[index] = self.type_ids[tile.type]
+        chunk.variants[index] = tile.variant
+        return replaced
+
+    def set_variant(self, x, y, variant):
+        """
+        Update the stored variant of the tile at a grid position.
+
+        Parameters:
+            x (int): The x position of the cell, in tiles.
+            y (int): The y position of the cell, in tiles.
+            variant (int): The new variant of the tile.
+        """
+
+        chunk = self.fetch((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+        if chunk is not None:
+            index = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+            chunk.variants[index] = variant
+
+    def remove(self, x, y):
+        """
+        Remove the tile at a grid position. Chunks that become empty are dropped.
+
+        Parameters:
+            x (int): The x position of the cell, in tiles.
+            y (int): The y position of the cell, in tiles.
+
+        Returns:
+            Tile: The removed tile or None if the cell was empty.
+        """
+
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        chunk = self.fetch(key)
+        if chunk is None:
+            return None
+
+        index = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+        tile = chunk.tiles[index]
+        if tile is not None:
+            chunk.tiles[index] = None
+            chunk.types[index] = 0
+            chunk.variants[index] = 0
+            chunk.count -= 1
+            self.count -= 1
+            if not chunk.count:
+                del self.chunks[key]
+        return tile
+
+    def put_chunk(self, chunk):
+        """
+        Put a whole chunk in the grid, replacing the chunk at its position. Its tiles, type ids and variants should already be filled.
+
+        Parameters:
+            chunk (Chunk): The chunk to put.
+        """
+
+        replaced = self.chunks.get(chunk.pos)
+        if replaced is not None:
+            self.count -= replaced.count
+        chunk.count = sum(1 for tile in chunk.tiles if tile is not None)
+        self.count += chunk.count
+        if chunk.count:
+            self.chunks[chunk.pos] = chunk
+        else:
+            self.chunks.pop(chunk.pos, None)
+
+    def pop_chunk(self, key):
+        """
+        Take a whole chunk out of the grid. The loader is not called.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            Chunk: The removed chunk or None if the chunk was not in the grid.
+        """
+
+        chunk = self.chunks.pop(key, None)
+        if chunk is not None:
+            self.count -= chunk.count
+        return chunk
+
+    def clear(self):
+        """
+        Remove all the tiles from the grid and its loader.
+        """
+
+        self.chunks = {}
+        self.count = 0
+        self.loader = None
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, pos):
+        return self.get(pos[0], pos[1]) is not None
+
+    def __iter__(self):
+        """
+        Iterate over all the tiles of the chunks in the grid, chunk by chunk. Chunks that are not loaded are not iterated.
+
+        Yields:
+            Tile: The tiles of the grid.
+        """
+
+        for chunk in list(self.chunks.values()):
+            for tile in chunk.tiles:
+                if tile is not None:
+                    yield tile
@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from .chunk_grid import CHUNK_SHIFT, CHUNK_MASK
+
+
+class ChunkStream:
+    """
+    Streams the on-grid chunks of a binary map into a tilemap. Only the chunks near the camera are kept in the grid: the other chunks are decoded from the memory-mapped map when they are queried or when the camera gets near them, and the least recently used ones are evicted when there are more than a budget of them.
+
+    Some chunks are never evicted:
+        - pinned chunks, which hold interactive tiles (barrels, traps) that the game looks up on the whole map every frame. They are decoded when the map is opened.
+        - modified chunks, whose tiles were placed or removed since the map was loaded, since the map file does not know about the changes.
+
+    The offgrid tiles are not streamed, they are always loaded.
+    """
+
+    def __init__(self, tilemap, map_file, budget=64, margin=1):
+        """
+        Create a new ChunkStream object and find the pinned chunks of the map. The tilemap grid should be empty.
+
+        Parameters:
+            tilemap (Tilemap): The tilemap to stream the chunks into.
+            map_file (MapFile): The opened binary map. It is closed with the stream.
+            budget (int): The maximum number of chunks kept loaded, not counting the pinned and modified chunks. Default is 64.
+            margin (int): The number of chunks around the camera that are loaded ahead. Default is 1.
+        """
+
+        self.tilemap = tilemap
+        self.map_file = map_file
+        self.budget = budget
+        self.margin = margin
+        self.type_table = map_file.type_table(tilemap.grid.type_ids)
+        self.loaded = OrderedDict()
+        self.pinned = set()
+        self.modified = set()
+        self.loading = False
+
+        pinned_ids = bytes(
+            type_id
+            for type_id, name in enumerate(map_file.palette)
+            if name in tilemap.config.interactive_tiles
+        )
+        for key in map_file.chunks:
+            types = map_file.chunk(key)[0]
+            if any(type_id in types for type_id in pinned_ids):
+                self.pinned.add(key)
+
+        tilemap.grid.loader = self.load
+
+    def load_pinned(self):
+        """
+        Decode the pinned chunks. It should be called once the stream is the stream of the tilemap, so the autotiling of the chunks sees the chunks that are not loaded.
+        """
+
+        for key in self.map_file.chunks:
+            if key in self.pinned:
+                self.load(key)
+
+    def load(self, key):
+        """
+        Decode a chunk of the map into the grid. It is used as the loader of the tilemap grid.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            Chunk: The decoded chunk or None if there is no chunk at the position in the map.
+        """
+
+        if (
+            self.loading
+            or key in self.modified
+            or key in self.loaded
+            or key not in self.map_file.chunks
+        ):
+            return self.tilemap.grid.chunks.get(key)
+
+        # The autotiling of a new chunk may query its neighbors, which must not
+        # load them in turn.
+        self.loading = True
+        try:
+            self.tilemap.load_chunk(self.map_file, key, self.type_table)
+            self.loaded[key] = None
+            self.tilemap.autotile(self.tilemap.chunk_positions(key))
+        finally:
+            self.loading = False
+        return self.tilemap.grid.chunks.get(key)
+
+    def type_at(self, x, y):
+        """
+        Get the type of the tile at a grid position in the map file, without loading its chunk.
+
+        Parameters:
+            x (int): The x position of the cell, in tiles.
+            y (int): The y position of the cell, in tiles.
+
+        Returns:
+            str: The type of the tile or None if the cell is empty.
+        """
+
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        if key in self.modified:
+            return None
+
+        layers = self.map_file.chunk(key)
+        if layers is None:
+            return None
+        return self.map_file.palette[
+            layers[0][((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)]
+        ]
+
+    def modify(self, key):
+        """
+        Mark a chunk as modified. It will never be evicted nor decoded again from the map file.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+        """
+
+        if key not in self.modified:
+            self.load(key)
+            self.modified.add(key)
+            self.loaded.pop(key, None)
+
+    def update(self, offset, size):
+        """
+        Load the chunks around the camera and evict the least recently used chunks over the budget.
+
+        Parameters:
+            offset (tuple[int, int]): The offset of the screen.
+            size (tuple[int, int]): The size of the screen.
+        """
+
+        chunk_pixels = self.tilemap.chunk_cache.chunk_pixels
+        near = [
+            (cx, cy)
+            for cx in range(
+                int(offset[0] // chunk_pixels) - self.margin,
+                int((offset[0] + size[0]) // chunk_pixels) + self.margin + 1,
+            )
+            for cy in range(
+                int(offset[1] // chunk_pixels) - self.margin,
+                int((offset[1] + size[1]) // chunk_pixels) + self.margin + 1,
+            )
+        ]
+
+        for key in near:
+            if key in self.loaded:
+                self.loaded.move_to_end(key)
+            else:
+                self.load(key)
+
+        evictable = [key for key in self.loaded if key not in self.pinned]
+        for key in evictable[: max(0, len(evictable) - self.budget)]:
+            if key not in near:
+                self.evict(key)
+
+    def evict(self, key):
+        """
+        Drop a chunk from the grid and from the chunk cache. It will be decoded again from the map file when needed.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+        """
+
+        del self.loaded[key]
+        chunk = self.tilemap.grid.pop_chunk(key)
+        if chunk is not None:
+            for tile in chunk.tiles:
+                if tile is not None:
+                    self.tilemap.unregister(tile)
+        self.tilemap.chunk_cache.evict(key)
+
+    def load_all(self):
+        """
+        Decode all the chunks of the map that are not loaded.
+        """
+
+        for key in self.map_file.chunks:
+            self.load(key)
+
+    def close(self):
+        """
+        Close the map file.
+        """
+
+        self.map_file.close()
@@ -6,6 +6,8 @@ class Cloud:
     A cloud object that will be rendered in the background.
     '''
 
+    __slots__ = ("image", "pos", "speed", "depth")
+
     def __init__(self, image, pos, speed, depth):
         '''
         Create a new Cloud object.
@@ -58,13 +60,14 @@ class Clouds:
     A collection of cloud objects that will be rendered in the background.
     '''
 
-    def __init__(self, assets, count=16):
+    def __init__(self, assets, count=16, rng=random):
         '''
         Create a new Clouds object.
 
         Parameters:
             assets (list): The assets of the clouds. It should contain the images of the clouds.
             count (int): The number of clouds to create. Default is 16.
+            rng (random.Random): The random generator used to place the clouds. Default is the random module.
         '''
 
         self.clouds = []
@@ -72,10 +75,10 @@ class Clouds:
         for _ in range(count):
             self.clouds.append(
                 Cloud(
-                    random.choice(assets),
-                    (random.random() * 99999, random.random() * 99999),
-                    random.random() * 0.04 + 0.02,
-                    random.random() * 0.5 + 0.1,
+                    rng.choice(assets),
+                    (rng.random() * 99999, rng.random() * 99999),
+                    rng.random() * 0.04 + 0.02,
+                    rng.random() * 0.5 + 0.1,
                 )
             )
 
@@ -0,0 +1,100 @@
+import math
+
+# Contact normals, pointing from the tile to the entity.
+NORMAL_LEFT = (1, 0)
+NORMAL_RIGHT = (-1, 0)
+NORMAL_TOP = (0, 1)
+NORMAL_BOTTOM = (0, -1)
+
+
+def solid_ids(tilemap):
+    """
+    Get the type ids of the physics tiles of a tilemap.
+
+    Parameters:
+        tilemap (Tilemap): The tilemap.
+
+    Returns:
+        frozenset[int]: The type ids in the tilemap grid of the tiles in config.physics_tiles.
+    """
+
+    type_ids = tilemap.grid.type_ids
+    return frozenset(
+        type_ids[type] for type in tilemap.config.physics_tiles if type in type_ids
+    )
+
+
+def sweep_x(tilemap, box, dx, solid):
+    """
+    Move a box along the x axis, stopping at the first physics tile in its way. Only the grid cells swept by the front edge of the box are checked, so a fast box cannot go through a tile.
+
+    Parameters:
+        tilemap (Tilemap): The tilemap to collide with.
+        box (tuple[float, float, float, float]): The x, y, width and height of the box, in pixels.
+        dx (float): The movement of the box.
+        solid (frozenset[int]): The type ids of the physics tiles, see solid_ids.
+
+    Returns:
+        tuple[float, tuple[int, int]]: The new x position of the box and the normal of the contact, or None if the box did not hit a tile.
+    """
+
+    x, y, w, h = box
+    if not dx:
+        return x, None
+
+    size = tilemap.tile_size
+    type_at = tilemap.grid.type_at
+    rows = range(math.floor(y / size), math.ceil((y + h) / size))
+
+    if dx > 0:
+        for column in range(math.floor((x + w) / size), math.ceil((x + w + dx) / size)):
+            for row in rows:
+                if type_at(column, row) in solid:
+                    return column * size - w, NORMAL_RIGHT
+    else:
+        for column in range(
+            math.ceil(x / size) - 1, math.floor((x + dx) / size) - 1, -1
+        ):
+            for row in rows:
+                if type_at(column, row) in solid:
+                    return (column + 1) * size, NORMAL_LEFT
+
+    return x + dx, None
+
+
+def sweep_y(tilemap, box, dy, solid):
+    """
+    Move a box along the y axis, stopping at the first physics tile in its way. Only the grid cells swept by the front edge of the box are checked, so a fast box cannot go through a tile. A box that does not move is checked for a tile right under it.
+
+    Parameters:
+        tilemap (Tilemap): The tilemap to collide with.
+        box (tuple[float, float, float, float]): The x, y, width and height of the box, in pixels.
+        dy (float): The movement of the box.
+        solid (frozenset[int]): The type ids of the physics tiles, see solid_ids.
+
+    Returns:
+        tuple[float, tuple[int, int]]: The new y position of the box and the normal of the contact, or None if the box did not hit a tile.
+    """
+
+    x, y, w, h = box
+
+    size = tilemap.tile_size
+    type_at = tilemap.grid.type_at
+    columns = range(math.floor(x / size), math.ceil((x + w) / size))
+
+    if dy >= 0:
+        # A box touching the top of a tile is in contact with it, so a box
+        # resting on the ground keeps its contact when it does not move.
+        for row in range(
+            math.floor((y + h) / size), math.floor((y + h + dy) / size) + 1
+        ):
+            for column in columns:
+                if type_at(column, row) in solid:
+                    return row * size - h, NORMAL_BOTTOM
+    else:
+        for row in range(math.ceil(y / size) - 1, math.floor((y + dy) / size) - 1, -1):
+            for column in columns:
+                if type_at(column, row) in solid:
+                    return (row + 1) * size, NORMAL_TOP
+
+    return y + dy, None
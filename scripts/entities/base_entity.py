@@ -1,4 +1,12 @@
 import pygame
+from ..collision import (
+    sweep_x,
+    sweep_y,
+    NORMAL_LEFT,
+    NORMAL_RIGHT,
+    NORMAL_TOP,
+    NORMAL_BOTTOM,
+)
 
 
 class PhysicsEntity:
@@ -22,6 +30,7 @@ class PhysicsEntity:
         self.assets = assets
         self.type = type
         self.pos = list(pos)
+        self.previous_pos = list(pos)
         self.size = size
         self.velocity = [0, 0]
         self.collisions = {
@@ -32,6 +41,9 @@ class PhysicsEntity:
         }
 
         self.action = ""
+        # The animation of each action, copied from the assets once and reset
+        # when the action is set again.
+        self.animations = {}
         self.animation_offsets = (-7, -4)
         self.flip = False
         self.set_action("idle")
@@ -47,7 +59,13 @@ class PhysicsEntity:
 
         if self.action != action:
             self.action = action
-            self.animation = self.assets[self.type + "/" + action].copy()
+            animation = self.animations.get(action)
+            if animation is None:
+                animation = self.assets[self.type + "/" + action].copy()
+                self.animations[action] = animation
+            else:
+                animation.reset()
+            self.animation = animation
 
     def update(self, tilemap, movement: tuple[float, float] = (0, 0)):
         """
@@ -58,41 +76,35 @@ class PhysicsEntity:
             movement (tuple[float, float]): The movement of the entity. It should be a tuple with the x and y movement. Default is (0, 0).
         """
 
-        self.collisions = {
-            "top": False,
-            "bottom": False,
-            "left": False,
-            "right": False,
-        }
+        self.previous_pos[0] = self.pos[0]
+        self.previous_pos[1] = self.pos[1]
 
-        frame_movement = [
+        frame_movement = (
             movement[0] + self.velocity[0],
             movement[1] + self.velocity[1],
-        ]
-
-        self.pos[0] += frame_movement[0]
-        entity_rect = self.rect
-        for rect in tilemap.physics_rects_around(self.pos):
-            if entity_rect.colliderect(rect):
-                if frame_movement[0] > 0:
-                    entity_rect.right = rect.left
-                    self.collisions["right"] = True
-                elif frame_movement[0] < 0:
-                    entity_rect.left = rect.right
-                    self.collisions["left"] = True
-                self.pos[0] = entity_rect.x
-
-        self.pos[1] += frame_movement[1]
-        entity_rect = self.rect
-        for rect in tilemap.physics_rects_around(self.pos):
-            if entity_rect.colliderect(rect):
-                if frame_movement[1] > 0:
-                    entity_rect.bottom = rect.top + 1
-                    self.collisions["bottom"] = True
-                elif frame_movement[1] < 0:
-                    entity_rect.top = rect.bottom
-                    self.collisions["top"] = True
-                self.pos[1] = entity_rect.y
+        )
+        solid = tilemap.solid_ids
+        collisions = self.collisions
+
+        # The collision box is one pixel shorter than the entity, so the
+        # entity stands one pixel into the ground.
+        self.pos[0], normal = sweep_x(
+            tilemap,
+            (self.pos[0], self.pos[1], self.size[0], self.size[1] - 1),
+            frame_movement[0],
+            solid,
+        )
+        collisions["left"] = normal is NORMAL_LEFT
+        collisions["right"] = normal is NORMAL_RIGHT
+
+        self.pos[1], normal = sweep_y(
+            tilemap,
+            (self.pos[0], self.pos[1], self.size[0], self.size[1] - 1),
+            frame_movement[1],
+            solid,
+        )
+        collisions["top"] = normal is NORMAL_TOP
+        collisions["bottom"] = normal is NORMAL_BOTTOM
 
         if movement[0] < 0:
             self.flip = True
@@ -108,23 +120,46 @@ class PhysicsEntity:
 
         self.animation.update()
 
-    def render(self, surf: pygame.Surface, offset: tuple[int, int] = (0, 0)):
+    def render(
+        self,
+        surf: pygame.Surface,
+        offset: tuple[int, int] = (0, 0),
+        alpha: float = 1,
+    ):
         """
         Render the entity to the screen.
 
         Parameters:
             surf (pygame.Surface): The surface to render the entity.
             offset (tuple[int, int]): The offset to render the entity, relative to the screen. Default is (0, 0).
+            alpha (float): The fraction of a tick elapsed since the last update, used to interpolate the position of the entity between its last two updates. Default is 1, the position after the last update.
         """
 
+        pos = self.render_pos(alpha)
         surf.blit(
-            pygame.transform.flip(self.animation.image, self.flip, False),
+            self.animation.flipped_image if self.flip else self.animation.image,
             (
-                self.pos[0] - offset[0] + self.animation_offsets[0],
-                self.pos[1] - offset[1] + self.animation_offsets[1],
+                pos[0] - offset[0] + self.animation_offsets[0],
+                pos[1] - offset[1] + self.animation_offsets[1],
             ),
         )
 
+    def render_pos(self, alpha: float = 1):
+        """
+        Get the position of the entity interpolated between its last two updates.
+
+        Parameters:
+            alpha (float): The fraction of a tick elapsed since the last update. Default is 1.
+
+        Returns:
+            tuple[float, float]: The interpolated position.
+        """
+
+        return (
+            self.previous_pos[0] + (self.pos[0] - self.previous_pos[0]) * alpha,
+            self.previous_pos[1] + (self.pos[1] - self.previous_pos[1]) * alpha,
+        )
+
     @property
     def rect(self):
         """
@@ -1,6 +1,5 @@
 import random
 from .base_entity import PhysicsEntity
-from ..projectile import Projectile
 
 
 class Enemy(PhysicsEntity):
@@ -13,7 +12,6 @@ class Enemy(PhysicsEntity):
         assets,
         pos: tuple[float, float],
         size: tuple[float, float],
-        projectile_animation,
     ):
         """
         Create a new Enemy object.
@@ -22,7 +20,6 @@ class Enemy(PhysicsEntity):
             assets (dict): The assets of the enemy. It should contain the animations for the enemy. Each key should be the type of the animation and the value should be an Animation object.
             pos (tuple[float, float]): The position of the enemy.
             size (tuple[float, float]): The size of the enemy.
-            projectile_animation (Animation): The animation of the projectile that the enemy will shoot. It should be an Animation object.
         """
 
         super().__init__(
@@ -34,7 +31,6 @@ class Enemy(PhysicsEntity):
         self.walking = 0
         self.shooting = 0
         self.dead = False
-        self.projectile_animation = projectile_animation
 
     def update(
         self,
@@ -48,7 +44,7 @@ class Enemy(PhysicsEntity):
 
         Parameters:
             tilemap (Tilemap): The tilemap object where the enemy is.
-            add_projectile (function): The function to add a new projectile to the game.
+            add_projectile (function): The function to shoot a new projectile, with its position and direction.
             player (PhysicsEntity): The player object.
             movement (tuple[float, float]): The movement of the enemy. It should be a tuple with the x and y movement. Default is (0, 0).
         '''
@@ -78,24 +74,12 @@ class Enemy(PhysicsEntity):
                 if abs(dis[1]) < 16:
                     if self.flip and dis[0] < 0:
                         add_projectile(
-                            Projectile(
-                                self.projectile_animation,
-                                "enemy",
-                                (self.rect.centerx - 10, self.rect.centery + 2),
-                                (4, 4),
-                                -3,
-                            )
+                            (self.rect.centerx - 10, self.rect.centery + 2), -3
                         )
                         self.shooting = 20
                     if not self.flip and dis[0] > 0:
                         add_projectile(
-                            Projectile(
-                                self.projectile_animation,
-                                "enemy",
-                                (self.rect.centerx + 10, self.rect.centery + 2),
-                                (4, 4),
-                                3,
-                            )
+                            (self.rect.centerx + 10, self.rect.centery + 2), 3
                         )
                         self.shooting = 20
 
@@ -1,9 +1,7 @@
 import random
 import math
 from .base_entity import PhysicsEntity
-from ..particle import Particle
-from ..projectile import Projectile
-import pygame
+from ..particle_system import ParticleSystem
 
 
 class Player(PhysicsEntity):
@@ -16,7 +14,6 @@ class Player(PhysicsEntity):
         assets,
         pos,
         size,
-        projectile_animation,
         particle_animation,
     ):
         """
@@ -26,7 +23,6 @@ class Player(PhysicsEntity):
             assets (dict): The assets of the player. It should contain the animations for the player. Each key should be the type of the animation and the value should be an Animation object.
             pos (tuple[float, float]): The position of the player.
             size (tuple[float, float]): The size of the player.
-            projectile_animation (Animation): The animation of the projectile that the player will shoot. It should be an Animation object.
             particle_animation (Animation): The animation of the particles that will appear when the player dashes. It should be an Animation object.
         """
 
@@ -38,32 +34,27 @@ class Player(PhysicsEntity):
         self.shooting = 0
         self.dead = False
         self.dead_direction = 1
-        self.particles = []
-        self.projectile_animation = projectile_animation
-        self.particle_animation = particle_animation
+        self.particles = ParticleSystem({"particle": particle_animation})
 
-    def render(self, surf, offset=(0, 0)):
-        super().render(surf, offset)
-        for particle in self.particles.copy():
-            kill = particle.update()
-            particle.render(surf, offset=offset)
+    def render(self, surf, offset=(0, 0), alpha=1):
+        super().render(surf, offset, alpha)
+        self.particles.render(surf, offset)
 
-            if kill:
-                self.particles.remove(particle)
-
-    def update(self, tilemap, movement: tuple[float, float] = (0, 0)):
+    def update(self, tilemap, movement: tuple[float, float] = (0, 0), climb: int = 0):
         """
         Update the player.
 
         Parameters:
             tilemap (Tilemap): The tilemap object where the player is.
             movement (tuple[float, float]): The movement of the player. It should be a tuple with the x and y movement. Default is (0, 0).
+            climb (int): The direction the player climbs in when on a ladder: -1 for up, 1 for down and 0 to stay. Default is 0.
         """
 
         if self.dead:
             self.set_action("dead")
             self.velocity[0] = 0
             super().update(tilemap, movement=(0, 0))
+            self.update_particles()
             return
 
         super().update(tilemap, movement)
@@ -102,27 +93,19 @@ class Player(PhysicsEntity):
 
             for tile, offset in tilemap.tiles_around(self.rect.midtop):
                 if tile.type == "ladder" and offset[0] == 0:
-                    self.velocity[1] = 0
+                    self.velocity[1] = climb
                     self.air_time = 0
-                    keys = pygame.key.get_pressed()
-                    if keys[pygame.K_UP]:
-                        self.velocity[1] = -1
-                    elif keys[pygame.K_DOWN]:
-                        self.velocity[1] = 1
 
         if abs(self.dashing) in {50, 60}:
             for _ in range(20):
                 angle = random.random() * math.pi * 2
                 speed = random.random() * 0.5 + 0.5
                 particle_velocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-                self.particles.append(
-                    Particle(
-                        self.particle_animation,
-                        "particle",
-                        self.rect.center,
-                        particle_velocity,
-                        frame=random.randint(0, 7),
-                    )
+                self.particles.emit(
+                    "particle",
+                    self.rect.center,
+                    particle_velocity,
+                    frame=random.randint(0, 7),
                 )
 
         if self.dashing > 0:
@@ -138,14 +121,11 @@ class Player(PhysicsEntity):
                 abs(self.dashing) / self.dashing * random.random() * 3,
                 0,
             ]
-            self.particles.append(
-                Particle(
-                    self.particle_animation,
-                    "particle",
-                    self.rect.center,
-                    particle_velocity,
-                    frame=random.randint(0, 7),
-                )
+            self.particles.emit(
+                "particle",
+                self.rect.center,
+                particle_velocity,
+                frame=random.randint(0, 7),
             )
 
         if self.velocity[0] > 0:
@@ -155,6 +135,15 @@ class Player(PhysicsEntity):
 
         self.shooting = max(0, self.shooting - 1)
 
+        self.update_particles()
+
+    def update_particles(self):
+        """
+        Update the dash particles of the player and remove the finished ones.
+        """
+
+        self.particles.update()
+
     def jump(self):
         """
         Make the player jump.
@@ -209,7 +198,7 @@ class Player(PhysicsEntity):
         Make the player shoot a projectile.
 
         Parameters:
-            add_projectile (function): The function that will add the projectile to the game.
+            add_projectile (function): The function that will shoot the projectile, with its position and direction.
 
         Returns:
             bool: If the player shot or not.
@@ -218,16 +207,11 @@ class Player(PhysicsEntity):
         if not self.dead and not self.shooting:
             self.shooting = 8
             add_projectile(
-                Projectile(
-                    self.projectile_animation,
-                    "player",
-                    (
-                        self.rect.centerx + 10 * (-1 if self.flip else 1),
-                        self.rect.centery + 2,
-                    ),
-                    (4, 4),
-                    -3 if self.flip else 3,
-                )
+                (
+                    self.rect.centerx + 10 * (-1 if self.flip else 1),
+                    self.rect.centery + 2,
+                ),
+                -3 if self.flip else 3,
             )
             return True
         
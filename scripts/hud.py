@@ -0,0 +1,153 @@
+import pygame
+
+
+class CachedText:
+    """
+    A text drawn with a font from a value, for example the scores. The text is only rendered again when the value changes.
+    """
+
+    __slots__ = ("font", "format", "color", "value", "surf")
+
+    def __init__(self, font, format, color=(255, 255, 255)):
+        """
+        Create a new CachedText object.
+
+        Parameters:
+            font (pygame.font.Font): The font of the text.
+            format (function): The function that gives the text of a value.
+            color (tuple[int, int, int]): The color of the text. Default is white.
+        """
+
+        self.font = font
+        self.format = format
+        self.color = color
+        self.value = None
+        self.surf = None
+
+    def render(self, value):
+        """
+        Get the text of a value.
+
+        Parameters:
+            value (object): The value.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+
+        if self.surf is None or value != self.value:
+            self.value = value
+            self.surf = self.font.render(self.format(value), True, self.color)
+        return self.surf
+
+
+class HUD:
+    """
+    The heads-up display of a level: the player icon and the lives on the left, the level and the scores on the right. It is retained: the widgets are rendered once and composited on a surface that only covers the bounding rect of the HUD, and that surface is only drawn again when the scores, the level or the lives change. Drawing the HUD on the screen is then a single blit.
+    """
+
+    def __init__(self, config, width):
+        """
+        Create a new HUD object.
+
+        Parameters:
+            config (Config): The config object of the game.
+            width (int): The width of the screen, the scores are aligned on its right side.
+        """
+
+        self.width = width
+        self.scores = CachedText(
+            config.font_16, lambda scores: "SCORES " + str(scores).rjust(5, "0")
+        )
+        self.level = CachedText(
+            config.font_16, lambda level: "LEVEL " + str(level + 1).rjust(2, "0")
+        )
+        self.icon = pygame.transform.scale_by(config.player_icon, 2.5)
+        # The lives are placed from the unrounded width of the scaled icon.
+        self.icon_width = config.player_icon.get_width() * 2.5
+        # The images of a lost and of a remaining life.
+        self.live_images = [
+            pygame.transform.scale_by(image, 3) for image in config.live_images[:2]
+        ]
+
+        self.state = None
+        self.surf = None
+        self.rect = None
+
+    def layout(self, scores, level, lives):
+        """
+        Place the widgets of the HUD on the screen.
+
+        Parameters:
+            scores (int): The scores.
+            level (int): The index of the level.
+            lives (int): The number of lives of the player.
+
+        Returns:
+            list[tuple[pygame.Surface, tuple[float, float]]]: The widgets and their positions on the screen.
+        """
+
+        scores_surf = self.scores.render(scores)
+        level_surf = self.level.render(level)
+
+        widgets = [
+            (scores_surf, (self.width - scores_surf.get_width() - 16, 16)),
+            (
+                level_surf,
+                (
+                    self.width
+                    - scores_surf.get_width()
+                    - 16
+                    - level_surf.get_width()
+                    - 32,
+                    16,
+                ),
+            ),
+            (self.icon, (16, 16)),
+        ]
+        for i in range(3):
+            surf = self.live_images[1 if i < lives else 0]
+            widgets.append(
+                (surf, (16 + self.icon_width + 8 + (surf.get_width() + 4) * i, 16))
+            )
+        return widgets
+
+    def update(self, scores, level, lives):
+        """
+        Draw the HUD again if a value changed since the last update.
+
+        Parameters:
+            scores (int): The scores.
+            level (int): The index of the level.
+            lives (int): The number of lives of the player.
+
+        Returns:
+            bool: If the HUD was drawn again.
+        """
+
+        state = (scores, level, lives)
+        if state == self.state:
+            return False
+        self.state = state
+
+        widgets = self.layout(scores, level, lives)
+        self.rect = pygame.Rect(widgets[0][1], widgets[0][0].get_size()).unionall(
+            [pygame.Rect(pos, surf.get_size()) for surf, pos in widgets[1:]]
+        )
+        if self.surf is None or self.surf.get_size() != self.rect.size:
+            self.surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.surf.fill((0, 0, 0, 0))
+        for surf, (x, y) in widgets:
+            self.surf.blit(surf, (x - self.rect.x, y - self.rect.y))
+        return True
+
+    def render(self, surf):
+        """
+        Draw the HUD on the screen.
+
+        Parameters:
+            surf (pygame.Surface): The screen.
+        """
+
+        if self.surf is not None:
+            surf.blit(self.surf, self.rect)
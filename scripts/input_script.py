@@ -0,0 +1,73 @@
+import pygame
+
+# Runs, jumps, dashes and shoots on the first seconds of a level.
+DEFAULT_SCRIPT = """
+5 down right
+20 down x
+40 down up
+60 up x
+80 down c
+150 down up
+200 up right
+200 down left
+230 down x
+260 up left
+260 down right
+300 down c
+400 down up
+500 up x
+520 down up
+700 down c
+"""
+
+
+def parse_script(text):
+    """
+    Parse an input script. An input script has one key event per line: the tick it is applied on, "down" or "up", and the name of the key as given by pygame.key.name. Empty lines and lines starting with # are ignored. pygame should be initialized.
+
+        40 down right
+        60 down x
+        90 up x
+
+    Parameters:
+        text (str): The content of the script.
+
+    Returns:
+        dict[int, list[pygame.event.Event]]: The key events keyed by the tick they are applied on.
+    """
+
+    script = {}
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        try:
+            tick, action, key = line.split()
+            event_type = {"down": pygame.KEYDOWN, "up": pygame.KEYUP}[action]
+            event = pygame.event.Event(event_type, key=pygame.key.key_code(key))
+            script.setdefault(int(tick), []).append(event)
+        except (ValueError, KeyError):
+            raise ValueError(
+                f"invalid line {number} of the input script: {line!r}"
+            ) from None
+
+    return script
+
+
+def load_script(path=None):
+    """
+    Load an input script from a file.
+
+    Parameters:
+        path (str): The path of the script. Default is None, the built-in DEFAULT_SCRIPT is used.
+
+    Returns:
+        dict[int, list[pygame.event.Event]]: The key events keyed by the tick they are applied on.
+    """
+
+    if path is None:
+        return parse_script(DEFAULT_SCRIPT)
+
+    with open(path, "r") as file:
+        return parse_script(file.read())
@@ -0,0 +1,271 @@
+import os
+import mmap
+import struct
+from .chunk_grid import CHUNK_SHIFT, CHUNK_SIZE, CHUNK_MASK
+
+BINARY_MAP_EXTENSION = ".jmap"
+
+MAGIC = b"JOJOMAP\0"
+VERSION = 1
+
+# magic, version, tile size, chunk size, palette size, chunk count, offgrid count
+HEADER = struct.Struct("<8sHHHHII")
+# chunk x, chunk y, offset of the chunk layers in the file
+CHUNK_RECORD = struct.Struct("<iiI")
+# type, variant, x, y
+OFFGRID_RECORD = struct.Struct("<BBdd")
+
+CHUNK_CELLS = CHUNK_SIZE * CHUNK_SIZE
+
+
+class MapFile:
+    """
+    A memory-mapped binary map. The file is made of a header, a palette with the tile types used by the map, a chunk table, an offgrid record table and the grid layers:
+
+        header        magic, version, tile size, chunk size and the size of each table
+        palette       for each type, its name length (u8) and its name (utf-8)
+        chunk table   for each chunk, its position (i32, i32) and the offset of its layers (u32)
+        offgrid table for each offgrid tile, its type id (u8), variant (u8) and position (f64, f64)
+        grid layers   for each chunk, CHUNK_SIZE * CHUNK_SIZE type ids (u8) and as many variants (u8)
+
+    A type id is the index of the type in the palette plus one, the id 0 is used for empty cells. The file is memory-mapped and only the tables are read when it is opened, a chunk is read from the mapping when it is requested, so only the chunks that are used are ever paged in.
+    """
+
+    def __init__(self, path):
+        """
+        Open a binary map.
+
+        Parameters:
+            path (str): The path of the map file.
+        """
+
+        with open(path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            version,
+            self.tile_size,
+            chunk_size,
+            palette_size,
+            chunk_count,
+            offgrid_count,
+        ) = HEADER.unpack_from(self.mmap, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(path + " is not a binary map")
+        if version != VERSION or chunk_size != CHUNK_SIZE:
+            self.close()
+            raise ValueError(path + " has an unsupported map version")
+
+        offset = HEADER.size
+        self.palette = [None]
+        for _ in range(palette_size):
+            length = self.mmap[offset]
+            self.palette.append(self.mmap[offset + 1 : offset + 1 + length].decode())
+            offset += 1 + length
+
+        self.chunks = {}
+        for cx, cy, layers in CHUNK_RECORD.iter_unpack(
+            self.mmap[offset : offset + chunk_count * CHUNK_RECORD.size]
+        ):
+            self.chunks[(cx, cy)] = layers
+        offset += chunk_count * CHUNK_RECORD.size
+
+        self.offgrid_offset = offset
+        self.offgrid_count = offgrid_count
+
+    def chunk(self, key):
+        """
+        Get the layers of a chunk.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            tuple[bytes, bytes]: The type ids and the variants of the cells of the chunk, or None if the chunk is empty.
+        """
+
+        offset = self.chunks.get(key)
+        if offset is None:
+            return None
+        return (
+            self.mmap[offset : offset + CHUNK_CELLS],
+            self.mmap[offset + CHUNK_CELLS : offset + CHUNK_CELLS * 2],
+        )
+
+    def type_table(self, type_ids):
+        """
+        Get a translation table from the type ids of the map to other type ids, to be used with bytes.translate on the type layer of a chunk.
+
+        Parameters:
+            type_ids (dict[str, int]): The type ids to translate to, by type name.
+
+        Returns:
+            bytes: The translation table. Types missing from type_ids are translated to 0.
+        """
+
+        table = bytearray(256)
+        for type_id, name in enumerate(self.palette):
+            if name is not None:
+                table[type_id] = type_ids.get(name, 0)
+        return bytes(table)
+
+    def offgrid_tiles(self):
+        """
+        Iterate over the offgrid tile records.
+
+        Yields:
+            tuple[int, int, float, float]: The type id, variant and position of the offgrid tiles.
+        """
+
+        start = self.offgrid_offset
+        end = start + self.offgrid_count * OFFGRID_RECORD.size
+        yield from OFFGRID_RECORD.iter_unpack(self.mmap[start:end])
+
+    def to_json(self):
+        """
+        Convert the map to the JSON map format.
+
+        Returns:
+            dict: The map, with the same structure as the JSON map files.
+        """
+
+        tilemap = {}
+        for key in self.chunks:
+            types, variants = self.chunk(key)
+            for index, type_id in enumerate(types):
+                if type_id:
+                    pos = [
+                        (key[0] << CHUNK_SHIFT) + (index & CHUNK_MASK),
+                        (key[1] << CHUNK_SHIFT) + (index >> CHUNK_SHIFT),
+                    ]
+                    tilemap[str(pos[0]) + ";" + str(pos[1])] = {
+                        "type": self.palette[type_id],
+                        "pos": pos,
+                        "variant": variants[index],
+                        "size": self.tile_size,
+                        "offgrid": False,
+                    }
+
+        offgrid_tiles = [
+            {
+                "type": self.palette[type_id],
+                "pos": [x, y],
+                "variant": variant,
+                "size": self.tile_size,
+                "offgrid": True,
+            }
+            for type_id, variant, x, y in self.offgrid_tiles()
+        ]
+
+        return {
+            "tilemap": tilemap,
+            "offgrid_tiles": offgrid_tiles,
+            "tile_size": self.tile_size,
+        }
+
+    def close(self):
+        """
+        Close the map file.
+        """
+
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def map_file(map_path, map_id):
+    """
+    Get the path of a map file. The binary map is used if it exists and is not older than the JSON map.
+
+    Parameters:
+        map_path (str): The directory of the maps, ending with a separator.
+        map_id (int): The id of the map.
+
+    Returns:
+        str: The path of the map file.
+    """
+
+    json_path = map_path + str(map_id) + ".json"
+    binary_path = map_path + str(map_id) + BINARY_MAP_EXTENSION
+
+    if os.path.exists(binary_path) and (
+        not os.path.exists(json_path)
+        or os.path.getmtime(binary_path) >= os.path.getmtime(json_path)
+    ):
+        return binary_path
+    return json_path
+
+
+def save_binary_map(path, data):
+    """
+    Save a map in the binary map format.
+
+    Parameters:
+        path (str): The path to save the map.
+        data (dict): The map, with the same structure as the JSON map files.
+    """
+
+    palette = []
+    type_ids = {}
+
+    def type_id(name):
+        if name not in type_ids:
+            palette.append(name)
+            type_ids[name] = len(palette)
+        return type_ids[name]
+
+    chunks = {}
+    for tile in data["tilemap"].values():
+        x, y = int(tile["pos"][0]), int(tile["pos"][1])
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        if key not in chunks:
+            chunks[key] = bytearray(CHUNK_CELLS * 2)
+        index = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+        chunks[key][index] = type_id(tile["type"])
+        chunks[key][CHUNK_CELLS + index] = tile["variant"]
+
+    offgrid_tiles = [
+        OFFGRID_RECORD.pack(
+            type_id(tile["type"]), tile["variant"], tile["pos"][0], tile["pos"][1]
+        )
+        for tile in data["offgrid_tiles"]
+    ]
+
+    encoded_palette = b"".join(
+        bytes([len(name.encode())]) + name.encode() for name in palette
+    )
+    keys = sorted(chunks, key=lambda key: (key[1], key[0]))
+    layers_offset = (
+        HEADER.size
+        + len(encoded_palette)
+        + len(keys) * CHUNK_RECORD.size
+        + len(offgrid_tiles) * OFFGRID_RECORD.size
+    )
+
+    with open(path, "wb") as file:
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                data["tile_size"],
+                CHUNK_SIZE,
+                len(palette),
+                len(keys),
+                len(offgrid_tiles),
+            )
+        )
+        file.write(encoded_palette)
+        for i, key in enumerate(keys):
+            file.write(
+                CHUNK_RECORD.pack(key[0], key[1], layers_offset + i * CHUNK_CELLS * 2)
+            )
+        file.write(b"".join(offgrid_tiles))
+        for key in keys:
+            file.write(chunks[key])
@@ -0,0 +1,97 @@
+import threading
+from .tilemap import Tilemap
+
+
+class MapPreloader:
+    """
+    Loads a map into a new tilemap in a worker thread, so the next level can be parsed and built while the current one is still playing. Loading a tilemap only reads the map file and creates tile objects from the already loaded assets, it does not touch the display, so it is safe to run outside of the main thread.
+    """
+
+    def __init__(self, config):
+        """
+        Create a new, idle MapPreloader object.
+
+        Parameters:
+            config (Config): The config object of the game.
+        """
+
+        self.config = config
+        self.path = None
+        self.tilemap = None
+        self.error = None
+        self.thread = None
+
+    def start(self, path, streaming=False):
+        """
+        Start loading a map in the background. Nothing is done if the map is already being loaded.
+
+        Parameters:
+            path (str): The path of the map file.
+            streaming (bool): If the map should be streamed, see Tilemap.load. Default is False.
+        """
+
+        if path == self.path:
+            return
+
+        self.cancel()
+        self.path = path
+        self.tilemap = Tilemap(self.config)
+        self.error = None
+        self.thread = threading.Thread(
+            target=self.run, args=(self.tilemap, path, streaming), daemon=True
+        )
+        self.thread.start()
+
+    def run(self, tilemap, path, streaming):
+        """
+        Load the map. It runs in the worker thread.
+        """
+
+        try:
+            tilemap.load(path, streaming=streaming)
+        except Exception as error:
+            self.error = error
+
+    def is_done(self):
+        """
+        Check if the map is loaded.
+
+        Returns:
+            bool: If the worker thread has finished.
+        """
+
+        return self.thread is not None and not self.thread.is_alive()
+
+    def take(self, path):
+        """
+        Take the preloaded tilemap of a map. If the worker thread is still loading it, this waits for it to finish, which is never slower than loading the map again.
+
+        Parameters:
+            path (str): The path of the map file.
+
+        Returns:
+            Tilemap: The loaded tilemap, or None if this map was not preloaded or failed to load. The map should then be loaded synchronously. A preloaded map that is not the requested one is dropped.
+        """
+
+        if path != self.path:
+            self.cancel()
+            return None
+
+        self.thread.join()
+        tilemap = None if self.error is not None else self.tilemap
+        self.path = None
+        self.tilemap = None
+        self.thread = None
+        return tilemap
+
+    def cancel(self):
+        """
+        Drop the map being preloaded, if any. The worker thread cannot be interrupted, so this waits for it to finish and closes its tilemap.
+        """
+
+        if self.thread is not None:
+            self.thread.join()
+            self.tilemap.close()
+        self.path = None
+        self.tilemap = None
+        self.thread = None
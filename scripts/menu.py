@@ -4,6 +4,8 @@ import pygame
 class Menu:
     """
     A menu object that will be rendered on the screen. A menu can have multiple items and a selected item. The selected item will be highlighted.
+
+    A menu is made once and kept across frames. Both states of every item, normal and highlighted, are rendered when the menu is created, and the items are only laid out again when the selection changes, so drawing the menu is a few blits.
     """
 
     def __init__(self, items, font, selected):
@@ -13,52 +15,109 @@ class Menu:
         Parameters:
             items (list[str]): The items of the menu.
             font (pygame.font.Font): The font of the menu.
-            selected (list[int]): The selected item of the menu.
+            selected (list[int]): The selected item of the menu. The list is shared with the caller, which can change the selection.
         """
 
         self.items = []
+        self.highlighted_items = []
         self.selected = selected
         for item in items:
-            self.items.append(font.render(item, True, (255, 255, 255)))
+            item_surf = font.render(item, True, (255, 255, 255))
+            self.items.append(item_surf)
+            self.highlighted_items.append(self.highlight(item_surf))
 
-    def render(self, surf):
+        # The items to draw and their positions, for the selection and the
+        # size of the surface they were laid out for.
+        self.layout_key = None
+        self.blits = []
+
+    @staticmethod
+    def highlight(item_surf):
         """
-        Render the menu on the screen.
+        Render the highlighted state of an item: the item scaled up on a translucent background.
 
         Parameters:
-            surf (pygame.Surface): The surface to render the menu.
+            item_surf (pygame.Surface): The rendered item.
+
+        Returns:
+            pygame.Surface: The highlighted item.
+        """
+
+        text_surf = pygame.transform.scale_by(item_surf, 1.4)
+        highlighted = pygame.Surface(
+            (text_surf.get_width() + 8, text_surf.get_height() + 8),
+            pygame.SRCALPHA,
+        )
+        highlighted.fill((0, 0, 0, 128))
+        highlighted.blit(
+            text_surf,
+            (
+                (highlighted.get_width() - text_surf.get_width()) / 2,
+                (highlighted.get_height() - text_surf.get_height()) / 2,
+            ),
+        )
+        return highlighted
+
+    def layout(self, size):
         """
+        Place the items of the menu, centered on a surface.
 
-        max_width = 0
+        Parameters:
+            size (tuple[int, int]): The size of the surface.
+
+        Returns:
+            list[tuple[pygame.Surface, tuple[float, float]]]: The items and their positions.
+        """
+
+        blits = []
         height = 0
         for i, item in enumerate(self.items):
-            item_surf = item.copy()
-            if i == self.selected[0]:
-                text_surf = pygame.transform.scale_by(item_surf, 1.4)
-                item_surf = pygame.Surface(
-                    (text_surf.get_width() + 8, text_surf.get_height() + 8),
-                    pygame.SRCALPHA,
-                )
-                item_surf.fill((0, 0, 0, 128))
-                item_surf.blit(
-                    text_surf,
+            item_surf = self.highlighted_items[i] if i == self.selected[0] else item
+
+            blits.append(
+                (
+                    item_surf,
                     (
-                        (item_surf.get_width() - text_surf.get_width()) / 2,
-                        (item_surf.get_height() - text_surf.get_height()) / 2,
+                        (size[0] - item_surf.get_width()) / 2,
+                        size[1] / 2 + height - (24 if len(self.items) > 3 else 0),
                     ),
                 )
-
-            max_width = max(max_width, item_surf.get_width())
-
-            surf.blit(
-                item_surf,
-                (
-                    (surf.get_width() - max_width + (max_width - item_surf.get_width()))
-                    / 2,
-                    surf.get_height() / 2 + height - (24 if len(self.items) > 3 else 0),
-                ),
             )
             height += item_surf.get_height() + 24
+        return blits
+
+    def render(self, surf):
+        """
+        Render the menu on the screen.
+
+        Parameters:
+            surf (pygame.Surface): The surface to render the menu.
+        """
+
+        key = (self.selected[0], surf.get_size())
+        if key != self.layout_key:
+            self.layout_key = key
+            self.blits = self.layout(surf.get_size())
+
+        surf.blits(self.blits, doreturn=False)
+
+    def bounds(self, size):
+        """
+        Get the area covered by the items of the menu, for the current selection.
+
+        Parameters:
+            size (tuple[int, int]): The size of the surface the menu is rendered on.
+
+        Returns:
+            pygame.Rect: The area, with a margin of a pixel for the items placed between two pixels.
+        """
+
+        blits = self.layout(size)
+        return (
+            pygame.Rect(blits[0][1], blits[0][0].get_size())
+            .unionall([pygame.Rect(pos, item.get_size()) for item, pos in blits[1:]])
+            .inflate(2, 2)
+        )
 
     def update(self, events):
         """
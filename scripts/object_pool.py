@@ -0,0 +1,54 @@
+class ObjectPool:
+    """
+    A free list of reusable objects of one class. An object is taken from the pool with acquire and given back with release when it is not used anymore; a released object is reset in place by the next acquire instead of a new object being created, so a steady stream of short-lived objects allocates nothing once the pool is warm.
+
+    The class of the objects should have a reset method that takes the same arguments as its constructor.
+    """
+
+    def __init__(self, cls):
+        """
+        Create a new, empty ObjectPool object.
+
+        Parameters:
+            cls (type): The class of the objects.
+        """
+
+        self.cls = cls
+        self.free = []
+        # The number of objects created and reused, for the statistics.
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, *args, **kwargs):
+        """
+        Get an object, a released one reset with the arguments if there is any, otherwise a new one.
+
+        Parameters:
+            *args: The arguments of the constructor of the class.
+            **kwargs: The keyword arguments of the constructor of the class.
+
+        Returns:
+            object: The object.
+        """
+
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+            return obj
+
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj):
+        """
+        Give an object back to the pool. It should not be used anymore by the caller.
+
+        Parameters:
+            obj (object): The object, acquired from this pool.
+        """
+
+        self.free.append(obj)
@@ -6,6 +6,8 @@ class Particle:
     A particle object. It is used to create animations in the game.
     '''
 
+    __slots__ = ("type", "pos", "velocity", "animation")
+
     def __init__(
         self,
         animation,
@@ -31,6 +33,36 @@ class Particle:
         self.animation = animation.copy()
         self.animation.frame = frame
 
+    def reset(
+        self,
+        animation,
+        type,
+        pos,
+        velocity,
+        frame=0,
+    ):
+        '''
+        Reset the particle in place, as if it was created again with these arguments. Its animation is reused if it plays the same images, so a particle from an ObjectPool allocates nothing.
+
+        Parameters:
+            animation (Animation): The animation of the particle.
+            type (str): The type of the particle.
+            pos (tuple[int, int]): The position of the particle.
+            velocity (tuple[float, float]): The velocity of the particle.
+            frame (int): The start frame of the animation. Default is 0.
+        '''
+
+        self.type = type
+        self.pos[0], self.pos[1] = pos
+        self.velocity[0], self.velocity[1] = velocity
+        if (
+            self.animation.images is not animation.images
+            or self.animation.duration != animation.duration
+            or self.animation.loop != animation.loop
+        ):
+            self.animation = animation.copy()
+        self.animation.reset(frame)
+
     def update(self):
         '''
         Update the particle position and animation.
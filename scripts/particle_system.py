@@ -0,0 +1,196 @@
+import numpy as np
+
+# The angular speed of the sway of the swaying particles, per frame of their
+# animation.
+SWAY_SPEED = 0.035
+
+
+class ParticleSystem:
+    """
+    A batch of particles, stored as a structure of arrays: the position, the velocity, the animation frame and the type of every particle are columns of NumPy arrays. All the particles are updated in one vectorized step, the finished ones are removed in bulk, and they are drawn with one blit call per frame.
+
+    The particles of a type play the animation of that type once, without looping, and are removed after its last frame, like a Particle. A type can also sway from side to side, like falling leaves.
+    """
+
+    def __init__(self, animations, sway=None, capacity=64):
+        """
+        Create a new ParticleSystem object.
+
+        Parameters:
+            animations (dict[str, Animation]): The animation of each type of particle. Only their images and duration are used.
+            sway (dict[str, float]): The amplitude of the sway of the types that sway, in pixels per frame. Default is None, no type sways.
+            capacity (int): The number of particles the arrays are allocated for. They grow as needed. Default is 64.
+        """
+
+        self.types = {name: i for i, name in enumerate(animations)}
+
+        # The images of all the types in one list, so the image of a particle is
+        # first_image[type] + frame // duration[type].
+        self.images = []
+        first_image = []
+        for animation in animations.values():
+            first_image.append(len(self.images))
+            self.images.extend(animation.images)
+        self.first_image = np.array(first_image, dtype=np.int32)
+        self.duration = np.array(
+            [animation.duration for animation in animations.values()], dtype=np.int32
+        )
+        self.last_frame = np.array(
+            [
+                animation.duration * len(animation.images) - 1
+                for animation in animations.values()
+            ],
+            dtype=np.int32,
+        )
+        self.sway = np.zeros(len(animations))
+        for name, amplitude in (sway or {}).items():
+            self.sway[self.types[name]] = amplitude
+        self.swaying = bool(self.sway.any())
+
+        self.size = np.array(
+            [image.get_size() for image in self.images], dtype=np.float64
+        ).reshape(-1, 2)
+        # Half the size of each image, to center the particles on their position.
+        self.half_size = self.size // 2
+
+        # The particles emitted since the last update, added to the arrays in
+        # bulk: writing the arrays one particle at a time is slow.
+        self.emitted = []
+
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.type = np.zeros(capacity, dtype=np.int32)
+        self.done = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.count + len(self.emitted)
+
+    def grow(self, count):
+        """
+        Double the capacity of the arrays until it holds a number of particles.
+
+        Parameters:
+            count (int): The number of particles.
+        """
+
+        capacity = len(self.frame)
+        while capacity < count:
+            capacity *= 2
+        for name in ("pos", "velocity", "frame", "type", "done"):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[: self.count] = array[: self.count]
+            setattr(self, name, grown)
+
+    def emit(self, type, pos, velocity, frame=0):
+        """
+        Add a particle.
+
+        Parameters:
+            type (str): The type of the particle.
+            pos (tuple[float, float]): The position of the center of the particle.
+            velocity (tuple[float, float]): The velocity of the particle.
+            frame (int): The start frame of the animation. Default is 0.
+        """
+
+        self.emitted.append(
+            (pos[0], pos[1], velocity[0], velocity[1], frame, self.types[type])
+        )
+
+    def add_emitted(self):
+        """
+        Add the emitted particles to the arrays.
+        """
+
+        start = self.count
+        end = start + len(self.emitted)
+        if end > len(self.frame):
+            self.grow(end)
+
+        emitted = np.array(self.emitted)
+        self.emitted = []
+        self.pos[start:end] = emitted[:, 0:2]
+        self.velocity[start:end] = emitted[:, 2:4]
+        self.frame[start:end] = emitted[:, 4]
+        self.type[start:end] = emitted[:, 5]
+        self.done[start:end] = False
+        self.count = end
+
+    def update(self):
+        """
+        Move the particles, advance their animation and remove the particles whose animation was done.
+        """
+
+        if self.emitted:
+            self.add_emitted()
+
+        n = self.count
+        if not n:
+            return
+
+        kill = self.done[:n].copy()
+        type = self.type[:n]
+
+        pos = self.pos[:n]
+        pos += self.velocity[:n]
+
+        frame = self.frame[:n]
+        last_frame = self.last_frame[type]
+        np.minimum(frame + 1, last_frame, out=frame)
+        self.done[:n] |= frame == last_frame
+
+        if self.swaying:
+            pos[:, 0] += np.sin(frame * SWAY_SPEED) * self.sway[type]
+
+        if kill.any():
+            alive = np.flatnonzero(~kill)
+            for name in ("pos", "velocity", "frame", "type", "done"):
+                array = getattr(self, name)
+                array[: len(alive)] = array[alive]
+            self.count = len(alive)
+
+    def render(self, surf, offset=(0, 0)):
+        """
+        Render the particles on the screen, in the order they were added. The particles out of the screen are skipped.
+
+        Parameters:
+            surf (pygame.Surface): The surface to render the particles.
+            offset (tuple[int, int]): The offset of the screen, used to render the particles in the correct position. Default is (0, 0).
+        """
+
+        if self.emitted:
+            self.add_emitted()
+
+        n = self.count
+        if not n:
+            return
+
+        type = self.type[:n]
+        image = self.first_image[type] + self.frame[:n] // self.duration[type]
+        topleft = self.pos[:n] - offset - self.half_size[image]
+
+        bottomright = topleft + self.size[image]
+        visible = (bottomright > 0).all(axis=1) & (topleft < surf.get_size()).all(
+            axis=1
+        )
+        if not visible.all():
+            image = image[visible]
+            topleft = topleft[visible]
+
+        images = self.images
+        surf.fblits(
+            [
+                (images[i], position)
+                for i, position in zip(image.tolist(), topleft.tolist())
+            ]
+        )
+
+    def clear(self):
+        """
+        Remove all the particles.
+        """
+
+        self.emitted = []
+        self.count = 0
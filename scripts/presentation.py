@@ -0,0 +1,81 @@
+import pygame
+
+# The display modes of the game:
+# - window: a window of the size of the screen, the default.
+# - integer: the screen is scaled up by the graphics card, by the largest
+#   integer factor that fits the desktop, with sharp pixels.
+# - scaled: the screen is scaled up by the graphics card to fill the desktop,
+#   keeping its aspect ratio.
+DISPLAY_MODES = ("window", "integer", "scaled")
+
+
+def open_display(size, mode="window", vsync=False):
+    """
+    Open the window of the game. In the integer and scaled modes, the game draws on a screen of the given size whatever the size of the window, and pygame.SCALED scales it up when it is sent to the display, without drawing it again.
+
+    Parameters:
+        size (tuple[int, int]): The size of the screen.
+        mode (str): The display mode, one of DISPLAY_MODES. Default is window.
+        vsync (bool): If the frames should be synchronized with the refresh of the display, only in the integer and scaled modes. If the display does not support it, the window is opened without. Default is False.
+
+    Returns:
+        pygame.Surface: The screen.
+    """
+
+    if mode not in DISPLAY_MODES:
+        raise ValueError(f"unknown display mode {mode!r}")
+    if vsync and mode == "window":
+        raise ValueError("vsync needs the integer or scaled display mode")
+
+    if mode == "window":
+        return pygame.display.set_mode(size)
+
+    # pygame.SCALED keeps the scale factor an integer in a window.
+    flags = pygame.SCALED | (pygame.FULLSCREEN if mode == "scaled" else 0)
+    if vsync:
+        try:
+            return pygame.display.set_mode(size, flags, vsync=1)
+        except pygame.error:
+            pass
+    return pygame.display.set_mode(size, flags)
+
+
+class Presenter:
+    """
+    Scale the view of the level up to the screen. The view is scaled straight into the screen, so no surface is allocated per frame. When the screen shakes, the view is scaled into a surface made once instead, which is then drawn on the screen at the offset of the screenshake.
+    """
+
+    def __init__(self, view, screen):
+        """
+        Create a new Presenter object.
+
+        Parameters:
+            view (pygame.Surface): The view of the level.
+            screen (pygame.Surface): The screen.
+        """
+
+        self.view = view
+        self.screen = screen
+        self.size = screen.get_size()
+        self.buffer = pygame.Surface(self.size)
+        # pygame.transform.scale can only scale into a surface of the same
+        # pixel format.
+        self.direct = (view.get_bitsize(), view.get_masks()) == (
+            screen.get_bitsize(),
+            screen.get_masks(),
+        )
+
+    def present(self, offset=(0, 0)):
+        """
+        Draw the view on the screen, scaled to the size of the screen.
+
+        Parameters:
+            offset (tuple[float, float]): The offset of the view on the screen, for the screenshake. Default is no offset.
+        """
+
+        if self.direct and offset == (0, 0):
+            pygame.transform.scale(self.view, self.size, self.screen)
+            return
+
+        pygame.transform.scale(self.view, self.size, self.buffer)
+        self.screen.blit(self.buffer, offset)
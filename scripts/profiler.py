@@ -0,0 +1,335 @@
+import gc
+import csv
+import time
+from collections import deque
+from contextlib import nullcontext
+import pygame
+
+# Returned by disabled profilers, so a disabled section costs one method call.
+NULL_SECTION = nullcontext()
+
+
+class Section:
+    """
+    A running timer of a profiler section. It adds the time spent in its with block to the section.
+    """
+
+    __slots__ = ("times", "name", "start")
+
+    def __init__(self, times, name):
+        self.times = times
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.times[self.name] = (
+            self.times.get(self.name, 0) + time.perf_counter() - self.start
+        )
+
+
+class Profiler:
+    """
+    Named scoped timers. The code to measure is wrapped in a with block of a section, and the time spent in each section is summed over a frame:
+
+        with profiler.section("tilemap render"):
+            tilemap.render(surf, offset)
+
+    A section can be entered several times per frame. The frames are delimited by begin_frame and end_frame, which also time the whole frame as the "frame" section. The last frames are kept in a rolling history, and every frame can be written to a CSV file.
+
+    The garbage collections are timed too, as the "gc" section, which overlaps the sections they interrupted. The number of collections of each generation and of the objects they freed are counted in gc_collections and gc_collected.
+
+    When the profiler is disabled, the sections and the frames do nothing.
+    """
+
+    def __init__(self, enabled=False, history=240):
+        """
+        Create a new Profiler object.
+
+        Parameters:
+            enabled (bool): If the sections are timed. Default is False.
+            history (int): The number of frames kept in the history. Default is 240.
+        """
+
+        self.times = {}
+        self.history = deque(maxlen=history)
+        self.frame_start = None
+        self.frame_index = 0
+        self.csv_file = None
+        self.csv_writer = None
+        self.gc_start = None
+        self.gc_collections = [0] * len(gc.get_count())
+        self.gc_collected = 0
+        self._enabled = False
+        self.enabled = enabled
+
+    @property
+    def enabled(self):
+        """
+        If the sections are timed. The garbage collections are only watched while the profiler is enabled, and counted from when it was last enabled.
+        """
+
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        enabled = bool(enabled)
+        if enabled and not self._enabled:
+            self.gc_collections = [0] * len(self.gc_collections)
+            self.gc_collected = 0
+            gc.callbacks.append(self.on_gc)
+        elif not enabled and self._enabled:
+            gc.callbacks.remove(self.on_gc)
+        self._enabled = enabled
+
+    def on_gc(self, phase, info):
+        """
+        Time a garbage collection, called by the gc module before and after it.
+
+        Parameters:
+            phase (str): "start" or "stop".
+            info (dict): The generation of the collection, and the number of objects it freed.
+        """
+
+        if phase == "start":
+            self.gc_start = time.perf_counter()
+        elif self.gc_start is not None:
+            self.times["gc"] = (
+                self.times.get("gc", 0) + time.perf_counter() - self.gc_start
+            )
+            self.gc_start = None
+            self.gc_collections[info["generation"]] += 1
+            self.gc_collected += info["collected"]
+
+    def section(self, name):
+        """
+        Get the timer of a section.
+
+        Parameters:
+            name (str): The name of the section.
+
+        Returns:
+            ContextManager: The timer, to use in a with statement.
+        """
+
+        if not self.enabled:
+            return NULL_SECTION
+        return Section(self.times, name)
+
+    def toggle(self):
+        """
+        Enable the profiler if it is disabled, disable it otherwise. The history is cleared.
+        """
+
+        self.enabled = not self.enabled
+        self.times = {}
+        self.history.clear()
+        self.frame_start = None
+
+    def begin_frame(self):
+        """
+        Start timing a frame.
+        """
+
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        End the current frame. Its times are added to the history and written to the CSV file, if any.
+
+        Returns:
+            dict[str, float]: The time spent in each section during the frame, in seconds. The time of the whole frame is the "frame" section, if the frame was started with begin_frame.
+        """
+
+        times = self.times
+        self.times = {}
+
+        if self.enabled:
+            if self.frame_start is not None:
+                times["frame"] = time.perf_counter() - self.frame_start
+                self.frame_start = None
+            self.history.append(times)
+
+            if self.csv_writer is not None:
+                for name, elapsed in times.items():
+                    self.csv_writer.writerow(
+                        (self.frame_index, name, f"{elapsed * 1000:.4f}")
+                    )
+            self.frame_index += 1
+
+        return times
+
+    def record(self, path):
+        """
+        Write the times of every profiled frame to a CSV file, one row per frame and section: the index of the frame, the name of the section and its time in milliseconds.
+
+        Parameters:
+            path (str): The path of the CSV file. It is overwritten.
+        """
+
+        self.close()
+        self.csv_file = open(path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(("frame", "section", "ms"))
+        self.frame_index = 0
+
+    def close(self):
+        """
+        Close the CSV file, if any.
+        """
+
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+
+class ProfilerGraph:
+    """
+    A rolling graph of the profiler history. Every frame is a column of stacked bars, one per section, with a line at the frame budget. Only the new column is drawn each frame, the graph is scrolled to make room for it.
+    """
+
+    COLORS = (
+        (230, 25, 75),
+        (60, 180, 75),
+        (255, 225, 25),
+        (0, 130, 200),
+        (245, 130, 48),
+        (145, 30, 180),
+        (70, 240, 240),
+        (240, 50, 230),
+        (210, 245, 60),
+        (250, 190, 212),
+        (0, 128, 128),
+        (170, 110, 40),
+    )
+
+    def __init__(self, profiler, font, size=(240, 80), budget=1 / 60):
+        """
+        Create a new ProfilerGraph object.
+
+        Parameters:
+            profiler (Profiler): The profiler to show.
+            font (pygame.font.Font): The font of the legend.
+            size (tuple[int, int]): The size of the graph, in pixels. The width is the number of frames shown. Default is (240, 80).
+            budget (float): The time budget of a frame, in seconds. It is drawn at half the height of the graph. Default is 1 / 60.
+        """
+
+        self.profiler = profiler
+        self.font = font
+        self.budget = budget
+        self.scale = size[1] / 2 / budget
+        self.graph = pygame.Surface(size, pygame.SRCALPHA)
+        self.graph.fill((0, 0, 0, 160))
+        self.colors = {}
+        self.legend = None
+        self.legend_age = 0
+
+    def color(self, name):
+        """
+        Get the color of a section. The colors are given in the order the sections are first seen.
+        """
+
+        if name not in self.colors:
+            self.colors[name] = self.COLORS[len(self.colors) % len(self.COLORS)]
+            self.legend = None
+        return self.colors[name]
+
+    def add(self, times):
+        """
+        Add a frame to the graph.
+
+        Parameters:
+            times (dict[str, float]): The times of the frame, as returned by Profiler.end_frame.
+        """
+
+        width, height = self.graph.get_size()
+        self.graph.scroll(-1, 0)
+        self.graph.fill((0, 0, 0, 160), (width - 1, 0, 1, height))
+
+        bottom = height
+        for name, elapsed in times.items():
+            # The garbage collections are already in the sections they
+            # interrupted.
+            if name in ("frame", "gc"):
+                continue
+            bar = elapsed * self.scale
+            if bar >= 0.5:
+                top = max(0, bottom - bar)
+                self.graph.fill(
+                    self.color(name), (width - 1, round(top), 1, round(bottom - top))
+                )
+                bottom = top
+
+        # Whatever the sections did not cover.
+        if "frame" in times:
+            top = max(0, height - times["frame"] * self.scale)
+            if top < bottom:
+                self.graph.fill(
+                    (128, 128, 128), (width - 1, round(top), 1, round(bottom - top))
+                )
+
+        self.graph.set_at((width - 1, height // 2), (255, 255, 255))
+
+    def render_legend(self):
+        """
+        Render the legend: the average time of each section over the history, in milliseconds, and the garbage collections of each generation since the profiler was enabled.
+
+        Returns:
+            pygame.Surface: The legend.
+        """
+
+        history = self.profiler.history
+        totals = {}
+        for times in history:
+            for name, elapsed in times.items():
+                totals[name] = totals.get(name, 0) + elapsed
+
+        lines = [
+            (name, totals[name] / max(1, len(history)) * 1000)
+            for name in sorted(totals, key=lambda name: -totals[name])
+        ]
+        texts = [
+            (
+                f"{name} {ms:.2f} ms",
+                (255, 255, 255) if name == "frame" else self.color(name),
+            )
+            for name, ms in lines
+        ]
+        texts.append(
+            (
+                "gc "
+                + "/".join(str(count) for count in self.profiler.gc_collections)
+                + f" collections, {self.profiler.gc_collected} freed",
+                (255, 255, 255),
+            )
+        )
+
+        line_height = self.font.get_linesize()
+        legend = pygame.Surface(
+            (self.graph.get_width(), line_height * len(texts) + 4), pygame.SRCALPHA
+        )
+        legend.fill((0, 0, 0, 160))
+        for i, (text, color) in enumerate(texts):
+            legend.blit(self.font.render(text, True, color), (2, 2 + i * line_height))
+        return legend
+
+    def render(self, surf, pos):
+        """
+        Draw the graph and its legend under it.
+
+        Parameters:
+            surf (pygame.Surface): The surface to draw on.
+            pos (tuple[int, int]): The position of the top left corner of the graph.
+        """
+
+        # The legend is only rendered again twice per second.
+        self.legend_age -= 1
+        if self.legend is None or self.legend_age <= 0:
+            self.legend = self.render_legend()
+            self.legend_age = 30
+
+        surf.blit(self.graph, pos)
+        surf.blit(self.legend, (pos[0], pos[1] + self.graph.get_height()))
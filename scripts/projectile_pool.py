@@ -0,0 +1,260 @@
+import math
+import random
+import numpy as np
+from .spark_system import spark_lifetime
+
+# The most sparks a projectile has: 4 when it is shot and 4 when it is removed.
+MAX_SPARKS = 8
+
+
+class ProjectilePool:
+    """
+    The projectiles of one side of a level, the player or the enemies. A projectile flies horizontally until its animation ends or it is removed by a hit. A removed projectile is not drawn anymore but stays in the pool until its sparks stop, and is still tested for hits meanwhile.
+
+    The projectiles are stored in preallocated NumPy arrays, one row per projectile: the position, the direction, the animation frame and the sparks. They are all moved in one vectorized step, and a finished projectile is removed by moving the last row into its place, so the order of the rows changes as projectiles are removed.
+    """
+
+    def __init__(self, animation, size, sparks, capacity=32):
+        """
+        Create a new ProjectilePool object.
+
+        Parameters:
+            animation (Animation): The animation of the projectiles. It should not loop.
+            size (tuple[int, int]): The size of the hitbox of the projectiles.
+            sparks (SparkSystem): The spark system of the level, where the sparks of the projectiles are emitted.
+            capacity (int): The number of projectiles the arrays are allocated for. They grow as needed. Default is 32.
+        """
+
+        self.images = animation.images
+        # The images of the projectiles flying to the left.
+        self.flipped_images = animation.flipped_images
+        self.duration = animation.duration
+        self.last_frame = animation.duration * len(animation.images) - 1
+        self.size = size
+        self.spark_system = sparks
+
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.previous_x = np.zeros(capacity)
+        self.direction = np.zeros(capacity, dtype=np.int32)
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.removed = np.zeros(capacity, dtype=bool)
+        # The slots of the sparks of each projectile in the spark system, and
+        # the number of updates until they are all stopped.
+        self.sparks = np.zeros((capacity, MAX_SPARKS), dtype=np.intp)
+        self.spark_count = np.zeros(capacity, dtype=np.int32)
+        self.spark_ticks = np.zeros(capacity, dtype=np.int32)
+
+    COLUMNS = (
+        "pos",
+        "previous_x",
+        "direction",
+        "frame",
+        "removed",
+        "sparks",
+        "spark_count",
+        "spark_ticks",
+    )
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        """
+        Double the capacity of the arrays.
+        """
+
+        capacity = len(self.direction) * 2
+        for name in self.COLUMNS:
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[: self.count] = array[: self.count]
+            setattr(self, name, grown)
+
+    def spawn(self, pos, direction):
+        """
+        Shoot a new projectile.
+
+        Parameters:
+            pos (tuple[float, float]): The position of the center of the projectile.
+            direction (float): The speed of the projectile, in pixels per update. It is positive to the right and negative to the left.
+        """
+
+        if self.count == len(self.direction):
+            self.grow()
+
+        i = self.count
+        self.count += 1
+        self.pos[i] = pos
+        self.previous_x[i] = pos[0]
+        self.direction[i] = direction
+        self.frame[i] = 0
+        self.removed[i] = False
+        self.spark_count[i] = 0
+        self.spark_ticks[i] = 0
+        self.emit_sparks(i, math.pi if direction < 0 else 0)
+
+    def emit_sparks(self, i, angle):
+        """
+        Emit 4 sparks at the position of a projectile.
+
+        Parameters:
+            i (int): The index of the projectile.
+            angle (float): The mean angle of the sparks, in radians.
+        """
+
+        pos = self.pos[i].tolist()
+        count = self.spark_count[i]
+        for j in range(count, count + 4):
+            spark_angle = random.random() - 0.5 + angle
+            speed = 1.5 + random.random()
+            self.sparks[i, j] = self.spark_system.emit(pos, spark_angle, speed)
+            self.spark_ticks[i] = max(self.spark_ticks[i], spark_lifetime(speed))
+        self.spark_count[i] = count + 4
+
+    def remove(self, i, sfx=None):
+        """
+        Remove a projectile from the game, because it hit something. It stays in the pool until its sparks stop.
+
+        Parameters:
+            i (int): The index of the projectile.
+            sfx (pygame.mixer.Sound): The sound effect to play when the projectile is removed. Default is None.
+        """
+
+        if not self.removed[i]:
+            if sfx:
+                sfx.play()
+
+            self.emit_sparks(i, math.pi if self.direction[i] > 0 else 0)
+            self.removed[i] = True
+
+    def rects(self):
+        """
+        Get the hitboxes of the projectiles, as pygame.Rect would round them.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The left and top sides of the hitboxes.
+        """
+
+        pos = self.pos[: self.count]
+        left = np.trunc(pos[:, 0] - self.size[0] / 2).astype(np.int64)
+        top = np.trunc(pos[:, 1] - self.size[1] / 2).astype(np.int64)
+        return left, top
+
+    def centers(self):
+        """
+        Get the centers of the hitboxes of the projectiles, as pygame.Rect would round them.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The x and y coordinates of the centers.
+        """
+
+        left, top = self.rects()
+        return left + self.size[0] // 2, top + self.size[1] // 2
+
+    def colliding(self, rect):
+        """
+        Test all the projectiles against a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect.
+
+        Returns:
+            numpy.ndarray: If each projectile collides with the rect.
+        """
+
+        left, top = self.rects()
+        return (
+            (left < rect.right)
+            & (left + self.size[0] > rect.left)
+            & (top < rect.bottom)
+            & (top + self.size[1] > rect.top)
+        )
+
+    def update(self):
+        """
+        Move the projectiles and advance their animation. The projectiles whose animation is done, and the removed projectiles whose sparks stopped, are taken out of the pool and their sparks are freed.
+        """
+
+        n = self.count
+        if not n:
+            return
+
+        removed = self.removed[:n]
+        spark_ticks = self.spark_ticks[:n]
+        finished = removed & (spark_ticks == 0)
+
+        flying = ~removed
+        frame = self.frame[:n]
+        frame[flying] = np.minimum(frame[flying] + 1, self.last_frame)
+        x = self.pos[:n, 0]
+        self.previous_x[:n][flying] = x[flying]
+        x[flying] += self.direction[:n][flying]
+
+        np.maximum(spark_ticks - 1, 0, out=spark_ticks)
+
+        finished |= frame == self.last_frame
+
+        # From the last row, so the row moved into a hole is never finished.
+        for i in np.flatnonzero(finished)[::-1].tolist():
+            self.spark_system.free(self.sparks[i, : self.spark_count[i]].tolist())
+            last = self.count - 1
+            if i != last:
+                for name in self.COLUMNS:
+                    array = getattr(self, name)
+                    array[i] = array[last]
+            self.count = last
+
+    def render(self, surf, offset, alpha=1):
+        """
+        Render the projectiles on the screen. The removed projectiles are not drawn, their sparks are drawn by the spark system.
+
+        Parameters:
+            surf (pygame.Surface): The surface to render the projectiles.
+            offset (tuple[float, float]): The offset of the screen, used to render the projectiles in the correct position.
+            alpha (float): The fraction of a tick elapsed since the last update, used to interpolate the position of the projectiles between their last two updates. Default is 1.
+        """
+
+        n = self.count
+        if not n:
+            return
+
+        flying = np.flatnonzero(~self.removed[:n])
+        previous_x = self.previous_x[flying]
+        x = previous_x + (self.pos[flying, 0] - previous_x) * alpha
+        y = self.pos[flying, 1]
+        image = self.frame[flying] // self.duration
+        left = self.direction[flying] < 0
+
+        blits = []
+        for x, y, image, left in zip(
+            x.tolist(), y.tolist(), image.tolist(), left.tolist()
+        ):
+            image = self.flipped_images[image] if left else self.images[image]
+            blits.append(
+                (
+                    image,
+                    (
+                        x - image.get_width() / 2 - offset[0],
+                        y - image.get_height() / 2 - offset[1],
+                    ),
+                )
+            )
+        surf.fblits(blits)
+
+    def positions(self):
+        """
+        Get the positions of the projectiles.
+
+        Returns:
+            list[list[float]]: The position of each projectile.
+        """
+
+        return self.pos[: self.count].tolist()
+
+    def clear(self):
+        """
+        Remove all the projectiles. Their sparks should be cleared from the spark system.
+        """
+
+        self.count = 0
@@ -0,0 +1,202 @@
+import struct
+import zlib
+import pygame
+from .simulation import HELD_KEYS
+
+REPLAY_MAGIC = b"JRPL"
+REPLAY_VERSION = 1
+
+# The header of a replay file: the magic bytes, the version and the number of
+# segments. The segments follow, compressed with zlib.
+HEADER = struct.Struct("<4sBI")
+# A segment: the map id, the seed, the digest of the level at its end and the
+# number of ticks. The ticks follow.
+SEGMENT = struct.Struct("<IIII")
+# A tick: the bitmask of the held keys and the number of key events. The key
+# events follow.
+TICK = struct.Struct("<BB")
+# A key event: 0 for a key down or 1 for a key up, and the key.
+EVENT = struct.Struct("<BI")
+
+EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP)
+
+
+class Segment:
+    """
+    The recording of one loaded map: the map, the seed of the level and the input of every tick of the simulation.
+    """
+
+    __slots__ = ("map_id", "seed", "digest", "ticks")
+
+    def __init__(self, map_id, seed, digest=0, ticks=None):
+        """
+        Create a new Segment object.
+
+        Parameters:
+            map_id (int): The id of the map.
+            seed (int): The seed of the level, see Simulation.load_map.
+            digest (int): The digest of the level after the last tick, see Simulation.digest. Default is 0, unknown.
+            ticks (list[tuple[int, tuple[tuple[int, int], ...]]]): The input of the ticks: the bitmask of the held keys and the key events, as (type, key) pairs. Default is no ticks.
+        """
+
+        self.map_id = map_id
+        self.seed = seed
+        self.digest = digest
+        self.ticks = ticks if ticks is not None else []
+
+    def input(self, tick):
+        """
+        Get the input of a tick, in the form taken by Simulation.update.
+
+        Parameters:
+            tick (int): The index of the tick in the segment.
+
+        Returns:
+            tuple[list[pygame.event.Event], tuple[int, ...]]: The key events and the held keys.
+        """
+
+        mask, events = self.ticks[tick]
+        return (
+            [pygame.event.Event(type, key=key) for type, key in events],
+            tuple(key for i, key in enumerate(HELD_KEYS) if mask & (1 << i)),
+        )
+
+
+class Replay:
+    """
+    A recorded play session, to play it again exactly. A session is a list of segments, one per loaded map. Since a level is deterministic, a segment only holds the seed of the level and the input of every tick: the key events and the held keys. The last digest of each segment is kept to check a replay.
+    """
+
+    def __init__(self):
+        """
+        Create a new, empty Replay object.
+        """
+
+        self.segments = []
+
+    def begin_segment(self, map_id, seed):
+        """
+        Start recording a new segment.
+
+        Parameters:
+            map_id (int): The id of the loaded map.
+            seed (int): The seed of the level.
+        """
+
+        self.segments.append(Segment(map_id, seed))
+
+    def record(self, events, held):
+        """
+        Record a tick in the current segment.
+
+        Parameters:
+            events (Iterable[pygame.event.Event]): The events of the tick. Only the key events are recorded.
+            held (Collection[int]): The keys of HELD_KEYS that are held down.
+        """
+
+        mask = 0
+        for i, key in enumerate(HELD_KEYS):
+            if key in held:
+                mask |= 1 << i
+        self.segments[-1].ticks.append(
+            (
+                mask,
+                tuple(
+                    (event.type, event.key)
+                    for event in events
+                    if event.type in EVENT_TYPES
+                ),
+            )
+        )
+
+    def end_segment(self, digest):
+        """
+        Set the digest of the level at the end of the current segment.
+
+        Parameters:
+            digest (int): The digest of the level after the last tick.
+        """
+
+        if self.segments and self.segments[-1].ticks:
+            self.segments[-1].digest = digest
+
+    def save(self, path):
+        """
+        Save the replay to a file.
+
+        Parameters:
+            path (str): The path of the file.
+        """
+
+        body = bytearray()
+        for segment in self.segments:
+            body += SEGMENT.pack(
+                segment.map_id, segment.seed, segment.digest, len(segment.ticks)
+            )
+            for mask, events in segment.ticks:
+                body += TICK.pack(mask, len(events))
+                for type, key in events:
+                    body += EVENT.pack(EVENT_TYPES.index(type), key)
+
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, len(self.segments)))
+            file.write(zlib.compress(bytes(body), 9))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a replay from a file.
+
+        Parameters:
+            path (str): The path of the file.
+
+        Returns:
+            Replay: The replay.
+        """
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} is not a replay file of version {REPLAY_VERSION}")
+
+        body = zlib.decompress(data[HEADER.size :])
+        offset = 0
+        replay = cls()
+        for _ in range(count):
+            map_id, seed, digest, tick_count = SEGMENT.unpack_from(body, offset)
+            offset += SEGMENT.size
+            ticks = []
+            for _ in range(tick_count):
+                mask, event_count = TICK.unpack_from(body, offset)
+                offset += TICK.size
+                events = []
+                for _ in range(event_count):
+                    type, key = EVENT.unpack_from(body, offset)
+                    offset += EVENT.size
+                    events.append((EVENT_TYPES[type], key))
+                ticks.append((mask, tuple(events)))
+            replay.segments.append(Segment(map_id, seed, digest, ticks))
+
+        return replay
+
+    def play(self, simulation, map_file):
+        """
+        Play the replay headlessly, as fast as possible.
+
+        Parameters:
+            simulation (Simulation): The simulation to play the replay in. It should be new, since the movement of the player carries over from level to level.
+            map_file (function): The function that gives the path of a map file from its id.
+
+        Returns:
+            list[bool]: If the digest of each segment matches the recording.
+        """
+
+        matches = []
+        for segment in self.segments:
+            simulation.load_map(map_file(segment.map_id), seed=segment.seed)
+            for tick in range(len(segment.ticks)):
+                simulation.update(*segment.input(tick))
+            matches.append(not segment.ticks or simulation.digest() == segment.digest)
+        return matches
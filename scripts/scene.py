@@ -0,0 +1,117 @@
+class Scene:
+    """
+    A screen of the game, such as a menu or the level being played. The scenes are kept in a SceneStack: enter is called when a scene is put on the stack and exit when it is taken off, so a scene builds the resources it draws with once, when it is entered, instead of every frame.
+
+    A scene is updated once per tick and drawn once per frame. When nothing changed since the last frame it was drawn in, a scene draws nothing, so the frame is not sent to the display at all.
+    """
+
+    # The value of Game.game_state while the scene is on top of the stack.
+    state = None
+    # If the scene is pushed on top of the current scene instead of replacing
+    # the whole stack, such as a pause screen over the level.
+    modal = False
+    # If the scene is drawn between the ticks, interpolated by the fraction of
+    # the tick elapsed. A scene that is not only changes on a tick, so the
+    # game sleeps until the next tick instead of drawing it again.
+    interpolated = False
+
+    def enter(self):
+        """
+        Called when the scene is put on the stack.
+        """
+
+    def exit(self):
+        """
+        Called when the scene is taken off the stack.
+        """
+
+    def update(self, events, exit):
+        """
+        Run one tick of the scene.
+
+        Parameters:
+            events (list[pygame.event.Event]): The events of the tick.
+            exit (function): The function to exit the game.
+        """
+
+    def render(self, surf, full=True):
+        """
+        Draw the scene on the screen.
+
+        Parameters:
+            surf (pygame.Surface): The screen.
+            full (bool): If the whole scene should be drawn, because the screen holds something else. Otherwise only what changed since the last frame is drawn again. Default is True.
+
+        Returns:
+            list[pygame.Rect]: The areas of the screen that were drawn, to update on the display, or None if the whole screen was drawn.
+        """
+
+        return None
+
+
+class SceneStack:
+    """
+    The stack of the scenes of the game. The scene on top is the one updated and drawn.
+    """
+
+    def __init__(self):
+        """
+        Create a new, empty SceneStack object.
+        """
+
+        self.scenes = []
+
+    def __len__(self):
+        return len(self.scenes)
+
+    def __contains__(self, scene):
+        return scene in self.scenes
+
+    @property
+    def top(self):
+        """
+        The scene on top of the stack, or None if the stack is empty.
+        """
+
+        return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene):
+        """
+        Put a scene on top of the stack.
+
+        Parameters:
+            scene (Scene): The scene.
+        """
+
+        self.scenes.append(scene)
+        scene.enter()
+
+    def pop(self):
+        """
+        Take the scene on top off the stack.
+
+        Returns:
+            Scene: The scene.
+        """
+
+        scene = self.scenes.pop()
+        scene.exit()
+        return scene
+
+    def switch(self, scene):
+        """
+        Show a scene. If it is already on the stack, the scenes above it are taken off. Otherwise a modal scene is pushed on top of the stack, and any other scene replaces the whole stack.
+
+        Parameters:
+            scene (Scene): The scene.
+        """
+
+        if scene in self.scenes:
+            while self.top is not scene:
+                self.pop()
+            return
+
+        if not scene.modal:
+            while self.scenes:
+                self.pop()
+        self.push(scene)
@@ -0,0 +1,288 @@
+import pygame
+from .scene import Scene
+
+
+class PlayScene(Scene):
+    """
+    The level being played, or the replay being played back. The level changes every frame, so it is always drawn whole.
+    """
+
+    state = 1
+    interpolated = True
+
+    def __init__(self, game):
+        """
+        Create a new PlayScene object.
+
+        Parameters:
+            game (Game): The game.
+        """
+
+        self.game = game
+
+    def update(self, events, exit):
+        if self.game.replay is not None:
+            self.game.replay_play(exit)
+        else:
+            self.game.game_play(events)
+
+    def render(self, surf, full=True):
+        self.game.render_play(self.game.timestep.alpha)
+        return None
+
+
+class MenuScene(Scene):
+    """
+    A screen with a menu over a still background. The background is composed once, when the scene is entered, and the screen is only drawn again when the selection of the menu changes: the background is restored under the menu and the menu is drawn again, in the area it covers.
+
+    When a selected item starts the screen transition, the scene of the item is shown at the middle of the transition.
+
+    A subclass gives the menu of the screen as its menu property, and draws everything but the menu in compose(size), which returns the background for a screen of that size.
+    """
+
+    # The music of the screen and its volume.
+    music = "end_music"
+    volume = 0.3
+    # The game states to show at the middle of the screen transition, for the
+    # selected items.
+    targets = {}
+
+    def __init__(self, game):
+        """
+        Create a new MenuScene object.
+
+        Parameters:
+            game (Game): The game.
+        """
+
+        self.game = game
+        self.background = None
+        # The menu, its selection and the size of the screen, and the area of
+        # the screen covered by the menu, when it was last drawn.
+        self.menu_key = None
+        self.menu_rect = None
+
+    def enter(self):
+        self.background = self.compose(self.game.screen.get_size())
+        self.menu_key = None
+        self.menu_rect = None
+
+    def exit(self):
+        self.background = None
+        self.menu_key = None
+        self.menu_rect = None
+
+    def select(self, selected, exit):
+        """
+        Run the action of the item chosen by the player.
+
+        Parameters:
+            selected (int): The index of the item.
+            exit (function): The function to exit the game.
+        """
+
+    def leave(self, selected):
+        """
+        Show the scene of the selected item, at the middle of the screen transition.
+
+        Parameters:
+            selected (int): The index of the item.
+        """
+
+        game = self.game
+        if selected in self.targets:
+            game.game_state = self.targets[selected]
+        game.menu_select[0] = 0
+        pygame.mixer.music.stop()
+
+    def update(self, events, exit):
+        game = self.game
+        if not pygame.mixer.music.get_busy():
+            game.play_music(getattr(game.config, self.music), self.volume)
+
+        menu = self.menu
+
+        if game.screen_transition.is_done():
+            self.leave(menu.selected[0])
+            return
+
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
+                    self.select(menu.selected[0], exit)
+
+        menu.update(events)
+
+    def render(self, surf, full=True):
+        menu = self.menu
+        size = surf.get_size()
+        key = (menu, menu.selected[0], size)
+        if not full and key == self.menu_key:
+            return []
+        self.menu_key = key
+        rect = menu.bounds(size)
+
+        if full or self.menu_rect is None:
+            surf.blit(self.background, (0, 0))
+            menu.render(surf)
+            self.menu_rect = rect
+            return None
+
+        dirty = rect.union(self.menu_rect)
+        surf.blit(self.background, dirty, dirty)
+        menu.render(surf)
+        self.menu_rect = rect
+        return [dirty]
+
+
+class StartScene(MenuScene):
+    """
+    The game start screen, with the title of the game.
+    """
+
+    state = 0
+    music = "theme_music"
+
+    @property
+    def menu(self):
+        game = self.game
+        return game.new_game_menu if game.is_new else game.start_menu
+
+    def compose(self, size):
+        config = self.game.config
+        display = pygame.Surface(config.background_image.get_size())
+        display.blit(config.background_image, (0, 0))
+        display.blit(
+            config.title_image,
+            (
+                display.get_width() / 2 - config.title_image.get_width() / 2,
+                16,
+            ),
+        )
+        return pygame.transform.scale(display, size)
+
+    def leave(self, selected):
+        self.game.game_state = 1
+        pygame.mixer.music.stop()
+
+    def select(self, selected, exit):
+        game = self.game
+        if game.is_new:
+            if selected == 0:
+                game.screen_transition.start()
+                with open(game.config.level_file, "w") as file:
+                    file.write("0")
+            elif selected == 1:
+                exit()
+        else:
+            if selected == 0:
+                game.screen_transition.start()
+            elif selected == 1:
+                game.level = 0
+                game.save_level()
+                game.load_map(game.level)
+                game.screen_transition.start()
+            elif selected == 2:
+                exit()
+
+
+class EndScene(MenuScene):
+    """
+    A screen shown over the level, with a title over the image of the dead player.
+    """
+
+    title = ""
+
+    def compose(self, size):
+        config = self.game.config
+        background = pygame.Surface(size)
+        background.blit(pygame.transform.scale(config.background_image, size), (0, 0))
+
+        title = config.font_32.render(self.title, True, (255, 255, 255))
+        background.blit(title, ((size[0] - title.get_width()) / 2, 64))
+
+        player_image = pygame.transform.scale_by(config.player_dead_image, 2)
+        background.blit(
+            player_image,
+            (
+                (size[0] - title.get_width()) / 2 + 16,
+                64 - player_image.get_height(),
+            ),
+        )
+        return background
+
+
+class GameOverScene(EndScene):
+    """
+    The game over screen, when the player lost all the lives.
+    """
+
+    state = 2
+    title = "MISSION FAILED"
+    targets = {0: 1, 1: 0}
+
+    @property
+    def menu(self):
+        return self.game.game_over_menu
+
+    def select(self, selected, exit):
+        game = self.game
+        if selected in (0, 1):
+            game.load_map(game.level)
+            game.screen_transition.start()
+        elif selected == 2:
+            exit()
+
+
+class PauseScene(EndScene):
+    """
+    The pause screen. It is shown over the level, which is kept on the scene stack and resumed where it was paused.
+    """
+
+    state = 3
+    modal = True
+    music = "theme_music"
+    volume = 0.1
+    title = "GAME PAUSE"
+    targets = {0: 1, 1: 0}
+
+    @property
+    def menu(self):
+        return self.game.pause_menu
+
+    def select(self, selected, exit):
+        game = self.game
+        if selected == 0:
+            game.screen_transition.start()
+        elif selected == 1:
+            game.load_map(game.level)
+            game.screen_transition.start()
+        elif selected == 2:
+            exit()
+
+
+class CompletedScene(EndScene):
+    """
+    The mission completed screen, after the last level.
+    """
+
+    state = 4
+    title = "MISSION COMPLETED"
+    targets = {0: 1, 1: 1, 2: 0}
+
+    @property
+    def menu(self):
+        return self.game.completed_menu
+
+    def select(self, selected, exit):
+        game = self.game
+        if selected in (0, 2):
+            game.load_map(game.level)
+            game.screen_transition.start()
+        elif selected == 1:
+            game.level = 0
+            game.save_level()
+            game.load_map(game.level)
+            game.screen_transition.start()
+        elif selected == 3:
+            exit()
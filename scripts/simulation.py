@@ -0,0 +1,533 @@
+import os
+import zlib
+import random
+import pygame
+from .tilemap import Tilemap
+from .entities import Player, Enemy
+from .tiles import Portal
+from .profiler import Profiler
+from .spark_system import SparkSystem
+from .projectile_pool import ProjectilePool
+from .spatial_hash import SpatialHash, UniformGrid
+from .activity import ActivityRegions, ACTIVE
+
+# The keys whose held state is read during a tick, to climb ladders.
+HELD_KEYS = (pygame.K_UP, pygame.K_DOWN)
+
+
+class Simulation:
+    """
+    The game logic of a level: the player, the enemies, the projectiles, the barrels, the portals, the traps, the checkpoint and the scores. It does not use the window, the fonts nor the music and draws nothing, so it can run headless and as fast as the machine allows. The game renders its state after each tick.
+
+    A level is deterministic: the random module is seeded when the map is loaded, and the only input of a tick is its key events and the held keys. The same seed and inputs always give the same game, which is what replays rely on.
+
+    The actors far from the camera are scheduled by ActivityRegions: the enemies tick at a reduced rate or go dormant, and the trees and the portals out of the active region are not updated. Since the camera follows the player, the schedule is part of the deterministic state too.
+    """
+
+    def __init__(self, config, view_size=(320, 180), sound=True, profiler=None):
+        """
+        Create a new Simulation object with an empty tilemap. A map should be loaded with load_map before it is updated.
+
+        Parameters:
+            config (Config): The config object of the game.
+            view_size (tuple[int, int]): The size of the view followed by the camera, in pixels. Default is (320, 180).
+            sound (bool): If the sound effects are played. Default is True.
+            profiler (Profiler): The profiler that times the steps of the ticks. Default is None, a disabled profiler.
+        """
+
+        self.config = config
+        self.view_size = view_size
+        self.sound = sound
+        self.profiler = profiler if profiler is not None else Profiler()
+
+        self.tilemap = Tilemap(config)
+        self.sparks = SparkSystem()
+        self.enemy_projectiles = ProjectilePool(
+            config.projectile_assets["enemy"], (4, 4), self.sparks
+        )
+        self.player_projectiles = ProjectilePool(
+            config.projectile_assets["player"], (4, 4), self.sparks
+        )
+        # The broadphases of the hits of the player projectiles: the portals are
+        # indexed when the map is loaded, the enemies every tick.
+        self.portal_grid = SpatialHash(config.tile_size * 2)
+        self.enemy_grid = UniformGrid(config.tile_size * 2)
+        # The actors far from the camera are updated less often or not at all,
+        # unless the activity regions are disabled in the config.
+        self.activity = (
+            ActivityRegions(
+                view_size,
+                config.activity_margin,
+                config.activity_far_margin,
+                config.coarse_interval,
+            )
+            if config.activity_regions
+            else None
+        )
+
+        self.movement = [False, False]
+        self.held = set()
+        self.shoot = False
+        self.screenshake = 0
+
+    def sfx(self, name):
+        """
+        Get a sound effect.
+
+        Parameters:
+            name (str): The name of the sound effect in config.sfx.
+
+        Returns:
+            pygame.mixer.Sound: The sound effect or None if the sound is off.
+        """
+
+        return self.config.sfx[name] if self.sound else None
+
+    def play(self, name):
+        """
+        Play a sound effect, if the sound is on.
+
+        Parameters:
+            name (str): The name of the sound effect in config.sfx.
+        """
+
+        if self.sound:
+            self.config.sfx[name].play()
+
+    def new_player(self, pos):
+        """
+        Create a new player.
+
+        Parameters:
+            pos (tuple[float, float]): The position of the player.
+
+        Returns:
+            Player: The player.
+        """
+
+        return Player(
+            self.config.player_assets,
+            pos,
+            (12, 18),
+            self.config.particles_assets["particle"],
+        )
+
+    def new_enemy(self, pos):
+        """
+        Create a new enemy.
+
+        Parameters:
+            pos (tuple[float, float]): The position of the enemy.
+
+        Returns:
+            Enemy: The enemy.
+        """
+
+        return Enemy(
+            self.config.enemy_assets,
+            pos,
+            (12, 18),
+        )
+
+    def load_map(self, path, tilemap=None, seed=None):
+        """
+        Load a map and reset the level.
+
+        Parameters:
+            path (str): The path of the map file.
+            tilemap (Tilemap): The tilemap of the map if it is already loaded, for example by a MapPreloader. Default is None, the map is then loaded from the file.
+            seed (int): The seed of the random module for the level. Default is None, a new random seed.
+        """
+
+        if tilemap is not None:
+            self.tilemap.close()
+            self.tilemap = tilemap
+        else:
+            self.tilemap.load(path, streaming=self.config.map_streaming)
+
+        self.seed = (
+            seed if seed is not None else int.from_bytes(os.urandom(4), "little")
+        )
+        random.seed(self.seed)
+
+        self.ticks = 0
+        self.scroll = [0, 0]
+        self.previous_scroll = [0, 0]
+
+        self.enemies = []
+        self.player = self.new_player((20, 50))
+
+        self.scores = 0
+
+        for spawner in self.tilemap.extract(
+            [("spawner", 0), ("spawner", 1)], keep=False
+        ):
+            if spawner.variant == 0:
+                self.player = self.new_player(spawner.pos)
+            else:
+                self.enemies.append(self.new_enemy(spawner.pos))
+
+        self.portals = []
+        for portal in self.tilemap.extract([("portal", 0), ("portal", 1)], keep=False):
+            self.portals.append(
+                Portal(
+                    self.config.tiles_assets["portal"],
+                    portal.pos,
+                    portal.variant,
+                    self.config.tile_size,
+                    self.config.particles_assets["smoke"],
+                    self.tilemap.particle_pool,
+                )
+            )
+
+        self.portal_grid.clear()
+        for portal in self.portals:
+            self.portal_grid.insert(portal, portal.rect)
+
+        self.enemy_projectiles.clear()
+        self.player_projectiles.clear()
+        self.sparks.clear()
+
+        self.dead_delay = 60
+        self.dead = False
+
+        self.next_level_delay = 60
+        self.next_level = False
+
+        self.lives = 1
+
+        self.finished = False
+
+    @property
+    def render_scroll(self):
+        """
+        The camera offset rounded to whole pixels, used to draw the level.
+        """
+
+        return (int(self.scroll[0]), int(self.scroll[1]))
+
+    def camera(self, alpha=1):
+        """
+        Get the camera offset interpolated between the last two ticks, rounded to whole pixels.
+
+        Parameters:
+            alpha (float): The fraction of a tick elapsed since the last tick. Default is 1, the offset after the last tick.
+
+        Returns:
+            tuple[int, int]: The camera offset.
+        """
+
+        return (
+            int(
+                self.previous_scroll[0]
+                + (self.scroll[0] - self.previous_scroll[0]) * alpha
+            ),
+            int(
+                self.previous_scroll[1]
+                + (self.scroll[1] - self.previous_scroll[1]) * alpha
+            ),
+        )
+
+    def update(self, events=(), held=None):
+        """
+        Advance the level by one tick. The input events are applied at the end of the tick, so they take effect from the next one.
+
+        Parameters:
+            events (Iterable[pygame.event.Event]): The input events of the tick. Default is no events.
+            held (Collection[int]): The keys of HELD_KEYS that are held down, as read from the keyboard. Default is None, the held keys are then deduced from the events.
+        """
+
+        if held is None:
+            held = self.held
+
+        self.ticks += 1
+
+        self.screenshake = max(0, self.screenshake - 1)
+
+        self.previous_scroll[0] = self.scroll[0]
+        self.previous_scroll[1] = self.scroll[1]
+        self.scroll[0] += (
+            self.player.rect.centerx - self.view_size[0] * 1 / 3 - self.scroll[0]
+        ) / 30
+        self.scroll[1] += (
+            self.player.rect.centery - self.view_size[1] / 2 - self.scroll[1]
+        ) / 30
+
+        if self.dead:
+            if self.dead_delay > 0:
+                self.dead_delay -= 1
+
+        if self.dead_delay <= 0:
+            self.lives -= 1
+            if self.lives > 0:
+                self.player = self.new_player(
+                    (self.player.pos[0], self.player.pos[1] - 14)
+                )
+                self.play("select")
+                self.dead = False
+                self.dead_delay = 60
+            else:
+                self.finished = True
+
+        if self.next_level:
+            if self.next_level_delay > 0:
+                self.next_level_delay -= 1
+
+        if self.next_level_delay <= 0:
+            self.finished = True
+
+        profiler = self.profiler
+
+        activity = self.activity
+        if activity is not None:
+            activity.update(self.render_scroll, self.ticks)
+
+        with profiler.section("tilemap update"):
+            self.tilemap.stream_chunks(self.render_scroll, self.view_size)
+            self.tilemap.update(activity.active if activity is not None else None)
+
+        with profiler.section("barrels"):
+            for barrel in self.tilemap.find([("barrel", 0), ("barrel", 1)]):
+                barrel.update(self.tilemap, self.player, self.enemies)
+
+        with profiler.section("portals"):
+            for portal in self.portals:
+                if activity is not None and activity.level(portal.pos) != ACTIVE:
+                    continue
+                if portal.update(self.player):
+                    self.enemies.append(self.new_enemy(portal.pos))
+
+        with profiler.section("enemy projectiles"):
+            self.update_enemy_projectiles()
+
+        with profiler.section("enemies"):
+            for i, enemy in enumerate(self.enemies.copy()):
+                # The dead enemies finish their animation wherever they are.
+                if (
+                    activity is not None
+                    and not enemy.dead
+                    and not activity.due(enemy.pos, i)
+                ):
+                    continue
+                kill = enemy.update(
+                    self.tilemap,
+                    self.enemy_projectiles.spawn,
+                    self.player,
+                    movement=(0, 0),
+                )
+                if kill:
+                    self.scores += 10
+                    self.enemies.remove(enemy)
+
+        with profiler.section("player"):
+            self.player.update(
+                self.tilemap,
+                movement=(self.movement[1] - self.movement[0], 0),
+                climb=(
+                    -1 if pygame.K_UP in held else 1 if pygame.K_DOWN in held else 0
+                ),
+            )
+
+        if self.player.dead:
+            self.dead = True
+
+        if self.dead == True:
+            self.movement = [False, False]
+
+        if self.shoot:
+            if self.player.shoot(self.player_projectiles.spawn):
+                self.play("shoot")
+                self.screenshake = max(4, self.screenshake)
+
+        for ammo in self.tilemap.find([("ammo", 0)]):
+            if self.player.rect.colliderect(ammo.rect):
+                self.play("select")
+                self.lives = min(3, 1 + self.lives)
+                self.tilemap.remove_offgrid_tile(ammo)
+
+        for checkpoint in self.tilemap.find([("checkpoint", 0)]):
+            if self.player.rect.colliderect(checkpoint.rect):
+                self.next_level = True
+                self.screenshake = max(30, self.screenshake)
+
+        with profiler.section("player projectiles"):
+            self.update_player_projectiles()
+
+        with profiler.section("sparks"):
+            self.sparks.update()
+
+        if not self.dead:
+            player_rect = pygame.Rect(
+                self.player.rect.centerx - self.config.tile_size / 2,
+                self.player.rect.bottom - self.config.tile_size / 2,
+                self.config.tile_size,
+                self.config.tile_size / 2,
+            )
+            for trap in self.tilemap.find([("trap", 0)]):
+                if player_rect.colliderect(trap.rect):
+                    self.player.kill(0, self.sfx("hurt"))
+                    self.dead = True
+                    self.screenshake = max(25, self.screenshake)
+
+        self.handle_events(events)
+
+    def update_enemy_projectiles(self):
+        """
+        Move the enemy projectiles and check if they hit a wall or the player.
+        """
+
+        projectiles = self.enemy_projectiles
+        if not len(projectiles):
+            return
+
+        hits = projectiles.colliding(self.player.rect).tolist()
+        centerx, centery = projectiles.centers()
+        directions = projectiles.direction[: len(projectiles)].tolist()
+
+        for i, (x, y, direction) in enumerate(
+            zip(centerx.tolist(), centery.tolist(), directions)
+        ):
+            if self.tilemap.solid_check((x + 2 * (1 if direction > 0 else -1), y)):
+                projectiles.remove(i)
+
+            elif hits[i]:
+                projectiles.remove(i)
+                self.player.kill(direction, self.sfx("hurt"))
+                self.dead = True
+                self.screenshake = max(16, self.screenshake)
+
+        projectiles.update()
+
+    def update_player_projectiles(self):
+        """
+        Move the player projectiles and check if they hit a wall, a barrel, an enemy or a portal. The enemies and the portals near each projectile are found with a grid broadphase.
+        """
+
+        projectiles = self.player_projectiles
+        if not len(projectiles):
+            return
+
+        enemies = self.enemies
+        # The enemies are indexed when a projectile first gets to them.
+        enemy_grid = None
+
+        left, top = projectiles.rects()
+        width, height = projectiles.size
+        directions = projectiles.direction[: len(projectiles)].tolist()
+
+        for i, (x, y, direction) in enumerate(
+            zip(left.tolist(), top.tolist(), directions)
+        ):
+            rect = pygame.Rect(x, y, width, height)
+            collision = self.tilemap.solid_check(
+                (rect.centerx + 3 * (1 if direction > 0 else -1), rect.centery)
+            )
+
+            if collision:
+                projectiles.remove(i, self.sfx("hit"))
+
+                if collision.type == "barrel":
+                    collision.explode(self.sfx("bomb"))
+
+                    self.screenshake = max(25, self.screenshake)
+                else:
+                    self.screenshake = max(8, self.screenshake)
+
+            else:
+                if enemy_grid is None:
+                    enemy_grid = self.enemy_grid
+                    enemy_grid.build([enemy.rect for enemy in enemies])
+
+                for enemy in enemy_grid.query_rect(rect):
+                    projectiles.remove(i, self.sfx("explosion"))
+                    enemies[enemy].dead = True
+                    self.screenshake = max(16, self.screenshake)
+                    break
+                else:
+                    for portal in self.portal_grid.query_rect(rect):
+                        if not portal.destroyed:
+                            destroyed = portal.destroy()
+
+                            if destroyed:
+                                self.screenshake = max(25, self.screenshake)
+                                self.play("bomb")
+                                self.scores += 50
+                            else:
+                                projectiles.remove(i)
+                                self.screenshake = max(8, self.screenshake)
+                            break
+
+        projectiles.update()
+
+    def handle_events(self, events):
+        """
+        Apply the input events to the player.
+
+        Parameters:
+            events (Iterable[pygame.event.Event]): The input events.
+        """
+
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key in HELD_KEYS:
+                    self.held.add(event.key)
+
+                if event.key == pygame.K_LEFT:
+                    self.movement[0] = True
+                if event.key == pygame.K_RIGHT:
+                    self.movement[1] = True
+
+                if event.key == pygame.K_UP:
+                    if self.player.jump():
+                        self.play("jump")
+                if event.key == pygame.K_c:
+                    if self.player.dash():
+                        self.play("dash")
+
+                if event.key == pygame.K_x:
+                    self.shoot = True
+
+            if event.type == pygame.KEYUP:
+                self.held.discard(event.key)
+
+                if event.key == pygame.K_LEFT:
+                    self.movement[0] = False
+                if event.key == pygame.K_RIGHT:
+                    self.movement[1] = False
+                if event.key == pygame.K_x:
+                    self.shoot = False
+
+    def digest(self):
+        """
+        Get a checksum of the state of the level: the player, the enemies, the projectiles, the portals, the scores and the lives. Two runs of a level are identical if their digests are equal after every tick.
+
+        Returns:
+            int: The checksum.
+        """
+
+        state = (
+            self.ticks,
+            self.player.pos,
+            self.player.velocity,
+            self.player.dead,
+            [(enemy.pos, enemy.dead) for enemy in self.enemies],
+            self.enemy_projectiles.positions(),
+            self.player_projectiles.positions(),
+            [portal.durability for portal in self.portals],
+            self.scores,
+            self.lives,
+            self.next_level,
+        )
+        return zlib.crc32(repr(state).encode())
+
+    def advance(self, ticks, script=None):
+        """
+        Advance the level by a number of ticks.
+
+        Parameters:
+            ticks (int): The number of ticks to run.
+            script (dict[int, list[pygame.event.Event]]): The input events to apply, keyed by the tick they are applied on, counted from the loading of the map. Default is None, no input.
+        """
+
+        for _ in range(ticks):
+            self.update(script.get(self.ticks, ()) if script else ())
@@ -0,0 +1,187 @@
+import math
+import numpy as np
+import pygame
+
+# The speed a spark loses every update.
+SPARK_DECELERATION = 0.1
+
+# The sparks are drawn from pre-rendered images, one per direction and speed:
+# the angles are rounded to SPRITE_ANGLES directions and the speeds to
+# multiples of SPRITE_SPEED_STEP, up to SPRITE_SPEEDS - 1 steps.
+SPRITE_ANGLES = 64
+SPRITE_SPEED_STEP = 0.25
+SPRITE_SPEEDS = 11
+# The size of the images, which fits the longest spark.
+SPRITE_SIZE = 12
+
+
+def spark_lifetime(speed):
+    """
+    Get the number of updates a spark lives for: it is removed by the update that brings its speed to 0.
+
+    Parameters:
+        speed (float): The start speed of the spark.
+
+    Returns:
+        int: The number of updates.
+    """
+
+    updates = 0
+    while speed:
+        speed = max(0, speed - SPARK_DECELERATION)
+        updates += 1
+    return updates
+
+
+class SparkSystem:
+    """
+    All the sparks of a level, the effect of the projectiles when they are shot and when they hit something. A spark is a diamond that flies in a straight line and shrinks as it slows down.
+
+    The sparks are stored in NumPy arrays: the position, the direction and the speed of every spark. They are moved in one vectorized step. The diamonds are pre-rendered for a set of directions and speeds, so all the sparks are drawn with a single blit call instead of computing and filling a polygon per spark.
+
+    A spark is a slot of the arrays, given by emit. The slots are owned by the caller and stay valid until they are freed, even after the spark stopped, so a projectile can hold the indices of its sparks.
+    """
+
+    def __init__(self, color=(255, 255, 255), capacity=64):
+        """
+        Create a new SparkSystem object.
+
+        Parameters:
+            color (tuple[int, int, int]): The color of the sparks. Default is white.
+            capacity (int): The number of sparks the arrays are allocated for. They grow as needed. Default is 64.
+        """
+
+        self.color = color
+        self.pos = np.zeros((capacity, 2))
+        # The cosine and the sine of the angle of each spark.
+        self.direction = np.zeros((capacity, 2))
+        # The speed of the free and the stopped slots is 0.
+        self.speed = np.zeros(capacity)
+        # The direction of each spark, rounded to one of the pre-rendered ones.
+        self.angle = np.zeros(capacity, dtype=np.intp)
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.sprites = None
+
+    def grow(self):
+        """
+        Double the capacity of the arrays.
+        """
+
+        capacity = len(self.speed)
+        self.pos = np.concatenate((self.pos, np.zeros((capacity, 2))))
+        self.direction = np.concatenate((self.direction, np.zeros((capacity, 2))))
+        self.speed = np.concatenate((self.speed, np.zeros(capacity)))
+        self.angle = np.concatenate((self.angle, np.zeros(capacity, dtype=np.intp)))
+        self.free_slots.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def emit(self, pos, angle, speed):
+        """
+        Add a spark.
+
+        Parameters:
+            pos (tuple[float, float]): The position of the spark.
+            angle (float): The angle the spark moves in, in radians.
+            speed (float): The start speed of the spark.
+
+        Returns:
+            int: The slot of the spark, to free it with free.
+        """
+
+        if not self.free_slots:
+            self.grow()
+
+        i = self.free_slots.pop()
+        self.pos[i] = pos
+        self.direction[i] = (math.cos(angle), math.sin(angle))
+        self.speed[i] = speed
+        self.angle[i] = round(angle / math.tau * SPRITE_ANGLES) % SPRITE_ANGLES
+        return i
+
+    def free(self, slots):
+        """
+        Remove sparks and free their slots.
+
+        Parameters:
+            slots (Iterable[int]): The slots of the sparks.
+        """
+
+        for i in slots:
+            self.speed[i] = 0
+            self.free_slots.append(i)
+
+    def update(self):
+        """
+        Move the sparks and slow them down.
+        """
+
+        speed = self.speed
+        self.pos += self.direction * speed[:, None]
+        np.maximum(speed - SPARK_DECELERATION, 0, out=speed)
+
+    def render_sprites(self):
+        """
+        Render the images of the sparks, for every direction and speed.
+
+        Returns:
+            list[pygame.Surface]: The images, SPRITE_SPEEDS per direction.
+        """
+
+        sprites = []
+        center = SPRITE_SIZE / 2
+        background = (0, 0, 0) if self.color != (0, 0, 0) else (255, 255, 255)
+        for i in range(SPRITE_ANGLES):
+            angle = i / SPRITE_ANGLES * math.tau
+            cos, sin = math.cos(angle), math.sin(angle)
+            for step in range(SPRITE_SPEEDS):
+                # The diamond is 4 times the speed long and 1 time the speed wide.
+                speed = max(step * SPRITE_SPEED_STEP, SPARK_DECELERATION)
+                points = [
+                    (center + cos * speed * 2, center + sin * speed * 2),
+                    (center - sin * speed * 0.5, center + cos * speed * 0.5),
+                    (center - cos * speed * 2, center - sin * speed * 2),
+                    (center + sin * speed * 0.5, center - cos * speed * 0.5),
+                ]
+                sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE))
+                sprite.fill(background)
+                sprite.set_colorkey(background)
+                pygame.draw.polygon(sprite, self.color, points)
+                sprites.append(sprite)
+        return sprites
+
+    def render(self, surf, offset=(0, 0)):
+        """
+        Render the moving sparks on the screen.
+
+        Parameters:
+            surf (pygame.Surface): The surface to render the sparks.
+            offset (tuple[float, float]): The offset of the screen, used to render the sparks in the correct position. Default is (0, 0).
+        """
+
+        moving = np.flatnonzero(self.speed)
+        if not len(moving):
+            return
+
+        if self.sprites is None:
+            self.sprites = self.render_sprites()
+
+        step = np.rint(self.speed[moving] / SPRITE_SPEED_STEP).astype(np.intp)
+        sprite = self.angle[moving] * SPRITE_SPEEDS + np.minimum(
+            step, SPRITE_SPEEDS - 1
+        )
+        topleft = self.pos[moving] - offset - SPRITE_SIZE / 2
+
+        sprites = self.sprites
+        surf.fblits(
+            [
+                (sprites[i], position)
+                for i, position in zip(sprite.tolist(), topleft.tolist())
+            ]
+        )
+
+    def clear(self):
+        """
+        Remove all the sparks and free all the slots.
+        """
+
+        self.speed[:] = 0
+        self.free_slots = list(range(len(self.speed) - 1, -1, -1))
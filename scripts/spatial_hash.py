@@ -0,0 +1,211 @@
+import pygame
+
+
+class SpatialHash:
+    """
+    A bucketed spatial index. The space is split into a uniform grid of square cells, and every object is stored in the buckets of all the cells its rect overlaps, so rect and point queries only look at the objects near them. Objects are returned in the order they were inserted.
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        Create a new, empty SpatialHash object.
+
+        Parameters:
+            cell_size (int): The size of a cell in pixels. Default is 64.
+        """
+
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = {}
+        self.order = {}
+        self.counter = 0
+
+    def cells_of(self, rect):
+        """
+        Get the cells overlapped by a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect, in pixels.
+
+        Yields:
+            tuple[int, int]: The position of the cells in cell coordinates.
+        """
+
+        for cx in range(
+            rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1
+        ):
+            for cy in range(
+                rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1
+            ):
+                yield cx, cy
+
+    def insert(self, obj, rect):
+        """
+        Add an object to the index.
+
+        Parameters:
+            obj (object): The object to add. It must be hashable.
+            rect (pygame.Rect): The rect of the object, in pixels.
+        """
+
+        if obj in self.rects:
+            self.remove(obj)
+
+        rect = pygame.Rect(rect)
+        self.rects[obj] = rect
+        self.order[obj] = self.counter
+        self.counter += 1
+        for cell in self.cells_of(rect):
+            self.cells.setdefault(cell, {})[obj] = None
+
+    def remove(self, obj):
+        """
+        Remove an object from the index.
+
+        Parameters:
+            obj (object): The object to remove.
+
+        Returns:
+            bool: If the object was in the index or not.
+        """
+
+        rect = self.rects.pop(obj, None)
+        if rect is None:
+            return False
+
+        del self.order[obj]
+        for cell in self.cells_of(rect):
+            bucket = self.cells[cell]
+            del bucket[obj]
+            if not bucket:
+                del self.cells[cell]
+        return True
+
+    def query_rect(self, rect):
+        """
+        Get the objects whose rect overlaps a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check, in pixels.
+
+        Returns:
+            list[object]: The objects overlapping the rect, in insertion order.
+        """
+
+        rect = pygame.Rect(rect)
+        found = set()
+        for cell in self.cells_of(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+
+        return sorted(
+            (obj for obj in found if rect.colliderect(self.rects[obj])),
+            key=self.order.__getitem__,
+        )
+
+    def query_point(self, point):
+        """
+        Get the objects whose rect contains a point.
+
+        Parameters:
+            point (tuple[float, float]): The point to check, in pixels.
+
+        Returns:
+            list[object]: The objects containing the point, in insertion order.
+        """
+
+        bucket = self.cells.get(
+            (int(point[0] // self.cell_size), int(point[1] // self.cell_size))
+        )
+        if not bucket:
+            return []
+
+        return [obj for obj in bucket if self.rects[obj].collidepoint(point)]
+
+    def clear(self):
+        """
+        Remove all the objects from the index.
+        """
+
+        self.cells = {}
+        self.rects = {}
+        self.order = {}
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, obj):
+        return obj in self.rects
+
+    def __iter__(self):
+        """
+        Iterate over all the objects of the index, in insertion order.
+
+        Yields:
+            object: The objects of the index.
+        """
+
+        return iter(list(self.rects))
+
+
+class UniformGrid:
+    """
+    A uniform grid of square cells for moving objects, rebuilt from scratch every time they move. It only stores the index of every rect in the cells it overlaps, which makes building it much cheaper than a SpatialHash. Queries return the indices of the overlapping rects in increasing order.
+    """
+
+    def __init__(self, cell_size=32):
+        """
+        Create a new, empty UniformGrid object.
+
+        Parameters:
+            cell_size (int): The size of a cell in pixels. Default is 32.
+        """
+
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = []
+
+    def build(self, rects):
+        """
+        Index a list of rects, replacing the previous ones.
+
+        Parameters:
+            rects (list[pygame.Rect]): The rects, in pixels.
+        """
+
+        size = self.cell_size
+        cells = {}
+        for i, rect in enumerate(rects):
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[cx, cy] = [i]
+                    else:
+                        bucket.append(i)
+        self.cells = cells
+        self.rects = rects
+
+    def query_rect(self, rect):
+        """
+        Get the rects overlapping a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check, in pixels.
+
+        Returns:
+            list[int]: The indices of the overlapping rects, in increasing order.
+        """
+
+        size = self.cell_size
+        found = set()
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+
+        rects = self.rects
+        return sorted(i for i in found if rect.colliderect(rects[i]))
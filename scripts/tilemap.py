@@ -1,6 +1,15 @@
 import pygame
 import json
 from .tiles import Tile, Tree, Barrel
+from .chunk_cache import ChunkCache, LAYER_OFFGRID, LAYER_GRID
+from .spatial_hash import SpatialHash
+from .map_format import MapFile, save_binary_map, BINARY_MAP_EXTENSION
+from .chunk_stream import ChunkStream
+from .collision import solid_ids
+from .chunk_grid import Chunk, ChunkGrid, CHUNK_SHIFT, CHUNK_MASK
+from .particle_system import ParticleSystem
+from .particle import Particle
+from .object_pool import ObjectPool
 
 
 NEIGHBORS_OFFSETS = [
@@ -15,6 +24,11 @@ NEIGHBORS_OFFSETS = [
     (1, 1),
 ]
 
+LIVE_TILES_MARGIN = 128
+
+
+AUTOTILE_OFFSETS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
 
 AUTOTILE_MAP = {
     tuple(sorted([(1, 0), (1, 0)])): 0,
@@ -50,11 +64,21 @@ class Tilemap:
         """
 
         self.tile_size = config.tile_size
-        self.tilemap = {}
-        self.offgrid_tiles = []
+        self.grid = ChunkGrid(config.tiles_assets)
+        self.offgrid_tiles = SpatialHash(self.tile_size * 4)
         self.assets = config.tiles_assets
         self.trees = []
+        self.leaves = ParticleSystem(
+            {"leaf": config.particles_assets["leaf"]}, sway={"leaf": 0.3}
+        )
+        # The smoke explosions of the barrels and the portals.
+        self.particle_pool = ObjectPool(Particle)
         self.config = config
+        self.dirty_tiles = set()
+        self.chunk_cache = ChunkCache(self)
+        self.registry = {}
+        self.stream = None
+        self.solid_ids = solid_ids(self)
 
     def tiles_around(self, pos):
         """
@@ -68,17 +92,13 @@ class Tilemap:
 
         """
 
-        tile_loc = (
-            int(pos[0] // self.tile_size),
-            int(pos[1] // self.tile_size),
-        )
+        x = int(pos[0] // self.tile_size)
+        y = int(pos[1] // self.tile_size)
+        get = self.grid.get
         for offset in NEIGHBORS_OFFSETS:
-            check_loc = (
-                str(tile_loc[0] + offset[0]) + ";" + str(tile_loc[1] + offset[1])
-            )
-            if check_loc in self.tilemap:
-
-                yield self.tilemap[check_loc], offset
+            tile = get(x + offset[0], y + offset[1])
+            if tile is not None:
+                yield tile, offset
 
     def physics_rects_around(self, pos):
         """
@@ -108,15 +128,55 @@ class Tilemap:
 
         '''
 
-        tile = Tile(
-            self.assets[type][variant],
-            pos,
-            type,
-            variant,
-            self.tile_size,
-            offgrid=False,
+        self.place_tile(
+            Tile(
+                self.assets[type][variant],
+                pos,
+                type,
+                variant,
+                self.tile_size,
+                offgrid=False,
+            )
         )
-        self.tilemap[tile.key] = tile
+
+    def place_tile(self, tile):
+        '''
+        Put a tile object on the grid at its position, replacing the tile that was there.
+
+        Parameters:
+            tile (Tile): The on-grid tile to put. Its position should be in tiles.
+        '''
+
+        if self.stream is not None:
+            self.stream.modify(
+                (int(tile.pos[0]) >> CHUNK_SHIFT, int(tile.pos[1]) >> CHUNK_SHIFT)
+            )
+        replaced = self.grid.set(tile.pos[0], tile.pos[1], tile)
+        if replaced is not None:
+            self.unregister(replaced)
+        self.register(tile)
+        self.mark_dirty(tile.pos)
+        self.chunk_cache.invalidate_cell(tile.pos)
+
+    def pop_tile(self, pos):
+        '''
+        Remove the on-grid tile at a grid position.
+
+        Parameters:
+            pos (tuple[int, int]): The position of the tile, in tiles.
+
+        Returns:
+            Tile: The removed tile or None if there was no tile.
+        '''
+
+        if self.stream is not None:
+            self.stream.modify((int(pos[0]) >> CHUNK_SHIFT, int(pos[1]) >> CHUNK_SHIFT))
+        tile = self.grid.remove(int(pos[0]), int(pos[1]))
+        if tile is not None:
+            self.unregister(tile)
+            self.mark_dirty(pos)
+            self.chunk_cache.invalidate_cell(pos)
+        return tile
 
     def add_offgrid_tile(self, pos, tile, variant):
         '''
@@ -128,7 +188,7 @@ class Tilemap:
             variant (int): The variant of the tile.
         '''
 
-        self.offgrid_tiles.append(
+        self.place_offgrid_tile(
             Tile(
                 self.assets[tile][variant],
                 pos,
@@ -139,6 +199,70 @@ class Tilemap:
             )
         )
 
+    def place_offgrid_tile(self, tile):
+        '''
+        Add an offgrid tile object to the tilemap.
+
+        Parameters:
+            tile (Tile): The offgrid tile to add. Its position should be in pixels.
+        '''
+
+        self.offgrid_tiles.insert(tile, tile.rect)
+        self.register(tile)
+        if tile.static:
+            self.chunk_cache.invalidate_rect(tile.rect)
+
+    def remove_offgrid_tile(self, tile):
+        '''
+        Remove an offgrid tile from the tilemap.
+
+        Parameters:
+            tile (Tile): The offgrid tile to remove.
+        '''
+
+        if self.offgrid_tiles.remove(tile):
+            self.unregister(tile)
+            if tile.static:
+                self.chunk_cache.invalidate_rect(tile.rect)
+
+    def register(self, tile):
+        '''
+        Add a tile to the registry of its type and variant.
+
+        Parameters:
+            tile (Tile): The tile to add.
+        '''
+
+        self.registry.setdefault((tile.type, tile.variant), {})[tile] = None
+
+    def unregister(self, tile):
+        '''
+        Remove a tile from the registry of its type and variant.
+
+        Parameters:
+            tile (Tile): The tile to remove.
+        '''
+
+        tiles = self.registry.get((tile.type, tile.variant))
+        if tiles is not None:
+            tiles.pop(tile, None)
+
+    def find(self, id_pairs: list[tuple[str, int]]):
+        '''
+        Find the tiles of some types in the tilemap. Unlike extract, the live tile objects are returned, and only the registry of the requested types is read.
+
+        Parameters:
+            id_pairs (list[tuple[str, int]]): The list of id pairs to find. The id pairs should be a tuple with the type and variant of the tile.
+
+        Returns:
+            list[Tile]: The tiles found, in the order they were added. The list is a snapshot, so the tilemap can be changed while iterating over it.
+        '''
+
+        tiles = []
+        for id_pair in id_pairs:
+            tiles.extend(self.registry.get(id_pair, ()))
+        return tiles
+
     def remove_tile(
         self,
         pos,
@@ -158,21 +282,13 @@ class Tilemap:
 
         '''
 
-        loc = str(pos[0]) + ";" + str(pos[1])
-        if loc in self.tilemap:
-            del self.tilemap[loc]
+        self.pop_tile(pos)
 
         if offgrid:
-            for tile in self.offgrid_tiles.copy():
-                tile_rect = pygame.Rect(
-                    tile.pos[0] - offset[0],
-                    tile.pos[1] - offset[1],
-                    tile.rect.width,
-                    tile.rect.height,
-                )
-
-                if tile_rect.collidepoint(mouse_pos):
-                    self.offgrid_tiles.remove(tile)
+            for tile in self.offgrid_tiles.query_point(
+                (mouse_pos[0] + offset[0], mouse_pos[1] + offset[1])
+            ):
+                self.remove_offgrid_tile(tile)
 
     def solid_check(self, pos):
         '''
@@ -185,143 +301,292 @@ class Tilemap:
             Tile: The tile that is solid or None if there is no solid tile.
         '''
 
-        tile_loc = (
-            str(int(pos[0] // self.tile_size))
-            + ";"
-            + str(int(pos[1] // self.tile_size))
+        tile = self.grid.get(
+            int(pos[0] // self.tile_size), int(pos[1] // self.tile_size)
         )
-        if tile_loc in self.tilemap:
-            if self.tilemap[tile_loc].type in self.config.physics_tiles:
-                return self.tilemap[tile_loc]
+        if tile is not None and tile.type in self.config.physics_tiles:
+            return tile
+
+    def mark_dirty(self, pos):
+        '''
+        Mark a grid position and its 4 neighbors to be autotiled again on the next update.
+
+        Parameters:
+            pos (tuple[int, int]): The grid position that changed.
+        '''
 
-    def autotile(self):
+        x, y = int(pos[0]), int(pos[1])
+        self.dirty_tiles.add((x, y))
+        for offset in AUTOTILE_OFFSETS:
+            self.dirty_tiles.add((x + offset[0], y + offset[1]))
+
+    def autotile(self, positions=None):
         '''
         Update the autotile tiles.
+
+        Parameters:
+            positions (Iterable[tuple[int, int]]): The grid positions to update. If None, all the tiles of the tilemap are updated. Default is None.
         '''
 
-        for loc in self.tilemap:
-            tile = self.tilemap[loc]
+        if positions is None:
+            tiles = list(self.grid)
+            self.dirty_tiles = set()
+        else:
+            tiles = [self.grid.get(x, y) for x, y in positions]
+
+        for tile in tiles:
+            if tile is None or tile.type not in self.config.autotile_tiles:
+                continue
+
             neighbors = set()
-            for offset in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                check_loc = (
-                    str(tile.pos[0] + offset[0]) + ";" + str(tile.pos[1] + offset[1])
+            for offset in AUTOTILE_OFFSETS:
+                neighbor_type = self.type_at(
+                    tile.pos[0] + offset[0], tile.pos[1] + offset[1]
                 )
-                if check_loc in self.tilemap:
-                    if self.tilemap[check_loc].type == tile.type:
+                if neighbor_type is not None:
+                    if neighbor_type == tile.type:
                         neighbors.add(offset)
                     else:
-                        if self.tilemap[check_loc].type in self.config.autotile_tiles:
+                        if neighbor_type in self.config.autotile_tiles:
                             neighbors.add(offset)
 
             neighbors = tuple(sorted(neighbors))
-            if tile.type in self.config.autotile_tiles and neighbors in AUTOTILE_MAP:
+            if neighbors in AUTOTILE_MAP and tile.variant != AUTOTILE_MAP[neighbors]:
+                self.unregister(tile)
                 tile.variant = AUTOTILE_MAP[neighbors]
+                self.register(tile)
                 tile.image = self.assets[tile.type][tile.variant]
+                self.grid.set_variant(tile.pos[0], tile.pos[1], tile.variant)
+                self.chunk_cache.invalidate_cell(tile.pos)
 
     def render(self, surf, offset=(0, 0)):
         '''
-        Render the tilemap on the screen.
+        Render the tilemap on the screen. The static tiles are drawn from the pre-rendered chunks of the chunk cache, the on-grid tiles that are not static (barrels) are drawn live by the chunk cache, on top of their chunk. The off-grid tiles that are not static are drawn live over the off-grid layer: only the portals in the editor, since the game takes them out of the tilemap. The falling leaves are drawn over the off-grid layer too.
 
         Parameters:
             surf (pygame.Surface): The surface to render the tilemap.
             offset (tuple[int, int]): The offset of the screen, used to render the tilemap in the correct position. Default is (0, 0).
         '''
 
-        for tile in self.offgrid_tiles:
-            tile.render(surf, offset)
+        self.chunk_cache.render(surf, LAYER_OFFGRID, offset)
 
-        for x in range(
-            offset[0] // self.tile_size,
-            (offset[0] + surf.get_width()) // self.tile_size + 1,
-        ):
-            for y in range(
-                offset[1] // self.tile_size,
-                (offset[1] + surf.get_height()) // self.tile_size + 1,
-            ):
-                loc = str(x) + ";" + str(y)
-                if loc in self.tilemap:
-                    tile = self.tilemap[loc]
-                    tile.render(surf, offset)
+        camera = pygame.Rect(
+            offset[0] - LIVE_TILES_MARGIN,
+            offset[1] - LIVE_TILES_MARGIN,
+            surf.get_width() + LIVE_TILES_MARGIN * 2,
+            surf.get_height() + LIVE_TILES_MARGIN * 2,
+        )
+        for tile in self.offgrid_tiles.query_rect(camera):
+            if not tile.static:
+                tile.render(surf, offset)
+        self.leaves.render(surf, offset)
+
+        self.chunk_cache.render(surf, LAYER_GRID, offset)
 
-    def update(self):
+    def stream_chunks(self, offset, size):
         '''
-        Update the tilemap. It will update the autotile tiles and the trees.
+        Load the chunks around the camera and unload the distant ones, if the map is streamed.
+
+        Parameters:
+            offset (tuple[int, int]): The offset of the screen.
+            size (tuple[int, int]): The size of the screen.
         '''
 
-        self.autotile()
+        if self.stream is not None:
+            self.stream.update(offset, size)
+
+    def update(self, region=None):
+        '''
+        Update the tilemap. It will autotile again the tiles changed since the last update, update the trees and their falling leaves.
+
+        Parameters:
+            region (pygame.Rect): The region where the trees spawn leaves, the trees out of it are dormant. Default is None, all the trees spawn leaves.
+        '''
+
+        if self.dirty_tiles:
+            dirty_tiles = self.dirty_tiles
+            self.dirty_tiles = set()
+            self.autotile(dirty_tiles)
         for tree in self.trees:
-            tree.update()
+            if region is None or region.colliderect(tree.leave_spawner):
+                tree.update(self.leaves)
+        self.leaves.update()
 
     def save(self, path):
         '''
-        Save the tilemap to a file.
+        Save the tilemap to a file. If the path ends with BINARY_MAP_EXTENSION, the tilemap is saved in the binary map format, otherwise in the JSON map format.
 
         Parameters:
             path (str): The path to save the tilemap.
         '''
 
-        tilemap = {loc: tile.to_json() for loc, tile in self.tilemap.items()}
+        if self.stream is not None:
+            self.stream.load_all()
+
+        tilemap = {
+            str(tile.pos[0]) + ";" + str(tile.pos[1]): tile.to_json()
+            for tile in self.grid
+        }
         offgrid_tiles = [tile.to_json() for tile in self.offgrid_tiles]
+        data = {
+            "tilemap": tilemap,
+            "offgrid_tiles": offgrid_tiles,
+            "tile_size": self.tile_size,
+        }
+
+        if path.endswith(BINARY_MAP_EXTENSION):
+            save_binary_map(path, data)
+        else:
+            with open(path, "w") as file:
+                json.dump(data, file)
+
+    def close(self):
+        '''
+        Close the map file of the tilemap, if the map is streamed. The chunks that are not loaded are lost.
+        '''
 
-        with open(path, "w") as file:
-            json.dump(
-                {
-                    "tilemap": tilemap,
-                    "offgrid_tiles": offgrid_tiles,
-                    "tile_size": self.tile_size,
-                },
-                file,
-            )
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+            self.grid.loader = None
 
-    def load(self, path):
+    def load(self, path, streaming=False):
         '''
-        Load the tilemap from a file.
+        Load the tilemap from a file. If the path ends with BINARY_MAP_EXTENSION, the file is read as a binary map, otherwise as a JSON map.
 
         Parameters:
             path (str): The path to load the tilemap.
+            streaming (bool): If the on-grid chunks of a binary map should be streamed around the camera instead of all loaded. The map file stays open until the next load. JSON maps are always fully loaded. Default is False.
         '''
 
-        self.tilemap = {}
-        self.offgrid_tiles = []
+        self.close()
+        self.grid.clear()
+        self.offgrid_tiles.clear()
         self.trees = []
+        self.leaves.clear()
+        self.dirty_tiles = set()
+        self.chunk_cache.clear()
+        self.registry = {}
+        self.stream = None
+        self.solid_ids = solid_ids(self)
 
         try:
-            with open(path, "r") as file:
-                data = json.load(file)
-                self.tilemap = {
-                    loc: Tile.from_json(self.assets, tile)
-                    for loc, tile in data["tilemap"].items()
-                }
-                self.offgrid_tiles = [
-                    Tile.from_json(self.assets, tile) for tile in data["offgrid_tiles"]
-                ]
+            if path.endswith(BINARY_MAP_EXTENSION) and streaming:
+                map_file = MapFile(path)
+                self.load_binary(map_file, streaming=True)
+            elif path.endswith(BINARY_MAP_EXTENSION):
+                with MapFile(path) as map_file:
+                    self.load_binary(map_file)
+            else:
+                with open(path, "r") as file:
+                    data = json.load(file)
+                for tile in data["tilemap"].values():
+                    self.place_tile(Tile.from_json(self.assets, tile))
+                for tile in data["offgrid_tiles"]:
+                    self.place_offgrid_tile(Tile.from_json(self.assets, tile))
                 self.tile_size = data["tile_size"]
 
-                for tree in self.extract([("tree", 0), ("tree", 1)], keep=False):
-                    self.trees.append(
-                        Tree(
-                            self.assets["tree"],
-                            tree.variant,
-                            tree.pos,
-                            self.config.particles_assets["leaf"],
-                        )
+            for tree in self.find([("tree", 0), ("tree", 1)]):
+                self.remove_offgrid_tile(tree)
+                self.trees.append(
+                    Tree(
+                        self.assets["tree"],
+                        tree.variant,
+                        tree.pos,
                     )
-                    self.offgrid_tiles.append(self.trees[-1])
+                )
+                self.place_offgrid_tile(self.trees[-1])
 
-                for barrel in self.extract([("barrel", 0), ("barrel", 1)]):
-                    barrel.pos[0] //= self.tile_size
-                    barrel.pos[1] //= self.tile_size
-                    self.tilemap[barrel.key] = Barrel(
+            for barrel in self.find([("barrel", 0), ("barrel", 1)]):
+                self.place_tile(
+                    Barrel(
                         self.assets["barrel"][barrel.variant],
                         barrel.pos,
                         barrel.variant,
                         barrel.size,
                         self.config.particles_assets["smoke"],
+                        self.particle_pool,
                     )
+                )
+
+            self.autotile()
 
         except FileNotFoundError:
             pass
 
+    def load_binary(self, map_file, streaming=False):
+        '''
+        Load the tiles of a binary map. The tilemap should be empty.
+
+        Parameters:
+            map_file (MapFile): The opened binary map.
+            streaming (bool): If the on-grid chunks should be streamed by a ChunkStream, which then owns the map file, instead of all loaded. Default is False.
+        '''
+
+        self.tile_size = map_file.tile_size
+        if streaming:
+            self.stream = ChunkStream(self, map_file, self.config.chunk_budget)
+            self.stream.load_pinned()
+        else:
+            type_table = map_file.type_table(self.grid.type_ids)
+            for key in map_file.chunks:
+                self.load_chunk(map_file, key, type_table)
+
+        for type_id, variant, x, y in map_file.offgrid_tiles():
+            type = map_file.palette[type_id]
+            self.place_offgrid_tile(
+                Tile(
+                    self.assets[type][variant],
+                    (x, y),
+                    type,
+                    variant,
+                    self.tile_size,
+                    offgrid=True,
+                )
+            )
+
+    def load_chunk(self, map_file, key, type_table=None):
+        '''
+        Load the on-grid tiles of a chunk of a binary map. The layers of the chunk are copied as a whole into the grid, so the tiles are not marked dirty and the chunk cache is not invalidated.
+
+        Parameters:
+            map_file (MapFile): The opened binary map.
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+            type_table (bytes): The translation table from the type ids of the map to the type ids of the grid. If None, it is computed from the map. Default is None.
+        '''
+
+        layers = map_file.chunk(key)
+        if layers is None:
+            return
+
+        types, variants = layers
+        chunk = Chunk(key)
+        if type_table is None:
+            type_table = map_file.type_table(self.grid.type_ids)
+        chunk.types[:] = types.translate(type_table)
+        chunk.variants[:] = variants
+
+        origin = (key[0] << CHUNK_SHIFT, key[1] << CHUNK_SHIFT)
+        for index, type_id in enumerate(types):
+            if type_id:
+                type = map_file.palette[type_id]
+                variant = variants[index]
+                tile = Tile(
+                    self.assets[type][variant],
+                    (
+                        origin[0] + (index & CHUNK_MASK),
+                        origin[1] + (index >> CHUNK_SHIFT),
+                    ),
+                    type,
+                    variant,
+                    self.tile_size,
+                    offgrid=False,
+                )
+                chunk.tiles[index] = tile
+                self.register(tile)
+
+        self.grid.put_chunk(chunk)
+
     def extract(self, id_pairs: list[tuple[str, int]], keep=True):
         '''
         Extract tiles from the tilemap.
@@ -334,24 +599,18 @@ class Tilemap:
             list[Tile]: The list of tiles extracted from the tilemap.
         '''
 
-
-
         matches = []
-        for tile in self.offgrid_tiles.copy():
-            if (tile.type, tile.variant) in id_pairs:
-                matches.append(tile.copy())
+        for tile in self.find(id_pairs):
+            matches.append(tile.copy())
+            if tile.offgrid:
                 if not keep:
-                    self.offgrid_tiles.remove(tile)
-
-        for loc in self.tilemap:
-            tile = self.tilemap[loc]
-            if (tile.type, tile.variant) in id_pairs:
-                matches.append(tile.copy())
+                    self.remove_offgrid_tile(tile)
+            else:
                 matches[-1].pos = matches[-1].pos.copy()
                 matches[-1].pos[0] *= self.tile_size
                 matches[-1].pos[1] *= self.tile_size
                 if not keep:
-                    del self.tilemap[loc]
+                    self.pop_tile(tile.pos)
 
         return matches
 
@@ -366,9 +625,48 @@ class Tilemap:
             Tile: The tile at the position or None if there is no tile.
         '''
 
-        loc = (
-            str(int(pos[0] // self.tile_size))
-            + ";"
-            + str(int(pos[1] // self.tile_size))
+        return self.grid.get(
+            int(pos[0] // self.tile_size), int(pos[1] // self.tile_size)
         )
-        return self.tilemap[loc]
+
+    def type_at(self, x, y):
+        '''
+        Get the type of the on-grid tile at a grid position. If the map is streamed, the chunk of the tile is not loaded, its type is read from the map file.
+
+        Parameters:
+            x (int): The x position of the tile, in tiles.
+            y (int): The y position of the tile, in tiles.
+
+        Returns:
+            str: The type of the tile or None if there is no tile.
+        '''
+
+        x, y = int(x), int(y)
+        chunk = self.grid.chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+        if chunk is None:
+            if self.stream is None:
+                return None
+            return self.stream.type_at(x, y)
+        return self.grid.type_names[
+            chunk.types[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)]
+        ]
+
+    def chunk_positions(self, key):
+        '''
+        Get the grid positions of the tiles of a loaded chunk.
+
+        Parameters:
+            key (tuple[int, int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            list[tuple[int, int]]: The positions of the tiles, in tiles.
+        '''
+
+        chunk = self.grid.chunks.get(key)
+        if chunk is None:
+            return []
+        return [
+            (int(tile.pos[0]), int(tile.pos[1]))
+            for tile in chunk.tiles
+            if tile is not None
+        ]
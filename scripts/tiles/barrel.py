@@ -1,6 +1,7 @@
 import pygame
 from .tile import Tile
 from ..particle import Particle
+from ..object_pool import ObjectPool
 
 
 class Barrel(Tile):
@@ -8,7 +9,17 @@ class Barrel(Tile):
     A barrel tile. It can explode and create a smoke explosion that kills the player and enemies around it.
     """
 
-    def __init__(self, image, pos, variant, size, smoke_animation):
+    __slots__ = (
+        "smoke_explosion",
+        "exploded",
+        "smoke_animation",
+        "killed",
+        "particle_pool",
+    )
+
+    static = False
+
+    def __init__(self, image, pos, variant, size, smoke_animation, particle_pool=None):
         """
         Create a new Barrel object.
 
@@ -18,6 +29,7 @@ class Barrel(Tile):
             variant (int): The variant of the barrel.
             size (int): The size of the barrel.
             smoke_animation (Animation): The animation of the smoke particles that will appear when the barrel explodes. It should be an Animation object.
+            particle_pool (ObjectPool): The pool of particles the smoke explosion is taken from and given back to when it is done. Default is None, a pool of the barrel only.
         """
 
         super().__init__(image, pos, "barrel", variant, size, False)
@@ -25,6 +37,9 @@ class Barrel(Tile):
         self.exploded = False
         self.smoke_animation = smoke_animation
         self.killed = False
+        self.particle_pool = (
+            particle_pool if particle_pool is not None else ObjectPool(Particle)
+        )
 
     def render(self, surf, offset):
         """
@@ -52,9 +67,7 @@ class Barrel(Tile):
         """
 
         if self.exploded:
-            kill = self.smoke_explosion.update()
-            if kill:
-                self.smoke_explosions = None
+            self.smoke_explosion.update()
 
             done = self.smoke_explosion.done
 
@@ -92,6 +105,7 @@ class Barrel(Tile):
 
             if done:
                 tilemap.remove_tile(self.pos, self.pos, offgrid=False)
+                self.particle_pool.release(self.smoke_explosion)
 
     def explode(self, sfx=None):
         """
@@ -107,7 +121,7 @@ class Barrel(Tile):
         if not self.exploded:
             if sfx:
                 sfx.play()
-            self.smoke_explosion = Particle(
+            self.smoke_explosion = self.particle_pool.acquire(
                 self.smoke_animation,
                 "smoke",
                 (self.pos[0] * self.size, self.pos[1] * self.size),
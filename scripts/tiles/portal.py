@@ -1,6 +1,7 @@
 import random
 from .tile import Tile
 from ..particle import Particle
+from ..object_pool import ObjectPool
 
 
 class Portal(Tile):
@@ -8,7 +9,17 @@ class Portal(Tile):
     A portal tile, which can spawn enemies. It has a smoke explosion when destroyed.
     """
 
-    def __init__(self, assets, pos, variant, size, smoke_animation):
+    __slots__ = (
+        "assets",
+        "durability",
+        "smoke_explosion",
+        "smoke_animation",
+        "particle_pool",
+    )
+
+    static = False
+
+    def __init__(self, assets, pos, variant, size, smoke_animation, particle_pool=None):
         """
         Create a new Portal object.
 
@@ -18,6 +29,7 @@ class Portal(Tile):
             variant (int): The variant of the portal.
             size (int): The size of the portal.
             smoke_animation (Animation): The animation of the smoke particles that will appear when the portal is destroyed. It should be an Animation object.
+            particle_pool (ObjectPool): The pool of particles the smoke explosion is taken from and given back to when it is done. Default is None, a pool of the portal only.
         """
 
         super().__init__(assets[variant], pos, "portal", variant, size, offgrid=True)
@@ -25,6 +37,9 @@ class Portal(Tile):
         self.durability = 300
         self.smoke_explosion = None
         self.smoke_animation = smoke_animation
+        self.particle_pool = (
+            particle_pool if particle_pool is not None else ObjectPool(Particle)
+        )
 
     def render(self, surf, offset):
         """
@@ -54,6 +69,7 @@ class Portal(Tile):
         if self.smoke_explosion:
             kill = self.smoke_explosion.update()
             if kill:
+                self.particle_pool.release(self.smoke_explosion)
                 self.smoke_explosion = None
 
         if (
@@ -77,7 +93,7 @@ class Portal(Tile):
             if self.durability <= 0:
                 self.variant = 1
                 self.image = self.assets[1]
-                self.smoke_explosion = Particle(
+                self.smoke_explosion = self.particle_pool.acquire(
                     self.smoke_animation,
                     "smoke",
                     self.rect.center,
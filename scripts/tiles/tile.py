@@ -6,6 +6,10 @@ class Tile:
     A class to represent a tile. A tile is a single image that is rendered on the screen. It can be on the grid or off the grid.
     """
 
+    __slots__ = ("image", "pos", "type", "variant", "size", "offgrid")
+
+    static = True
+
     @staticmethod
     def from_json(assets, data):
         """
@@ -99,10 +103,10 @@ class Tile:
     @property
     def key(self):
         """
-        Get the key of the tile in tilemap. The key is the position of the tile in the format "x;y".
+        Get the key of the tile in tilemap. The key is the integer grid position of the tile as a tuple (x, y).
         """
 
-        return str(self.pos[0]) + ";" + str(self.pos[1])
+        return (int(self.pos[0]), int(self.pos[1]))
 
     @property
     def rect(self):
@@ -1,8 +1,6 @@
 import pygame
 import random
-import math
 from .tile import Tile
-from ..particle import Particle
 
 
 class Tree(Tile):
@@ -10,7 +8,9 @@ class Tree(Tile):
     A tree tile. It has a leave spawner that creates leaf particles.
     """
 
-    def __init__(self, assets, variant, pos, leaf_animation):
+    __slots__ = ("leave_spawner",)
+
+    def __init__(self, assets, variant, pos):
         """
         Create a new Tree object.
 
@@ -18,7 +18,6 @@ class Tree(Tile):
             assets (list): The assets of the tree. It should contain the images of the tree. The first element should be the tree with the variant 0 and the second element should be the tree with the variant 1.
             variant (int): The variant of the tree.
             pos (tuple[int, int]): The position of the tree.
-            leaf_animation (Animation): The animation of the leaf particles that the tree will spawn. It should be an Animation object.
         """
 
         super().__init__(assets[variant], pos, "tree", variant, 16, True)
@@ -26,25 +25,13 @@ class Tree(Tile):
             self.leave_spawner = pygame.Rect(self.pos[0] + 7, self.pos[1] + 4, 34, 21)
         elif variant == 1:
             self.leave_spawner = pygame.Rect(self.pos[0] + 5, self.pos[1] + 4, 29, 20)
-        self.particles = []
-        self.leaf_animation = leaf_animation
 
-    def render(self, surf, offset=(0, 0)):
+    def update(self, leaves):
         """
-        Render the tree on the screen.
+        Update the tree. It will spawn leaf particles.
 
         Parameters:
-            surf (pygame.Surface): The surface to render the tree.
-            offset (tuple[int, int]): The offset of the screen, used to render the tree in the correct position. Default is (0, 0).
-        """
-
-        super().render(surf, offset)
-        for particle in self.particles:
-            particle.render(surf, offset)
-
-    def update(self):
-        """
-        Update the tree. It will spawn leaf particles.
+            leaves (ParticleSystem): The particle system of the leaves, with a "leaf" type. It is updated and rendered by the tilemap.
         """
 
         if (
@@ -55,18 +42,4 @@ class Tree(Tile):
                 self.leave_spawner.x + random.random() * self.leave_spawner.width,
                 self.leave_spawner.y + random.random() * self.leave_spawner.height,
             )
-            self.particles.append(
-                Particle(
-                    self.leaf_animation,
-                    "leaf",
-                    pos,
-                    (-0.1, 0.3),
-                    frame=random.randint(0, 20),
-                )
-            )
-
-        for particle in self.particles.copy():
-            kill = particle.update()
-            particle.pos[0] += math.sin(particle.frame * 0.035) * 0.3
-            if kill:
-                self.particles.remove(particle)
+            leaves.emit("leaf", pos, (-0.1, 0.3), frame=random.randint(0, 20))
@@ -0,0 +1,90 @@
+import time
+
+
+class FixedTimestep:
+    """
+    A fixed timestep clock. The game logic advances in ticks of a constant duration, whatever the frame rate: the real time elapsed since the last frame is accumulated and consumed one tick at a time. The time left in the accumulator, less than one tick, is used to interpolate the drawn positions between the last two ticks.
+
+    To avoid a spiral of death, when the logic cannot keep up with the real time (a long hitch, a slow machine), at most max_ticks ticks are run per frame and the rest of the late time is dropped: the game slows down instead of freezing.
+    """
+
+    def __init__(self, rate=60, max_ticks=5):
+        """
+        Create a new FixedTimestep object.
+
+        Parameters:
+            rate (int): The number of ticks per second. Default is 60.
+            max_ticks (int): The maximum number of ticks run per frame. Default is 5.
+        """
+
+        self.rate = rate
+        self.tick_time = 1 / rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0
+        self.last_time = None
+        self.dropped_ticks = 0
+
+    def advance(self, now=None):
+        """
+        Add the time elapsed since the last call to the accumulator.
+
+        Parameters:
+            now (float): The current time in seconds. Default is time.perf_counter().
+
+        Returns:
+            int: The number of ticks to run for this frame.
+        """
+
+        if now is None:
+            now = time.perf_counter()
+
+        if self.last_time is not None:
+            self.accumulator += now - self.last_time
+        else:
+            # The first frame runs one tick, so the game starts drawn.
+            self.accumulator = self.tick_time
+        self.last_time = now
+
+        ticks = int(self.accumulator // self.tick_time)
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = 0
+        else:
+            self.accumulator -= ticks * self.tick_time
+
+        return ticks
+
+    @property
+    def alpha(self):
+        """
+        The fraction of a tick elapsed since the last tick, between 0 and 1. It is used to interpolate between the states before and after the last tick.
+        """
+
+        return min(1, self.accumulator / self.tick_time)
+
+    def time_to_next_tick(self, now=None):
+        """
+        Get the time left until the next tick is due.
+
+        Parameters:
+            now (float): The current time in seconds. Default is time.perf_counter().
+
+        Returns:
+            float: The time in seconds, 0 if a tick is already due.
+        """
+
+        if self.last_time is None:
+            return 0
+        if now is None:
+            now = time.perf_counter()
+
+        return max(0, self.tick_time - self.accumulator - (now - self.last_time))
+
+    def reset(self):
+        """
+        Forget the elapsed time, for example after a long loading, so it is not caught up.
+        """
+
+        self.accumulator = 0
+        self.last_time = None
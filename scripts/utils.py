@@ -41,9 +41,19 @@ def load_images(path: str):
 class Animation:
     '''
     An animation object. It is used to create animations in the game.
+
+    The images are also kept flipped horizontally, built once when the animation is loaded and shared by its copies, so the entities facing left are drawn without flipping an image every frame.
     '''
 
-    def __init__(self, images: list[pygame.Surface], duration=5, loop=True):
+    __slots__ = ("images", "flipped_images", "duration", "loop", "done", "frame")
+
+    def __init__(
+        self,
+        images: list[pygame.Surface],
+        duration=5,
+        loop=True,
+        flipped_images: list[pygame.Surface] = None,
+    ):
         '''
         Create a new Animation object.
 
@@ -51,9 +61,15 @@ class Animation:
             images (list[pygame.Surface]): The images of the animation.
             duration (int): The duration of each frame. Default is 5.
             loop (bool): If the animation should loop or not. Default is True.
+            flipped_images (list[pygame.Surface]): The images flipped horizontally. Default is None, they are flipped from the images.
         '''
 
         self.images = images
+        self.flipped_images = (
+            flipped_images
+            if flipped_images is not None
+            else [pygame.transform.flip(image, True, False) for image in images]
+        )
         self.duration = duration
         self.loop = loop
         self.done = False
@@ -64,10 +80,21 @@ class Animation:
         Create a copy of the animation.
 
         Returns:
-            Animation: A new Animation object with the same images, duration, and loop as the original.
+            Animation: A new Animation object with the same images, flipped images, duration, and loop as the original.
+        '''
+
+        return Animation(self.images, self.duration, self.loop, self.flipped_images)
+
+    def reset(self, frame=0):
+        '''
+        Restart the animation in place, as if it was a new copy.
+
+        Parameters:
+            frame (int): The start frame. Default is 0.
         '''
 
-        return Animation(self.images, self.duration, self.loop)
+        self.frame = frame
+        self.done = False
 
     def update(self):
         '''
@@ -91,3 +118,14 @@ class Animation:
         '''
 
         return self.images[self.frame // self.duration]
+
+    @property
+    def flipped_image(self):
+        '''
+        Get the current image of the animation, flipped horizontally.
+
+        Returns:
+            pygame.Surface: The current image of the animation, flipped horizontally.
+        '''
+
+        return self.flipped_images[self.frame // self.duration]
@@ -0,0 +1,70 @@
+"""
+Convert maps between the JSON map format and the binary map format. The direction is chosen from the extension of each input file: JSON maps are converted to binary maps and binary maps to JSON maps.
+
+Usage:
+    python tools/convert_map.py data/maps/*.json
+    python tools/convert_map.py data/maps/4.jmap -o map.json
+"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.map_format import MapFile, save_binary_map, BINARY_MAP_EXTENSION
+
+
+def convert(source, destination=None):
+    """
+    Convert a map file.
+
+    Parameters:
+        source (str): The path of the map to convert.
+        destination (str): The path of the converted map. Default is the source path with the other extension.
+
+    Returns:
+        str: The path of the converted map.
+    """
+
+    root, extension = os.path.splitext(source)
+
+    if extension == BINARY_MAP_EXTENSION:
+        destination = destination or root + ".json"
+        with MapFile(source) as map_file:
+            data = map_file.to_json()
+        with open(destination, "w") as file:
+            json.dump(data, file)
+    else:
+        destination = destination or root + BINARY_MAP_EXTENSION
+        with open(source, "r") as file:
+            data = json.load(file)
+        save_binary_map(destination, data)
+
+    return destination
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("maps", nargs="+", help="the map files to convert")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="the path of the converted map, only with a single input map",
+    )
+    args = parser.parse_args()
+
+    if args.output and len(args.maps) > 1:
+        parser.error("--output can only be used with a single input map")
+
+    for source in args.maps:
+        destination = convert(source, args.output)
+        print(
+            f"{source} ({os.path.getsize(source)} bytes) -> "
+            f"{destination} ({os.path.getsize(destination)} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
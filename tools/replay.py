@@ -0,0 +1,67 @@
+"""
+Play a replay file headlessly and check it against the recording. Nothing is drawn nor played: the levels run as fast as they can, with the recorded seeds and input, and the digest of each level at the end of its segment is compared with the recorded one. A mismatch means the simulation is not deterministic, or has changed since the recording.
+
+Record a replay by playing the game with --record:
+
+    python game.py --record session.jrpl
+
+Usage:
+    python tools/replay.py session.jrpl
+    python game.py --replay session.jrpl
+"""
+
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+from scripts.replay import Replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("replay", help="the replay file")
+    args = parser.parse_args()
+
+    replay = Replay.load(os.path.abspath(args.replay))
+
+    pygame.init()
+
+    # The config converts the images it loads, which needs a display mode.
+    os.chdir(ROOT)
+    pygame.display.set_mode((1, 1))
+    from config import Config
+    from scripts.map_format import map_file
+    from scripts.simulation import Simulation
+
+    config = Config()
+    simulation = Simulation(config, sound=False)
+
+    start = time.perf_counter()
+    matches = replay.play(simulation, lambda map_id: map_file(config.map_path, map_id))
+    elapsed = time.perf_counter() - start
+
+    ticks = sum(len(segment.ticks) for segment in replay.segments)
+    for segment, match in zip(replay.segments, matches):
+        print(
+            f"map {segment.map_id} seed {segment.seed}: {len(segment.ticks)} ticks, "
+            f"{'ok' if match else 'MISMATCH'}"
+        )
+    print(
+        f"{ticks} ticks in {elapsed:.3f} s, {ticks / max(elapsed, 1e-9):.0f} ticks/s, "
+        f"{matches.count(True)} of {len(matches)} segments match"
+    )
+
+    pygame.quit()
+    sys.exit(0 if all(matches) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Run a level headlessly with scripted input and report the simulation speed. Nothing is drawn nor played: the game logic runs as fast as it can.
+
+An input script is a text file with one key event per line: the tick it is applied on, "down" or "up", and the name of the key as given by pygame.key.name (see scripts/input_script.py). Without a script, a built-in script that runs, jumps, dashes and shoots is used.
+
+    40 down right
+    60 down x
+    90 up x
+
+Usage:
+    python tools/simulate.py data/maps/0.json
+    python tools/simulate.py data/maps/*.json --ticks 3600 --script run.txt
+"""
+
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+from scripts.input_script import load_script
+
+
+def simulate(config, path, ticks, script, seed=0):
+    """
+    Load a map and run it headlessly.
+
+    Parameters:
+        config (Config): The config object of the game.
+        path (str): The path of the map file.
+        ticks (int): The number of ticks to run.
+        script (dict[int, list[pygame.event.Event]]): The input script, see load_script.
+        seed (int): The seed of the level, see Simulation.load_map. Default is 0.
+
+    Returns:
+        tuple[Simulation, float]: The simulation after the run and the run time in seconds, without the loading of the map.
+    """
+
+    from scripts.simulation import Simulation
+
+    simulation = Simulation(config, sound=False)
+    simulation.load_map(path, seed=seed)
+
+    start = time.perf_counter()
+    simulation.advance(ticks, script)
+    elapsed = time.perf_counter() - start
+
+    simulation.tilemap.close()
+    return simulation, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("maps", nargs="+", help="the map files to run")
+    parser.add_argument(
+        "--ticks", type=int, default=900, help="the number of ticks to run per map"
+    )
+    parser.add_argument("--script", help="the input script, default is a built-in one")
+    parser.add_argument(
+        "--seed", type=int, default=0, help="the seed of the levels"
+    )
+    args = parser.parse_args()
+
+    paths = [os.path.abspath(path) for path in args.maps]
+
+    pygame.init()
+
+    script = load_script(args.script)
+
+    # The config converts the images it loads, which needs a display mode.
+    os.chdir(ROOT)
+    pygame.display.set_mode((1, 1))
+    from config import Config
+
+    config = Config()
+
+    for name, path in zip(args.maps, paths):
+        simulation, elapsed = simulate(config, path, args.ticks, script, args.seed)
+        player = simulation.player
+        if simulation.finished:
+            outcome = "completed" if simulation.next_level else "lost"
+        else:
+            outcome = "dead" if simulation.dead else "playing"
+        print(
+            f"{name}: {args.ticks} ticks in {elapsed:.3f} s, "
+            f"{args.ticks / elapsed:.0f} ticks/s "
+            f"(player {player.pos[0]:.0f},{player.pos[1]:.0f}, "
+            f"{len(simulation.enemies)} enemies, scores {simulation.scores}, {outcome})"
+        )
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Make a stress map: a map repeated side by side a number of times, with all its tiles, enemies, trees and portals. The player starts in the first copy and the checkpoint is only kept in the last one, so the level is as many times longer and more populated. It shows how the game scales with the size of a level, see also benchmarks/frame_time.py --stress.
+
+Usage:
+    python tools/stress_map.py data/maps/0.json --copies 16 -o stress.json
+    python tools/stress_map.py data/maps/0.json --copies 64 -o stress.jmap
+"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.map_format import MapFile, save_binary_map, BINARY_MAP_EXTENSION
+
+
+def load_map_data(path):
+    """
+    Load a map file in the JSON map format, whatever the format of the file.
+
+    Parameters:
+        path (str): The path of the map.
+
+    Returns:
+        dict: The map in the JSON map format.
+    """
+
+    if path.endswith(BINARY_MAP_EXTENSION):
+        with MapFile(path) as map_file:
+            return map_file.to_json()
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def stress_map(data, copies):
+    """
+    Repeat a map side by side.
+
+    Parameters:
+        data (dict): The map in the JSON map format.
+        copies (int): The number of copies of the map.
+
+    Returns:
+        dict: The stress map in the JSON map format.
+    """
+
+    tile_size = data["tile_size"]
+    xs = [tile["pos"][0] for tile in data["tilemap"].values()]
+    width = max(xs) - min(xs) + 1
+
+    tilemap = {}
+    offgrid_tiles = []
+    for copy in range(copies):
+        shift = copy * width
+        for tile in data["tilemap"].values():
+            x, y = tile["pos"]
+            tilemap[f"{x + shift};{y}"] = dict(tile, pos=[x + shift, y])
+
+        for tile in data["offgrid_tiles"]:
+            if copy and (tile["type"], tile["variant"]) == ("spawner", 0):
+                continue
+            if copy < copies - 1 and tile["type"] == "checkpoint":
+                continue
+            x, y = tile["pos"]
+            offgrid_tiles.append(dict(tile, pos=[x + shift * tile_size, y]))
+
+    return {"tilemap": tilemap, "offgrid_tiles": offgrid_tiles, "tile_size": tile_size}
+
+
+def save_map_data(path, data):
+    """
+    Save a map in the format given by the extension of its path.
+
+    Parameters:
+        path (str): The path of the map.
+        data (dict): The map in the JSON map format.
+    """
+
+    if path.endswith(BINARY_MAP_EXTENSION):
+        save_binary_map(path, data)
+    else:
+        with open(path, "w") as file:
+            json.dump(data, file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("map", help="the map to repeat")
+    parser.add_argument(
+        "--copies", type=int, default=16, help="the number of copies, default is 16"
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="the path of the stress map"
+    )
+    args = parser.parse_args()
+
+    data = stress_map(load_map_data(args.map), args.copies)
+    save_map_data(args.output, data)
+
+    enemies = sum(
+        1
+        for tile in data["offgrid_tiles"]
+        if (tile["type"], tile["variant"]) == ("spawner", 1)
+    )
+    print(
+        f"{args.output}: {len(data['tilemap'])} tiles, "
+        f"{len(data['offgrid_tiles'])} offgrid tiles, {enemies} enemies "
+        f"({os.path.getsize(args.output)} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()